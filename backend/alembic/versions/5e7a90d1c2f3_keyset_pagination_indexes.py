@@ -0,0 +1,40 @@
+"""keyset pagination indexes
+
+Revision ID: 5e7a90d1c2f3
+Revises: c3d52e8a7b14
+Create Date: 2026-01-19 09:42:17.604127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e7a90d1c2f3'
+down_revision: Union[str, Sequence[str], None] = 'c3d52e8a7b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_candidates_company_created', 'candidates', ['company_id', 'created_date', 'id'], unique=False)
+    op.create_index('ix_candidates_created', 'candidates', ['created_date', 'id'], unique=False)
+    op.create_index('ix_requisitions_company_created', 'requisitions', ['company_id', 'created_date', 'id'], unique=False)
+    op.create_index('ix_requisitions_created', 'requisitions', ['created_date', 'id'], unique=False)
+    op.create_index('ix_interviews_company_created', 'interviews', ['company_id', 'created_date', 'id'], unique=False)
+    op.create_index('ix_interviews_created', 'interviews', ['created_date', 'id'], unique=False)
+    op.create_index('ix_offers_created', 'offers', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_offers_created', table_name='offers')
+    op.drop_index('ix_interviews_created', table_name='interviews')
+    op.drop_index('ix_interviews_company_created', table_name='interviews')
+    op.drop_index('ix_requisitions_created', table_name='requisitions')
+    op.drop_index('ix_requisitions_company_created', table_name='requisitions')
+    op.drop_index('ix_candidates_created', table_name='candidates')
+    op.drop_index('ix_candidates_company_created', table_name='candidates')
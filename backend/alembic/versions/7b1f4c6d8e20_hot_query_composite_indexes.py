@@ -0,0 +1,46 @@
+"""hot query composite indexes
+
+Revision ID: 7b1f4c6d8e20
+Revises: 5e7a90d1c2f3
+Create Date: 2026-01-26 11:18:52.330981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b1f4c6d8e20'
+down_revision: Union[str, Sequence[str], None] = '5e7a90d1c2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) -- one per hot query shape
+INDEXES = [
+    # /summary counts and tenant lists filtered by status
+    ('ix_requisitions_company_status', 'requisitions', ['company_id', 'status']),
+    ('ix_requisitions_company_approval_created', 'requisitions', ['company_id', 'approval_status', 'created_date']),
+    ('ix_requisitions_recruiter_approval', 'requisitions', ['recruiter_id', 'approval_status']),
+    ('ix_candidates_company_status', 'candidates', ['company_id', 'status']),
+    ('ix_candidates_company_recruiter', 'candidates', ['company_id', 'recruiter']),
+    ('ix_interviews_company_status_scheduled', 'interviews', ['company_id', 'status', 'scheduled_at']),
+    ('ix_interviews_status_scheduled', 'interviews', ['status', 'scheduled_at']),
+    # activity timelines, newest first
+    ('ix_candidate_activity_logs_candidate_ts', 'candidate_activity_logs', ['candidate_id', 'timestamp']),
+    ('ix_requisition_activity_logs_req_ts', 'requisition_activity_logs', ['requisition_id', 'timestamp']),
+    ('ix_notifications_user_created', 'notifications', ['user_id', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
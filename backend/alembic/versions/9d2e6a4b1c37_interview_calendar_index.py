@@ -0,0 +1,28 @@
+"""interview calendar index
+
+Revision ID: 9d2e6a4b1c37
+Revises: 7b1f4c6d8e20
+Create Date: 2026-01-27 10:04:13.512907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2e6a4b1c37'
+down_revision: Union[str, Sequence[str], None] = '7b1f4c6d8e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_interviews_company_scheduled', 'interviews', ['company_id', 'scheduled_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_interviews_company_scheduled', table_name='interviews')
@@ -0,0 +1,36 @@
+"""offer list filter indexes
+
+Revision ID: a4c81f0e6b52
+Revises: 9d2e6a4b1c37
+Create Date: 2026-01-27 15:41:08.274513
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c81f0e6b52'
+down_revision: Union[str, Sequence[str], None] = '9d2e6a4b1c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_offers_app_created', 'offers', ['app_id', 'created_at', 'id']),
+    ('ix_offers_status_expiry', 'offers', ['status', 'expiry_date']),
+    ('ix_offers_expiry', 'offers', ['expiry_date']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
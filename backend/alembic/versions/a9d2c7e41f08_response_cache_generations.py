@@ -0,0 +1,32 @@
+"""response cache generations
+
+Revision ID: a9d2c7e41f08
+Revises: f1b6c8e25d93
+Create Date: 2026-02-16 10:21:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d2c7e41f08'
+down_revision: Union[str, Sequence[str], None] = 'f1b6c8e25d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('response_cache_generations',
+    sa.Column('scope', sa.String(length=32), nullable=False),
+    sa.Column('generation', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('scope')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('response_cache_generations')
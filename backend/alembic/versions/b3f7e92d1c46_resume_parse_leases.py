@@ -0,0 +1,43 @@
+"""resume parse job leases and owners
+
+Revision ID: b3f7e92d1c46
+Revises: a9d2c7e41f08
+Create Date: 2026-02-17 09:42:11.304857
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f7e92d1c46'
+down_revision: Union[str, Sequence[str], None] = 'a9d2c7e41f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    sa.Column('parse_owner', sa.String(length=64), nullable=True),
+    sa.Column('parse_lease_until', sa.DateTime(), nullable=True),
+    sa.Column('uploaded_by', sa.Integer(), nullable=True),
+    sa.Column('company_id', sa.Integer(), nullable=True),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('files') as batch:
+        for column in COLUMNS:
+            batch.add_column(column)
+        batch.create_foreign_key('fk_files_uploaded_by', 'users', ['uploaded_by'], ['id'])
+        batch.create_foreign_key('fk_files_company_id', 'companies', ['company_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('files') as batch:
+        batch.drop_constraint('fk_files_company_id', type_='foreignkey')
+        batch.drop_constraint('fk_files_uploaded_by', type_='foreignkey')
+        for column in reversed(COLUMNS):
+            batch.drop_column(column.name)
@@ -0,0 +1,99 @@
+"""blob storage metadata; document bytes move to storage
+
+Revision ID: b7e3d19a5c40
+Revises: a4c81f0e6b52
+Create Date: 2026-01-29 10:12:44.903127
+
+"""
+import hashlib
+import os
+import re
+import tempfile
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app import storage
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3d19a5c40'
+down_revision: Union[str, Sequence[str], None] = 'a4c81f0e6b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UPLOAD_PREFIX = 'uploads'
+
+blobs = sa.table(
+    'blobs',
+    sa.column('id', sa.String), sa.column('path', sa.String), sa.column('size', sa.BigInteger),
+    sa.column('content_type', sa.String), sa.column('created_at', sa.DateTime),
+)
+documents = sa.table(
+    'documents',
+    sa.column('id', sa.Integer), sa.column('filename', sa.String),
+    sa.column('file_data', sa.LargeBinary), sa.column('blob_id', sa.String),
+)
+
+
+def _store(data: bytes, sha256: str, filename: str) -> str:
+    ext = os.path.splitext(filename or '')[1].lower()
+    if not re.fullmatch(r'\.[a-z0-9]{1,10}', ext):
+        ext = ''
+    key = f"{UPLOAD_PREFIX}/{sha256}{ext}"
+    fd, tmp_path = tempfile.mkstemp(prefix='upload-')
+    with os.fdopen(fd, 'wb') as out:
+        out.write(data)
+    storage.backend.put_file(tmp_path, key, move=True)
+    return key
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('blobs', sa.Column('size', sa.BigInteger(), nullable=True))
+    op.add_column('blobs', sa.Column('content_type', sa.String(length=100), nullable=True))
+    op.add_column('documents', sa.Column('blob_id', sa.String(length=64), nullable=True))
+
+    # Copy each document's bytes out to storage, one row at a time
+    conn = op.get_bind()
+    known = {row.id for row in conn.execute(sa.select(blobs.c.id))}
+    for doc_id in [row.id for row in conn.execute(sa.select(documents.c.id))]:
+        filename, data = conn.execute(
+            sa.select(documents.c.filename, documents.c.file_data).where(documents.c.id == doc_id)
+        ).one()
+        sha256 = hashlib.sha256(data).hexdigest()
+        if sha256 not in known:
+            key = _store(data, sha256, filename)
+            conn.execute(blobs.insert().values(
+                id=sha256, path=key, size=len(data), content_type=None, created_at=datetime.utcnow()
+            ))
+            known.add(sha256)
+        conn.execute(documents.update().where(documents.c.id == doc_id).values(blob_id=sha256))
+
+    with op.batch_alter_table('documents') as batch:
+        batch.alter_column('blob_id', existing_type=sa.String(length=64), nullable=False)
+        batch.create_foreign_key('fk_documents_blob_id', 'blobs', ['blob_id'], ['id'])
+        batch.drop_column('file_data')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('documents', sa.Column('file_data', sa.LargeBinary(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(documents.c.id, blobs.c.path).join(blobs, blobs.c.id == documents.c.blob_id)
+    ).all()
+    for doc_id, key in rows:
+        data = b''.join(storage.backend.iter_range(key))
+        conn.execute(documents.update().where(documents.c.id == doc_id).values(file_data=data))
+
+    with op.batch_alter_table('documents') as batch:
+        batch.drop_constraint('fk_documents_blob_id', type_='foreignkey')
+        batch.drop_column('blob_id')
+        batch.alter_column('file_data', existing_type=sa.LargeBinary(), nullable=False)
+
+    op.drop_column('blobs', 'content_type')
+    op.drop_column('blobs', 'size')
@@ -0,0 +1,47 @@
+"""dashboard counters
+
+Revision ID: c3d52e8a7b14
+Revises: 0cc4f23a839d
+Create Date: 2026-01-12 10:05:41.218374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d52e8a7b14'
+down_revision: Union[str, Sequence[str], None] = '0cc4f23a839d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('dashboard_counters',
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('open_positions', sa.Integer(), nullable=False),
+    sa.Column('active_candidates', sa.Integer(), nullable=False),
+    sa.Column('scheduled_interviews', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('company_id')
+    )
+    # Backfill from the live tables (requisitions.status stores the enum name).
+    op.execute("""
+        INSERT INTO dashboard_counters
+            (company_id, open_positions, active_candidates, scheduled_interviews, updated_at)
+        SELECT c.id,
+            (SELECT COUNT(*) FROM requisitions r WHERE r.company_id = c.id AND r.status = 'OPEN'),
+            (SELECT COUNT(*) FROM candidates ca WHERE ca.company_id = c.id AND ca.status = 'new'),
+            (SELECT COUNT(*) FROM interviews i WHERE i.company_id = c.id AND i.status = 'scheduled'),
+            CURRENT_TIMESTAMP
+        FROM companies c
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('dashboard_counters')
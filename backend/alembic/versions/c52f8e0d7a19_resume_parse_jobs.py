@@ -0,0 +1,41 @@
+"""resume parse jobs on files
+
+Revision ID: c52f8e0d7a19
+Revises: b7e3d19a5c40
+Create Date: 2026-02-02 11:06:37.518240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52f8e0d7a19'
+down_revision: Union[str, Sequence[str], None] = 'b7e3d19a5c40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    sa.Column('parse_status', sa.String(length=20), nullable=True),
+    sa.Column('parse_progress', sa.Integer(), nullable=True),
+    sa.Column('parsed_fields', sa.JSON(), nullable=True),
+    sa.Column('parsed_text', sa.Text(length=16777215), nullable=True),
+    sa.Column('parse_error', sa.Text(), nullable=True),
+    sa.Column('parsed_at', sa.DateTime(), nullable=True),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in COLUMNS:
+        op.add_column('files', column)
+    op.create_index(op.f('ix_files_parse_status'), 'files', ['parse_status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_files_parse_status'), table_name='files')
+    for column in reversed(COLUMNS):
+        op.drop_column('files', column.name)
@@ -0,0 +1,68 @@
+"""skill name keys for case-insensitive matching on any collation
+
+Revision ID: c8e4a2f7b915
+Revises: b3f7e92d1c46
+Create Date: 2026-02-18 11:05:26.417390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.skill_index import normalize
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e4a2f7b915'
+down_revision: Union[str, Sequence[str], None] = 'b3f7e92d1c46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+skills = sa.table('skills', sa.column('id', sa.Integer), sa.column('name', sa.String),
+                  sa.column('name_key', sa.String))
+# (table, owner column) of each skill association
+ASSOCIATIONS = [('candidate_skills', 'candidate_id'), ('requisition_skills', 'requisition_id')]
+
+
+def _merge(conn, keep: int, duplicate: int):
+    """Move a duplicate skill's associations onto the kept skill, then delete it."""
+    for name, owner in ASSOCIATIONS:
+        table = sa.table(name, sa.column(owner), sa.column('skill_id'))
+        owners = table.c[owner]
+        has_kept = {row[0] for row in conn.execute(sa.select(owners).where(table.c.skill_id == keep))}
+        for (owner_id,) in conn.execute(sa.select(owners).where(table.c.skill_id == duplicate)).all():
+            if owner_id in has_kept:
+                conn.execute(table.delete().where(owners == owner_id, table.c.skill_id == duplicate))
+            else:
+                conn.execute(table.update().where(owners == owner_id, table.c.skill_id == duplicate)
+                             .values(skill_id=keep))
+    conn.execute(skills.delete().where(skills.c.id == duplicate))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('skills', sa.Column('name_key', sa.String(length=100), nullable=True))
+
+    # Fill the keys; names differing only in case or spacing merge into the oldest skill
+    # (run `python -m app.reindex_search` afterwards if any were merged)
+    conn = op.get_bind()
+    kept = {}
+    for skill_id, name in conn.execute(sa.select(skills.c.id, skills.c.name).order_by(skills.c.id)).all():
+        key = normalize(name)[:100]
+        if key in kept:
+            _merge(conn, kept[key], skill_id)
+        else:
+            kept[key] = skill_id
+            conn.execute(skills.update().where(skills.c.id == skill_id).values(name_key=key))
+
+    with op.batch_alter_table('skills') as batch:
+        batch.alter_column('name_key', existing_type=sa.String(length=100), nullable=False)
+        batch.create_index('ix_skills_name_key', ['name_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('skills') as batch:
+        batch.drop_index('ix_skills_name_key')
+        batch.drop_column('name_key')
@@ -0,0 +1,35 @@
+"""parsed resume cache
+
+Revision ID: d83a6b2f4e51
+Revises: c52f8e0d7a19
+Create Date: 2026-02-04 09:48:15.662091
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd83a6b2f4e51'
+down_revision: Union[str, Sequence[str], None] = 'c52f8e0d7a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('parsed_resumes',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('parser_version', sa.Integer(), nullable=False),
+    sa.Column('fields', sa.JSON(), nullable=False),
+    sa.Column('text', sa.Text(length=16777215), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('sha256', 'parser_version')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('parsed_resumes')
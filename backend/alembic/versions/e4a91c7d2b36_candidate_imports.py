@@ -0,0 +1,58 @@
+"""candidate imports
+
+Revision ID: e4a91c7d2b36
+Revises: d83a6b2f4e51
+Create Date: 2026-02-05 11:20:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a91c7d2b36'
+down_revision: Union[str, Sequence[str], None] = 'd83a6b2f4e51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('candidate_imports',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('file_name', sa.String(length=255), nullable=False),
+    sa.Column('file_url', sa.String(length=1000), nullable=False),
+    sa.Column('requisition_id', sa.Integer(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('rows_processed', sa.Integer(), nullable=False),
+    sa.Column('rows_imported', sa.Integer(), nullable=False),
+    sa.Column('rows_failed', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['requisition_id'], ['requisitions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('candidate_import_errors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('import_id', sa.String(length=36), nullable=False),
+    sa.Column('row_number', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('error', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['import_id'], ['candidate_imports.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_candidate_import_errors_import_id'), 'candidate_import_errors', ['import_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_candidate_import_errors_import_id'), table_name='candidate_import_errors')
+    op.drop_table('candidate_import_errors')
+    op.drop_table('candidate_imports')
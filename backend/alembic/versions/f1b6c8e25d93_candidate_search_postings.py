@@ -0,0 +1,43 @@
+"""candidate search postings
+
+Revision ID: f1b6c8e25d93
+Revises: e4a91c7d2b36
+Create Date: 2026-02-09 14:06:52.904117
+
+Run `python -m app.reindex_search` afterwards to index existing candidates.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b6c8e25d93'
+down_revision: Union[str, Sequence[str], None] = 'e4a91c7d2b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('candidate_search_postings',
+    sa.Column('term', sa.String(length=64), nullable=False),
+    sa.Column('candidate_id', sa.String(length=36), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=True),
+    sa.Column('weight', sa.Integer(), nullable=False),
+    sa.Column('profile_weight', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['candidate_id'], ['candidates.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('term', 'candidate_id')
+    )
+    op.create_index('ix_candidate_search_term_weight', 'candidate_search_postings', ['term', 'weight', 'candidate_id'], unique=False)
+    op.create_index('ix_candidate_search_term_company', 'candidate_search_postings', ['term', 'company_id', 'profile_weight', 'candidate_id'], unique=False)
+    op.create_index('ix_candidate_search_candidate', 'candidate_search_postings', ['candidate_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_candidate_search_candidate', table_name='candidate_search_postings')
+    op.drop_index('ix_candidate_search_term_company', table_name='candidate_search_postings')
+    op.drop_index('ix_candidate_search_term_weight', table_name='candidate_search_postings')
+    op.drop_table('candidate_search_postings')
@@ -1,16 +1,24 @@
+import os
+import threading
+import time
 from passlib.context import CryptContext
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
 from fastapi.security import OAuth2PasswordRequestForm,OAuth2PasswordBearer
 from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
 from.database import get_db
-from app import crud
+from app import crud, models
 
 SECRET_KEY = "supersecretkey"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
+# How long a resolved user stays cached per token subject. Kept short because
+# other workers can't see our invalidations and only the TTL bounds staleness.
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
@@ -27,22 +35,124 @@ def create_access_token(data: dict):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+
+# ================== PRINCIPAL CACHE ==================
+
+class RowSnapshot:
+    """Plain copy of an ORM row's column values, safe to share between sessions."""
+
+    def __init__(self, row):
+        for attr in inspect(row).mapper.column_attrs:
+            setattr(self, attr.key, getattr(row, attr.key))
+
+
+class Principal(RowSnapshot):
+    """
+    What get_current_user hands to the routes: the user's columns plus a
+    snapshot of company_rel. Routes only read scalars off the current user,
+    so a detached copy behaves the same as the ORM User did.
+    """
+
+    def __init__(self, user: models.User):
+        super().__init__(user)
+        self.company_rel = RowSnapshot(user.company_rel) if user.company_rel else None
+
+
+_principal_cache: dict = {}   # token subject -> (expires_at, Principal)
+_principal_lock = threading.Lock()
+_principal_generation = 0     # bumped by every invalidation
+
+
+def get_cached_principal(subject: str):
+    with _principal_lock:
+        entry = _principal_cache.get(subject)
+        if entry is None:
+            return None
+        expires_at, principal = entry
+        if expires_at < time.monotonic():
+            del _principal_cache[subject]
+            return None
+        return principal
+
+
+def principal_generation() -> int:
+    return _principal_generation
+
+
+def cache_principal(subject: str, principal: Principal, generation: int = None):
+    """
+    Cache a principal read at `generation` (principal_generation() before the
+    read). If an invalidation committed since, the row may predate it: skip.
+    """
+    with _principal_lock:
+        if generation is not None and generation != _principal_generation:
+            return
+        _principal_cache[subject] = (time.monotonic() + PRINCIPAL_CACHE_TTL_SECONDS, principal)
+
+
+def invalidate_principals(user_ids=(), company_ids=(), everything: bool = False):
+    """Drop cached principals for these users and companies (or all of them)."""
+    global _principal_generation
+    user_ids, company_ids = set(user_ids), set(company_ids)
+    with _principal_lock:
+        _principal_generation += 1
+        if everything:
+            _principal_cache.clear()
+            return
+        for subject, (_, principal) in list(_principal_cache.items()):
+            if principal.id in user_ids or principal.company_id in company_ids:
+                del _principal_cache[subject]
+
+
+# Invalidation happens once the write commits: dropping the entry at flush
+# would let a concurrent request re-cache the old committed row for a full TTL.
+
+_PENDING_PRINCIPALS = "pending_principal_invalidations"
+
+
+def _on_principal_write(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        kind = "users" if isinstance(target, models.User) else "companies"
+        session.info.setdefault(_PENDING_PRINCIPALS, {"users": set(), "companies": set()})[kind].add(target.id)
+
+
+def _invalidate_pending_principals(session: Session):
+    pending = session.info.pop(_PENDING_PRINCIPALS, None)
+    if pending:
+        invalidate_principals(user_ids=pending["users"], company_ids=pending["companies"])
+
+
+def _discard_pending_principals(session: Session):
+    session.info.pop(_PENDING_PRINCIPALS, None)
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(models.User, _event_name, _on_principal_write)
+    event.listen(models.Company, _event_name, _on_principal_write)
+event.listen(Session, "after_commit", _invalidate_pending_principals)
+event.listen(Session, "after_rollback", _discard_pending_principals)
+
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     try:
-        print("Decoding token...")  # Debug log
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        print(f"Token payload: {payload}")  # Debug log
-        if email is None:
-            print("Token missing 'sub' field")  # Debug log
-            raise HTTPException(status_code=401, detail="Invalid token")
-        user = crud.get_user_by_email(db, email=email)
-        if user is None:
-            print(f"No user found for email: {email}")  # Debug log
-            raise HTTPException(status_code=401, detail="User not found")
-        print(f"Authenticated user: {user.email}")  # Debug log
-        return user
-    except JWTError as e:
-        print(f"JWT decoding error: {e}")  # Debug log
+    except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    email: str = payload.get("sub")
+    if email is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    principal = get_cached_principal(email)
+    if principal is not None:
+        return principal
+
+    generation = principal_generation()
+    user = crud.get_user_by_email(db, email=email)
+    if user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    principal = Principal(user)
+    cache_principal(email, principal, generation)
+    return principal
@@ -1,9 +1,11 @@
-from sqlalchemy.orm import Session, joinedload
-from app import models, schemas
+import threading
+from fastapi import HTTPException
+from sqlalchemy.orm import Session, joinedload, make_transient_to_detached, object_session
+from app import models, schemas, skill_index
 from app.models import Notification,Skill
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import func
+from typing import Iterable, List, Optional
+from sqlalchemy import func, insert, event, select
 
 def create_user(db: Session, user: schemas.UserCreate, hashed_pw: str):
     # 1. Check if company already exists (Case Insensitive)
@@ -67,7 +69,7 @@ def get_notifications(db: Session, user_id: int):
 
 
 def get_skill_by_name(db: Session, name: str):
-    return db.query(Skill).filter(Skill.name == name).first()
+    return db.query(Skill).filter(Skill.name_key == normalize_skill_name(name)).first()
 
 def create_skill(db: Session, skill: schemas.SkillCreate):
     db_skill = Skill(name=skill.name)
@@ -77,13 +79,187 @@ def create_skill(db: Session, skill: schemas.SkillCreate):
     return db_skill
 
 def get_or_create_skill(db: Session, skill_name: str) -> Skill:
-    db_skill = get_skill_by_name(db, name=skill_name)
-    if db_skill:
-        return db_skill
-    return create_skill(db, skill=schemas.SkillCreate(name=skill_name))
+    return resolve_skills(db, [skill_name])[0]
 
-def search_skills(db: Session, query: str, skip: int = 0, limit: int = 100):
-    return db.query(Skill).filter(Skill.name.ilike(f"%{query}%")).offset(skip).limit(limit).all()
+
+# ================== SKILL CACHE ==================
+# Process-wide map of normalized skill name -> (id, stored name). Entries
+# learned inside a transaction are only published once it commits, so a
+# rolled-back insert can never leave a dangling id behind.
+
+_skill_cache: dict = {}
+_skill_lock = threading.Lock()
+_PENDING_SKILLS = "pending_skill_cache"
+_SKILL_WRITES = "skill_version_bumps"
+
+
+SKILL_NAME_MAX_LENGTH = Skill.__table__.c.name.type.length
+
+
+def normalize_skill_name(name: str) -> str:
+    return skill_index.normalize(name)
+
+
+def _cached_skill(db: Session, skill_id: int, name: str) -> Skill:
+    """Attach a cached skill to the session without a SELECT."""
+    skill = Skill(id=skill_id, name=name)
+    make_transient_to_detached(skill)
+    return db.merge(skill, load=False)
+
+
+def _select_skills(db: Session, keys: list) -> dict:
+    # A plain IN on the unique name_key index: the same normalized key on both
+    # sides, whatever the name column's collation
+    found = {skill.name_key: skill for skill in db.query(Skill).filter(Skill.name_key.in_(keys))}
+    db.info.setdefault(_PENDING_SKILLS, {}).update(
+        {key: (skill.id, skill.name) for key, skill in found.items()}
+    )
+    return found
+
+
+def _live_skill_ids(db: Session, cached: dict) -> set:
+    """Which cached skill ids still exist: another worker may have deleted some."""
+    ids = [skill_id for skill_id, _ in cached.values()]
+    return set(db.execute(select(Skill.id).where(Skill.id.in_(ids))).scalars())
+
+
+def resolve_skills(db: Session, names: Iterable[str]) -> List[Skill]:
+    """
+    Skill rows for `names` (matched on their normalized key, duplicates
+    dropped, input order kept), creating the missing ones. Costs one
+    primary-key lookup when every name is cached (cached skills deleted since
+    are evicted and resolved again), otherwise one IN select, one multi-row
+    INSERT for the new names and one select to pick up their ids. Nothing is
+    committed here. Names longer than the column are rejected with a 422
+    rather than truncated by the INSERT; a name that can't be found again
+    after its INSERT (deleted concurrently) is a 409, never dropped.
+    """
+    wanted = {}
+    for name in names:
+        clean = " ".join((name or "").split())
+        if clean:
+            wanted.setdefault(normalize_skill_name(clean), clean)
+    if not wanted:
+        return []
+    too_long = [name for key, name in wanted.items() if max(len(name), len(key)) > SKILL_NAME_MAX_LENGTH]
+    if too_long:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Skill names must be at most {SKILL_NAME_MAX_LENGTH} characters: {', '.join(too_long)}",
+        )
+
+    with _skill_lock:
+        cached = {key: _skill_cache[key] for key in wanted if key in _skill_cache}
+    if cached:
+        live = _live_skill_ids(db, cached)
+        for key, (skill_id, _) in list(cached.items()):
+            if skill_id not in live:
+                _evict_skill(skill_id)
+                del cached[key]
+
+    skills = {key: _cached_skill(db, *cached[key]) for key in cached}
+    missing = [key for key in wanted if key not in skills]
+    if missing:
+        skills.update(_select_skills(db, missing))
+        missing = [key for key in missing if key not in skills]
+    if missing:
+        # Another request may insert the same names first; IGNORE skips
+        # those rows and the select below picks them up either way.
+        db.execute(
+            insert(Skill).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite"),
+            [{"name": wanted[key], "name_key": key} for key in missing],
+        )
+        skills.update(_select_skills(db, missing))
+        missing = [key for key in missing if key not in skills]
+    if missing:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Skill(s) changed while being added, please retry: {', '.join(wanted[k] for k in missing)}",
+        )
+
+    return [skills[key] for key in wanted]
+
+
+def _publish_pending_skills(session: Session):
+    pending = session.info.pop(_PENDING_SKILLS, None)
+    writes = session.info.pop(_SKILL_WRITES, 0)
+    if pending:
+        with _skill_lock:
+            _skill_cache.update(pending)
+        for skill_id, name in pending.values():
+            skill_index.index.add(skill_id, name)
+    if writes:
+        skill_index.index.note_writes(writes)
+
+
+def _discard_pending_skills(session: Session):
+    session.info.pop(_PENDING_SKILLS, None)
+    session.info.pop(_SKILL_WRITES, None)
+
+
+def _count_skill_write(connection, target):
+    # Other workers' skill indexes notice the new version and reload (app.skill_index)
+    skill_index.bump_version(connection)
+    session = object_session(target)
+    if session is not None:
+        session.info[_SKILL_WRITES] = session.info.get(_SKILL_WRITES, 0) + 1
+
+
+def _remember_skill(target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_SKILLS, {})[normalize_skill_name(target.name)] = (target.id, target.name)
+
+
+def _on_skill_insert(mapper, connection, target):
+    _remember_skill(target)
+    _count_skill_write(connection, target)
+
+
+def _evict_skill(skill_id: int):
+    with _skill_lock:
+        for key, (cached_id, _) in list(_skill_cache.items()):
+            if cached_id == skill_id:
+                del _skill_cache[key]
+    skill_index.index.remove(skill_id)
+
+
+def _refresh_skill_key(mapper, connection, target):
+    target.name_key = normalize_skill_name(target.name)
+
+
+def _on_skill_update(mapper, connection, target):
+    _evict_skill(target.id)
+    _remember_skill(target)
+    _count_skill_write(connection, target)
+
+
+def _on_skill_delete(mapper, connection, target):
+    _evict_skill(target.id)
+    _count_skill_write(connection, target)
+
+
+event.listen(Session, "after_commit", _publish_pending_skills)
+event.listen(Session, "after_rollback", _discard_pending_skills)
+event.listen(Skill, "after_insert", _on_skill_insert)
+event.listen(Skill, "before_update", _refresh_skill_key)
+event.listen(Skill, "after_update", _on_skill_update)
+event.listen(Skill, "after_delete", _on_skill_delete)
+
+def search_skills(db: Session, query: str, skip: int = 0, limit: int = 100, fuzzy: bool = False):
+    """
+    Ranked typeahead matches from the in-memory skill index (app.skill_index).
+    The index ranks at most MAX_RESULTS matches, so a page past them is a 422
+    rather than silently empty.
+    """
+    if skip + limit > skill_index.MAX_RESULTS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Skill search returns at most {skill_index.MAX_RESULTS} matches (skip + limit)",
+        )
+    skill_index.index.ensure_loaded(db)
+    matches = skill_index.index.search(query, limit=skip + limit, fuzzy=fuzzy)
+    return [{"id": skill_id, "name": name} for skill_id, name in matches[skip:]]
 
 def get_all_skills(db: Session, skip: int = 0, limit: int = 100):
     return db.query(Skill).offset(skip).limit(limit).all()
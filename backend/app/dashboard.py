@@ -0,0 +1,349 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import select, func, cast, literal, null, union_all, update, insert, event, inspect, String
+from sqlalchemy.orm import Session
+from app import response_cache
+from app.models import Company, DashboardCounter, Department
+from app.tenancy import TenantScope
+from candidates.models import Candidate
+from requisitions.models import Requisitions
+from interviews.models import Interview
+
+SUMMARY_LIST_SIZE = 5
+UPCOMING_INTERVIEW_DAYS = 7
+# The upcoming-interview window moves in steps of this, and cached /summary
+# responses with it (response_cache time buckets)
+SUMMARY_BUCKET_SECONDS = 60
+
+
+# counter column -> (model, status value that counts towards it). Values are
+# the ones the app writes; SQL compares them under MySQL's case-insensitive
+# collation and the flush hooks casefold to match.
+COUNTED_STATUSES = {
+    "open_positions": (Requisitions, "open"),
+    "active_candidates": (Candidate, "new"),
+    "scheduled_interviews": (Interview, "scheduled"),
+}
+COUNTER_FIELDS = tuple(COUNTED_STATUSES)
+_COUNTER_FOR_MODEL = {model: (field, status) for field, (model, status) in COUNTED_STATUSES.items()}
+
+
+def _count(model, *criteria):
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+
+def count_from_scratch(db: Session, scope: TenantScope) -> dict:
+    """All dashboard counters in one SELECT of scalar COUNT subqueries."""
+    row = db.execute(
+        select(*(
+            _count(model, model.status == status, *scope.company_filter(model.company_id)).label(field)
+            for field, (model, status) in COUNTED_STATUSES.items()
+        ))
+    ).one()
+    return dict(row._mapping)
+
+
+def get_summary_counts(db: Session, scope: TenantScope) -> dict:
+    """
+    Read the maintained dashboard_counters rows: one primary-key lookup for a
+    single tenant, one SUM for the operator's all-tenants view. Falls back to
+    counting from scratch if the counters were never populated.
+    """
+    sums = select(*(
+        func.sum(getattr(DashboardCounter, field)).label(field) for field in COUNTER_FIELDS
+    ), func.count().label("rows"))
+    if scope.company_id is not None:
+        sums = sums.where(DashboardCounter.company_id == scope.company_id)
+    row = db.execute(sums).one()
+    if not row.rows:
+        return count_from_scratch(db, scope)
+    return {field: int(getattr(row, field) or 0) for field in COUNTER_FIELDS}
+
+
+def _requisition_leg(bucket: str, criteria: list, with_applications: bool):
+    applications_count = null()
+    if with_applications:
+        applications_count = (
+            select(func.count(Candidate.id))
+            .where(Candidate.requisition_id == Requisitions.id)
+            .scalar_subquery()
+        )
+    return (
+        select(
+            literal(bucket).label("bucket"),
+            cast(Requisitions.id, String(100)).label("id"),
+            Requisitions.position.label("position"),
+            Requisitions.status.label("status"),
+            Requisitions.priority.label("priority"),
+            Requisitions.req_id.label("req_id"),
+            Department.id.label("department_id"),
+            Department.name.label("department_name"),
+            applications_count.label("applications_count"),
+            null().label("candidate_id"),
+            Requisitions.created_date.label("at"),
+        )
+        .outerjoin(Department, Department.id == Requisitions.department_id)
+        .where(*criteria)
+        .order_by(Requisitions.created_date.desc())
+        .limit(SUMMARY_LIST_SIZE)
+    )
+
+
+def _interview_leg(criteria: list):
+    return (
+        select(
+            literal("upcoming").label("bucket"),
+            Interview.id.label("id"),
+            *(null().label(name) for name in (
+                "position", "status", "priority", "req_id",
+                "department_id", "department_name", "applications_count",
+            )),
+            Interview.candidate_id.label("candidate_id"),
+            Interview.scheduled_at.label("at"),
+        )
+        .where(*criteria)
+        .order_by(Interview.scheduled_at.asc())
+        .limit(SUMMARY_LIST_SIZE)
+    )
+
+
+def summary_now(now: Optional[float] = None) -> datetime:
+    """Start of the current SUMMARY_BUCKET_SECONDS window: what /summary treats as now."""
+    return datetime.utcfromtimestamp(
+        response_cache.time_bucket(SUMMARY_BUCKET_SECONDS, now) * SUMMARY_BUCKET_SECONDS
+    )
+
+
+def get_summary_rows(db: Session, scope: TenantScope) -> dict:
+    """
+    Recent requisitions, upcoming interviews and pending approvals in one
+    round trip: each list is a LIMITed leg of a UNION ALL, tagged by bucket.
+    """
+    req_filters = scope.requisition_filters()
+    today = summary_now()
+    legs = [
+        _requisition_leg("recent", req_filters, with_applications=True),
+        _requisition_leg("pending", [Requisitions.approval_status == "pending", *req_filters], with_applications=False),
+        _interview_leg([
+            Interview.status == COUNTED_STATUSES["scheduled_interviews"][1],
+            Interview.scheduled_at >= today,
+            Interview.scheduled_at <= today + timedelta(days=UPCOMING_INTERVIEW_DAYS),
+            *scope.interview_filters(),
+        ]),
+    ]
+    # Each leg is wrapped in a derived table so its ORDER BY/LIMIT is legal
+    # inside the UNION on MySQL.
+    rows = db.execute(union_all(*(leg.subquery().select() for leg in legs))).all()
+
+    buckets = {"recent": [], "pending": [], "upcoming": []}
+    for row in rows:
+        buckets[row.bucket].append(row)
+    # UNION ALL does not preserve the per-leg order
+    buckets["recent"].sort(key=lambda r: r.at, reverse=True)
+    buckets["pending"].sort(key=lambda r: r.at, reverse=True)
+    buckets["upcoming"].sort(key=lambda r: r.at)
+
+    return {
+        "recent_requisitions": [
+            {"id": int(r.id),
+            "position": r.position,
+            "status": r.status,
+            "created_date": r.at,
+            'department': {"id": r.department_id, "name": r.department_name} if r.department_id is not None else None,
+            'priority': r.priority,
+            'req_id': r.req_id,
+            'applications_count': r.applications_count or 0,
+            }
+            for r in buckets["recent"]
+        ],
+        "upcoming_interviews": [
+            {"id": i.id, "candidate_id": i.candidate_id, "scheduled_date": i.at}
+            for i in buckets["upcoming"]
+        ],
+        "pending_approvals": [
+            {"id": int(p.id), "position": p.position, "created_date": p.at, 'req_id': p.req_id, }
+            for p in buckets["pending"]
+        ],
+    }
+
+
+def get_dashboard_summary(db: Session, scope: TenantScope) -> dict:
+    return {"summary": get_summary_counts(db, scope), **get_summary_rows(db, scope)}
+
+
+# ================== COUNTER MAINTENANCE ==================
+# Counters are adjusted in the same transaction as the status change: deltas
+# are worked out before the flush (while the old values are still known) and
+# applied right after it on the same connection.
+
+_PENDING_DELTAS = "dashboard_counter_deltas"
+
+
+def _counted_field(model, company_id, status):
+    field, counted_status = _COUNTER_FOR_MODEL[model]
+    if company_id is None or not isinstance(status, str) or status.casefold() != counted_status:
+        return None
+    return company_id, field
+
+
+def _committed_values(session: Session, obj):
+    """(company_id, status) as currently stored in the database."""
+    state = inspect(obj)
+    values = []
+    for key in ("company_id", "status"):
+        history = state.attrs[key].history
+        if history.deleted:
+            values.append(history.deleted[0])
+        elif history.unchanged:
+            values.append(history.unchanged[0])
+        else:
+            # Attribute was expired before being overwritten; ask the database.
+            model = type(obj)
+            row = session.connection().execute(
+                select(model.company_id, model.status).where(model.id == obj.id)
+            ).first()
+            return tuple(row) if row else (None, None)
+    return tuple(values)
+
+
+def _pending_status(obj):
+    """obj.status, or the column default an INSERT is about to apply."""
+    status = obj.status
+    if status is None and obj.id is None:
+        default = type(obj).__table__.c.status.default
+        if default is not None and default.is_scalar:
+            status = default.arg
+    return status
+
+
+def _collect_counter_deltas(session: Session, flush_context, instances):
+    deltas = session.info.setdefault(_PENDING_DELTAS, Counter())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        model = type(obj)
+        if model not in _COUNTER_FOR_MODEL:
+            continue
+        before = None if obj in session.new else _counted_field(model, *_committed_values(session, obj))
+        after = None if obj in session.deleted else _counted_field(model, obj.company_id, _pending_status(obj))
+        if before == after:
+            continue
+        if before:
+            deltas[before] -= 1
+        if after:
+            deltas[after] += 1
+
+
+def _apply_counter_deltas(session: Session, flush_context):
+    deltas = session.info.pop(_PENDING_DELTAS, None)
+    if deltas:
+        _apply_deltas(session.connection(), deltas)
+
+
+def count_bulk_inserts(session: Session, model, rows: list):
+    """
+    Counter deltas for rows added with a Core INSERT, which no flush hook
+    sees. Applied right away, in the caller's transaction.
+    """
+    if model not in _COUNTER_FOR_MODEL:
+        return
+    default = model.__table__.c.status.default
+    deltas = Counter()
+    for row in rows:
+        status = row.get("status")
+        if status is None and default is not None and default.is_scalar:
+            status = default.arg
+        key = _counted_field(model, row.get("company_id"), status)
+        if key:
+            deltas[key] += 1
+    if deltas:
+        _apply_deltas(session.connection(), deltas)
+
+
+def _apply_deltas(connection, deltas: Counter):
+    by_company = {}
+    for (company_id, field), delta in deltas.items():
+        if delta:
+            by_company.setdefault(company_id, {})[field] = delta
+
+    for company_id, fields in by_company.items():
+        result = connection.execute(
+            update(DashboardCounter)
+            .where(DashboardCounter.company_id == company_id)
+            .values(
+                updated_at=datetime.utcnow(),
+                **{field: getattr(DashboardCounter, field) + delta for field, delta in fields.items()},
+            )
+        )
+        if result.rowcount == 0:
+            # No row yet for this company: seed it from the (already flushed) tables.
+            connection.execute(insert(DashboardCounter).values(
+                company_id=company_id,
+                updated_at=datetime.utcnow(),
+                **_recount_company(connection, company_id),
+            ))
+
+
+def _recount_company(connection, company_id: int) -> dict:
+    row = connection.execute(
+        select(*(
+            _count(model, model.status == status, model.company_id == company_id).label(field)
+            for field, (model, status) in COUNTED_STATUSES.items()
+        ))
+    ).one()
+    return dict(row._mapping)
+
+
+def _seed_company_counters(mapper, connection, target):
+    connection.execute(insert(DashboardCounter).values(company_id=target.id, updated_at=datetime.utcnow()))
+
+
+def _discard_counter_deltas(session: Session, previous_transaction=None):
+    session.info.pop(_PENDING_DELTAS, None)
+
+
+event.listen(Session, "before_flush", _collect_counter_deltas)
+event.listen(Session, "after_flush", _apply_counter_deltas)
+event.listen(Session, "after_soft_rollback", _discard_counter_deltas)
+event.listen(Company, "after_insert", _seed_company_counters)
+
+
+# ================== RECONCILIATION ==================
+
+def recount_all(db: Session) -> dict:
+    """{company_id: {field: count}} recomputed from the source tables."""
+    actual = {company_id: dict.fromkeys(COUNTER_FIELDS, 0) for (company_id,) in db.query(Company.id)}
+    for field, (model, status) in COUNTED_STATUSES.items():
+        rows = (
+            db.query(model.company_id, func.count())
+            .filter(model.status == status, model.company_id.isnot(None))
+            .group_by(model.company_id)
+        )
+        for company_id, count in rows:
+            actual.setdefault(company_id, dict.fromkeys(COUNTER_FIELDS, 0))[field] = count
+    return actual
+
+
+def reconcile_counters(db: Session, fix: bool = True) -> list:
+    """
+    Compare dashboard_counters against a full recount. Returns one
+    (company_id, field, stored, actual) tuple per drifted value and, when
+    `fix` is set, overwrites the stored rows with the recount.
+    """
+    actual = recount_all(db)
+    stored = {row.company_id: row for row in db.query(DashboardCounter)}
+    drift = []
+    for company_id, counts in sorted(actual.items()):
+        row = stored.get(company_id)
+        for field in COUNTER_FIELDS:
+            stored_value = getattr(row, field) if row else None
+            if stored_value != counts[field]:
+                drift.append((company_id, field, stored_value, counts[field]))
+        if fix:
+            if row is None:
+                db.add(DashboardCounter(company_id=company_id, **counts))
+            else:
+                for field, value in counts.items():
+                    setattr(row, field, value)
+    if fix:
+        db.commit()
+    return drift
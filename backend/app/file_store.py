@@ -0,0 +1,224 @@
+"""
+Content-addressed file storage on top of app.storage.
+
+Incoming files are streamed in chunks to a temp file and hashed with
+SHA-256 on the way, so a large upload never sits in worker memory. The
+storage key is "<prefix>/<sha256><ext>", built from each upload's own prefix
+and extension, so a file is always served from the place and with the type
+it was uploaded as. Identical uploads under the same prefix and extension
+are stored once, and same-named uploads no longer overwrite each other. The
+hash is also the id of the content's `blobs` row, whose path is the first
+key it was stored under.
+
+Settings:
+    UPLOAD_MAX_BYTES   size cap per upload (default 10 MB); larger uploads get a 413
+    UPLOAD_TMP_DIR     where uploads are spooled while hashing (default: system temp)
+"""
+import hashlib
+import io
+import mimetypes
+import os
+import posixpath
+import re
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+from fastapi import HTTPException, Request, UploadFile
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app import storage
+from app.models import Blob
+
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR") or None
+CHUNK_SIZE = 1024 * 1024
+
+UPLOAD_PREFIX = "uploads"   # resumes, agreements
+PDF_PREFIX = "pdfs"         # invoices, offer letters
+
+# Where the local backend keeps each prefix (served by /uploads and /pdfs in main.py)
+UPLOAD_DIR = os.path.join(storage.STORAGE_LOCAL_ROOT, UPLOAD_PREFIX)
+PDF_DIR = os.path.join(storage.STORAGE_LOCAL_ROOT, PDF_PREFIX)
+
+
+@dataclass
+class StoredFile:
+    path: str            # storage key, e.g. uploads/<sha256>.pdf; what goes in the DB
+    sha256: str
+    size: int
+    original_name: Optional[str]
+
+
+def _extension(filename: Optional[str]) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    return ext if re.fullmatch(r"\.[a-z0-9]{1,10}", ext) else ""
+
+
+def store_stream(db: Session, stream: BinaryIO, prefix: str, filename: Optional[str] = None,
+                 content_type: Optional[str] = None, max_bytes: Optional[int] = None) -> StoredFile:
+    """
+    Hash and store everything readable from `stream`, and record its Blob row
+    in `db` (not committed: it joins the caller's transaction). Blocking: call
+    it from a sync endpoint (FastAPI runs those in the threadpool), not from
+    inside an `async def` route.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_TMP_DIR, prefix="upload-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large (limit {max_bytes // (1024 * 1024)} MB)",
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+
+        sha256 = digest.hexdigest()
+        key = f"{prefix}/{sha256}{_extension(filename)}"
+        existing = db.get(Blob, sha256)
+        if existing is not None and (existing.path == key or storage.backend.exists(key)):
+            os.remove(tmp_path)
+        else:
+            storage.backend.put_file(tmp_path, key, content_type=content_type, move=True)
+        if existing is None:
+            # IGNORE: a concurrent upload of the same bytes may have added the row first
+            db.execute(
+                insert(Blob).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite"),
+                [{"id": sha256, "path": key, "size": size, "content_type": content_type}],
+            )
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return StoredFile(path=key, sha256=sha256, size=size, original_name=filename)
+
+
+def save_upload(db: Session, upload: UploadFile, prefix: str = UPLOAD_PREFIX,
+                max_bytes: int = UPLOAD_MAX_BYTES) -> StoredFile:
+    return store_stream(db, upload.file, prefix, filename=upload.filename,
+                        content_type=upload.content_type, max_bytes=max_bytes)
+
+
+def save_bytes(db: Session, data: bytes, prefix: str, filename: str, content_type: str) -> StoredFile:
+    """Store generated content (invoice PDFs, offer letters)."""
+    return store_stream(db, io.BytesIO(data), prefix, filename=filename, content_type=content_type)
+
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "private, no-cache"
+_CONTENT_KEY = re.compile(r"(?:^|/)([0-9a-f]{64})(?:\.[a-z0-9]{1,10})?$")
+
+
+def content_hash(key: str) -> Optional[str]:
+    """The SHA-256 a content-addressed key was named after; None for legacy paths."""
+    match = _CONTENT_KEY.search(key)
+    return match.group(1) if match else None
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison: W/"x" matches "x"
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def _byte_range(header: str, size: int):
+    """
+    (start, end) for a single "bytes=" range, None to serve the whole file
+    (malformed or multi-range headers may be ignored), or raise 416.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:                                   # "-500": the last 500 bytes
+            start, end = max(size - int(last), 0), size - 1
+    except ValueError:
+        return None
+    if start > end and first and last:
+        return None
+    if start >= size or size == 0:
+        raise HTTPException(status_code=416, detail="Range not satisfiable",
+                            headers={"Content-Range": f"bytes */{size}"})
+    return start, min(end, size - 1)
+
+
+def prefixed_key(prefix: str, name: str) -> str:
+    """
+    The storage key for `name` requested under `prefix`, normalised. Anything
+    that leaves the prefix ("../.env", "../pdfs/x.pdf") gets a 404.
+    """
+    name = name.replace("\\", "/")
+    key = posixpath.normpath(f"{prefix}/{name}")
+    if not key.startswith(f"{prefix}/"):
+        raise HTTPException(status_code=404, detail="File not found")
+    return key
+
+
+def stored_file_response(request: Request, key: str, filename: Optional[str] = None,
+                         inline: bool = False, immutable: bool = False) -> Response:
+    """
+    Serve a stored file from whichever backend holds it, in chunks.
+
+    Content-addressed keys get a strong ETag (the SHA-256), so a client
+    revalidating with If-None-Match gets an empty 304. `immutable` marks the
+    URL itself as content-addressed (it can never change), letting browsers
+    skip revalidation for a year; other URLs (e.g. an invoice preview) must
+    revalidate, which still costs no body bytes when unchanged. Single byte
+    ranges are honoured (206) for PDF viewers that fetch pages lazily.
+    """
+    try:
+        if not storage.backend.exists(key):
+            raise HTTPException(status_code=404, detail="File not found")
+    except ValueError:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    sha256 = content_hash(key)
+    etag = f'"{sha256}"' if sha256 else None
+    headers = {"Accept-Ranges": "bytes"}
+    if etag:
+        headers["ETag"] = etag
+        headers["Cache-Control"] = IMMUTABLE_CACHE if immutable else REVALIDATE_CACHE
+    else:
+        headers["Cache-Control"] = "no-cache"   # legacy name-based path, may be overwritten
+    if filename:
+        disposition = "inline" if inline else "attachment"
+        headers["Content-Disposition"] = f'{disposition}; filename="{filename}"'
+    elif inline:
+        headers["Content-Disposition"] = "inline"
+
+    if etag and _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+
+    size = storage.backend.size(key)
+    media_type = mimetypes.guess_type(filename or key)[0] or "application/octet-stream"
+    status_code, start, end = 200, 0, size - 1
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or (etag is not None and if_range.strip() == etag)):
+        byte_range = _byte_range(range_header, size)
+        if byte_range:
+            status_code, (start, end) = 206, byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    headers["Content-Length"] = str(end - start + 1 if size else 0)
+    if request.method == "HEAD":
+        return Response(status_code=status_code, media_type=media_type, headers=headers)
+    return StreamingResponse(storage.backend.iter_range(key, start, end if size else None),
+                             status_code=status_code, media_type=media_type, headers=headers)
@@ -0,0 +1,257 @@
+"""
+Bulk-load a directory of resumes (agency dumps) as candidates of one
+requisition.
+
+    python -m app.ingest_resumes /data/agency-dump --requisition-id 42
+    python -m app.ingest_resumes /data/agency-dump --requisition-id 42 --workers 8 --report failures.csv
+
+Files (.pdf, .docx, .doc) are hashed and parsed in a process pool with
+app.utils.parse_resume; skills are matched in the workers against a snapshot
+of the taxonomy. The main process stores each file (content-addressed, as
+uploads are), then inserts candidates, their skills, resume files and
+activity logs one batch per transaction.
+
+Duplicate content is ingested once, and content already attached to a
+candidate file is skipped, so re-running after a crash carries on where the
+last committed batch stopped. Files without a usable email, or whose email
+already belongs to a candidate, are reported as failures; a failed batch
+is retried row by row so one bad file can't sink its neighbours.
+
+Exits with status 1 when any file failed.
+"""
+import argparse
+import csv
+import hashlib
+import mimetypes
+import multiprocessing
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app import crud as skills_crud, parse_cache, parse_queue, skill_index
+from app.file_store import content_hash, store_stream, UPLOAD_PREFIX
+from app.models import User
+# Every model module, so relationships between them resolve outside the app
+import interviews.models, invoices.models, offers.models  # noqa: F401
+from candidates.crud import create_candidate_activity_log
+from candidates.models import Candidate, File
+from requisitions.models import Requisitions
+
+RESUME_EXTENSIONS = {".pdf", ".docx", ".doc"}
+HASH_CHUNK = 1024 * 1024
+
+
+# ---------- worker processes ----------
+
+_known_hashes: frozenset = frozenset()
+_matcher = None
+
+
+def _init_worker(known_hashes: frozenset, skills: List[Tuple[int, str]]):
+    global _known_hashes, _matcher
+    from app.skill_matcher import SkillMatcher
+
+    _known_hashes = known_hashes
+    _matcher = SkillMatcher(skills)
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _parse_file(path: str) -> Tuple[str, Optional[str], Optional[dict], Optional[str]]:
+    """(path, sha256, extracted, error); extracted is None for already-ingested content."""
+    from app.utils.parse_resume import extract_resume
+
+    try:
+        sha256 = _sha256(path)
+        if sha256 in _known_hashes:
+            return path, sha256, None, None
+        extracted = extract_resume(path)
+        if "error" in extracted:
+            return path, sha256, None, extracted["error"]
+        extracted["skills"] = [name for _, name in _matcher.find(extracted["text"])]
+        return path, sha256, extracted, None
+    except Exception as e:
+        return path, None, None, f"{type(e).__name__}: {e}"
+
+
+# ---------- main process ----------
+
+def _walk(directory: str) -> List[str]:
+    paths = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if os.path.splitext(name)[1].lower() in RESUME_EXTENSIONS:
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def _ingested_hashes(db: Session) -> frozenset:
+    # The same content can be stored under several keys, so go by the hash in each file's key
+    rows = db.query(File.file_url).filter(File.candidate_id.isnot(None), File.file_url.isnot(None))
+    return frozenset(filter(None, (content_hash(url) for url, in rows)))
+
+
+def _ingest_one(db: Session, requisition, user: User, source: str, item: dict) -> None:
+    path, sha256, extracted = item["path"], item["sha256"], item["extracted"]
+    filename = os.path.basename(path)
+    with open(path, "rb") as f:
+        stored = store_stream(db, f, UPLOAD_PREFIX, filename=filename,
+                              content_type=mimetypes.guess_type(filename)[0])
+    parse_cache.put(db, sha256, {k: v for k, v in extracted.items() if k != "skills"})
+
+    fields = {k: v for k, v in extracted.items() if k != "text"}
+    candidate = Candidate(
+        name=(extracted["name"] or os.path.splitext(filename)[0])[:100],
+        email=extracted["email"][:100],
+        phone=extracted["phone"] or None,
+        position=requisition.position,
+        requisition_id=requisition.id,
+        company_id=requisition.company_id,
+        source=source,
+        status="new",
+        resume_url=stored.path,
+    )
+    candidate.skills = [item["skill_rows"][name] for name in extracted["skills"] if name in item["skill_rows"]]
+    candidate.files.append(File(
+        file_name=filename[:255],
+        file_type="resume",
+        file_url=stored.path,
+        parse_status=parse_queue.DONE,
+        parse_progress=100,
+        parsed_fields=fields,
+        parsed_text=extracted["text"],
+        parsed_at=datetime.utcnow(),
+    ))
+    db.add(candidate)
+    db.flush()
+    create_candidate_activity_log(db, candidate.id, user, "Created Candidate",
+                                  f"Candidate '{candidate.name}' imported from {filename}", commit=False)
+
+
+def _commit_batch(db: Session, requisition, user: User, source: str, batch: List[dict],
+                  failures: List[Tuple[str, str]]) -> int:
+    """Insert a batch in one transaction; on error, retry row by row. Returns rows ingested."""
+    # Emails must be new: drop ones already in the table, or repeated in the batch
+    emails = {item["extracted"]["email"].lower() for item in batch}
+    taken = {email.lower() for email, in db.query(Candidate.email).filter(Candidate.email.in_(emails))}
+    ready = []
+    for item in batch:
+        email = item["extracted"]["email"].lower()
+        if email in taken:
+            failures.append((item["path"], f"candidate with email {email} already exists"))
+        else:
+            taken.add(email)
+            ready.append(item)
+    if not ready:
+        return 0
+
+    names = [name for item in ready for name in item["extracted"]["skills"]]
+    normalize = skills_crud.normalize_skill_name
+    skill_rows = {normalize(skill.name): skill for skill in skills_crud.resolve_skills(db, names)}
+    for item in ready:
+        item["skill_rows"] = {name: skill_rows[normalize(name)]
+                              for name in item["extracted"]["skills"] if normalize(name) in skill_rows}
+
+    try:
+        for item in ready:
+            _ingest_one(db, requisition, user, source, item)
+        db.commit()
+        return len(ready)
+    except Exception as e:
+        db.rollback()
+        if len(ready) == 1:
+            failures.append((ready[0]["path"], f"{type(e).__name__}: {e}"))
+            return 0
+
+    return sum(_commit_batch(db, requisition, user, source, [item], failures) for item in ready)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-ingest a directory of resumes as candidates.")
+    parser.add_argument("directory", help="directory to walk for .pdf/.docx/.doc files")
+    parser.add_argument("--requisition-id", type=int, required=True, help="requisition the candidates apply to")
+    parser.add_argument("--user-email", default=None, help="user the activity log records (default: first admin)")
+    parser.add_argument("--source", default="Bulk import", help="candidate source (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parser processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=200, help="candidates per transaction (default: %(default)s)")
+    parser.add_argument("--report", default=None, help="write failures to this CSV file")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        requisition = db.get(Requisitions, args.requisition_id)
+        if requisition is None:
+            print(f"Requisition {args.requisition_id} not found.")
+            return 2
+        users = db.query(User)
+        user = (users.filter(User.email == args.user_email) if args.user_email
+                else users.filter(User.role.ilike("admin")).order_by(User.id)).first()
+        if user is None:
+            print("No user to record the import as; pass --user-email.")
+            return 2
+
+        paths = _walk(args.directory)
+        known = _ingested_hashes(db)
+        skill_index.index.ensure_loaded(db)
+        print(f"{len(paths)} resume file(s) found, {len(known)} file(s) already ingested in the database.")
+
+        started = time.monotonic()
+        ingested = skipped = duplicates = done = 0
+        failures: List[Tuple[str, str]] = []
+        seen: Dict[str, str] = {}
+        batch: List[dict] = []
+
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(max(1, args.workers), initializer=_init_worker,
+                          initargs=(known, skill_index.index.skills())) as pool:
+            for path, sha256, extracted, error in pool.imap_unordered(_parse_file, paths, chunksize=4):
+                done += 1
+                if error:
+                    failures.append((path, error))
+                elif extracted is None:
+                    skipped += 1
+                elif sha256 in seen:
+                    duplicates += 1
+                elif not extracted["email"]:
+                    failures.append((path, "no email address found"))
+                else:
+                    seen[sha256] = path
+                    batch.append({"path": path, "sha256": sha256, "extracted": extracted})
+                    if len(batch) >= args.batch_size:
+                        ingested += _commit_batch(db, requisition, user, args.source, batch, failures)
+                        batch = []
+                if done % 500 == 0:
+                    rate = done / (time.monotonic() - started)
+                    print(f"  {done}/{len(paths)} files, {ingested} ingested, {len(failures)} failed ({rate:.1f} files/s)")
+            if batch:
+                ingested += _commit_batch(db, requisition, user, args.source, batch, failures)
+    finally:
+        db.close()
+
+    elapsed = time.monotonic() - started
+    print(f"{done} file(s) in {elapsed:.1f}s ({done / elapsed if elapsed else 0:.1f} files/s): "
+          f"{ingested} ingested, {skipped} already ingested, {duplicates} duplicate(s), {len(failures)} failed.")
+    for path, reason in failures[:20]:
+        print(f"  FAILED {path}: {reason}")
+    if len(failures) > 20:
+        print(f"  ... {len(failures) - 20} more" + ("" if args.report else " (use --report for all)"))
+    if args.report and failures:
+        with open(args.report, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["path", "reason"])
+            writer.writerows(failures)
+        print(f"Failure report written to {args.report}.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
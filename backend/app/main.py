@@ -12,7 +12,7 @@ In production, run Alembic migrations separately (recommended):
 Do NOT run RUN_CREATE_ALL=true in production.
 """
 import os
-from fastapi import FastAPI, Depends, HTTPException, Query, File, UploadFile
+from fastapi import FastAPI, Depends, HTTPException, Query, File, UploadFile, Request
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.staticfiles import StaticFiles
 from starlette.responses import FileResponse, HTMLResponse
@@ -36,7 +36,9 @@ from requisitions.models import Requisitions
 from candidates.models import Candidate 
 from interviews.models import Interview
 from invoices import api as invoice_api
-from app import locations_and_departments
+from app import locations_and_departments, dashboard, response_cache, skill_index, database, parse_queue
+from app.tenancy import TenantScope, get_tenant_scope, is_operator_company
+from app.file_store import prefixed_key, save_upload, stored_file_response, UPLOAD_PREFIX, PDF_PREFIX
 
 
 
@@ -51,6 +53,37 @@ if RUN_CREATE_ALL:
 
 app = FastAPI()
 
+
+@app.on_event("startup")
+def load_skill_index():
+    # Warm the typeahead index; if the database isn't reachable yet the
+    # first /skills search loads it instead.
+    db = database.SessionLocal()
+    try:
+        skill_index.index.load_from_db(db)
+    except Exception as e:
+        print("Skill index not loaded at startup:", str(e))
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+def resume_parse_jobs():
+    # Jobs a previous process accepted but never finished, once their lease runs out
+    db = database.SessionLocal()
+    try:
+        parse_queue.resume_pending(db)
+    except Exception as e:
+        print("Pending resume parse jobs not resumed:", str(e))
+    finally:
+        db.close()
+    parse_queue.start_heartbeat()
+
+
+@app.on_event("shutdown")
+def stop_parse_workers():
+    parse_queue.shutdown()
+
 # ================== CORS SETUP ==================
 origins = [
     "http://localhost:3000",
@@ -110,7 +143,7 @@ def login(data: LoginRequest, db: Session = Depends(get_db)):
     all_companies_list = []
     
     # 🌟 NEW LOGIC: Check if the user is from 'Acme Global'
-    if company_name.lower() == "acme global hub pvt ltd": # Case-insensitive check
+    if is_operator_company(company_rel):
         # Fetch all companies and convert them to a simple list of dicts
         # Assumes the Company model is available via models.Company
         all_companies = db.query(models.Company).all()
@@ -187,7 +220,7 @@ def get_interviewers(current_user=Depends(get_current_user), db: Session = Depen
     return db.query(models.User).filter(models.User.role == "interviewer").all()
 
 @app.put("/companies/{company_id}/agreement")
-async def upload_company_agreement(
+def upload_company_agreement(
     company_id: int,
     agreement: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -202,10 +235,8 @@ async def upload_company_agreement(
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
 
-    # Save the file
-    file_location = f"uploads/agreement_{company_id}_{agreement.filename}"
-    with open(file_location, "wb+") as file_object:
-        file_object.write(agreement.file.read())
+    # Save the file (content-addressed, streamed)
+    file_location = save_upload(db, agreement).path
 
     # Update company record
     company.company_agreement = file_location
@@ -226,93 +257,33 @@ async def websocket_endpoint(websocket: WebSocket, user_id: int):
 
 
 @app.get("/summary")
+@response_cache.cached_response(bucket_seconds=dashboard.SUMMARY_BUCKET_SECONDS)
 def get_dashboard_summary(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
-    company_id: int = Query(None)
+    scope: TenantScope = Depends(get_tenant_scope),
 ):
-    target_company_id = None
-    # Use a safer way to access company name
-    is_acme_user = current_user.company_rel and current_user.company_rel.name.lower() == 'acme global hub pvt ltd'
-
-    if is_acme_user:
-        if company_id:
-            target_company_id = company_id
-        # If company_id is not provided for ACME user, target_company_id remains None,
-        # which will result in global counts (no company filter applied).
-    else:
-        # For non-ACME users, filter by their own company
-        target_company_id = current_user.company_id
-
-    # Base queries
-    open_positions_query = db.query(Requisitions).filter(Requisitions.status == "open")
-    active_candidates_query = db.query(Candidate).filter(Candidate.status == "new")
-    scheduled_interviews_query = db.query(Interview).filter(Interview.status == "Scheduled")
-    recent_requisitions_query = db.query(Requisitions).order_by(Requisitions.created_date.desc())
-    today = datetime.utcnow()
-    upcoming_interviews_query = db.query(Interview).filter(
-            Interview.status == "Scheduled",
-            Interview.scheduled_at >= today,
-            Interview.scheduled_at <= today + timedelta(days=7),
-        ).order_by(Interview.scheduled_at.asc())
-    pending_approvals_query = db.query(Requisitions).filter(Requisitions.approval_status == "pending").order_by(Requisitions.created_date.desc())
-
-
-    if target_company_id:
-        open_positions_query = open_positions_query.filter(Requisitions.company_id == target_company_id)
-        active_candidates_query = active_candidates_query.filter(Candidate.company_id == target_company_id)
-        scheduled_interviews_query = scheduled_interviews_query.filter(Interview.company_id == target_company_id)
-        recent_requisitions_query = recent_requisitions_query.filter(Requisitions.company_id == target_company_id)
-        upcoming_interviews_query = upcoming_interviews_query.filter(Interview.company_id == target_company_id)
-        pending_approvals_query = pending_approvals_query.filter(Requisitions.company_id == target_company_id)
-
-    # Execute queries
-    open_positions = open_positions_query.count()
-    active_candidates = active_candidates_query.count()
-    scheduled_interviews = scheduled_interviews_query.count()
-    recent_requisitions = recent_requisitions_query.limit(5).all()
-    upcoming_interviews = upcoming_interviews_query.limit(5).all()
-    pending_approvals = pending_approvals_query.limit(5).all()
+    # Operator users without a company_id get global counts (no company filter).
+    return dashboard.get_dashboard_summary(db, scope)
 
-    return {
-        "summary": {
-            "open_positions": open_positions,
-            "active_candidates": active_candidates,
-            "scheduled_interviews": scheduled_interviews,
-        },
-        "recent_requisitions": [
-            {"id": r.id, 
-            "position": r.position, 
-            "status": r.status, 
-            "created_date": r.created_date, 
-            'department': r.department,
-            'priority':r.priority,
-            'req_id':r.req_id,
-            'applications_count': len(r.candidates),
 
-            }
-            for r in recent_requisitions
-        ],
-        "upcoming_interviews": [
-            {"id": i.id, "candidate_id": i.candidate_id, "scheduled_date": i.datetime}
-            for i in upcoming_interviews
-        ],
-        "pending_approvals": [
-            {"id": p.id, "position": p.position, "created_date": p.created_date, 'req_id':p.req_id, }
-            for p in pending_approvals
-        ],
-    }
+@app.get("/cache/stats")
+def get_cache_stats(current_user=Depends(get_current_user)):
+    if current_user.role.lower() != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return response_cache.stats()
 
 
 @app.get("/skills", response_model=List[schemas.Skill])
-def read_skills(q: str = "", db: Session = Depends(get_db)):
+def read_skills(q: str = "", limit: int = Query(100, ge=1, le=skill_index.MAX_RESULTS), fuzzy: bool = False,
+                db: Session = Depends(get_db)):
     """
-    Search for skills.
+    Search for skills. With `q`, returns ranked typeahead matches;
+    `fuzzy=true` also matches names one typo away.
     """
     if not q:
         skills = crud.get_all_skills(db)
         return skills
-    skills = crud.search_skills(db, query=q)
+    skills = crud.search_skills(db, query=q, limit=limit, fuzzy=fuzzy)
     return skills
 
 @app.post("/skills", response_model=schemas.Skill)
@@ -322,7 +293,7 @@ def create_skill(
 ):
 
     # The CRUD logic is already available via crud.create_skill or similar
-    db_skill = db.query(models.Skill).filter(models.Skill.name == skill.name).first()
+    db_skill = crud.get_skill_by_name(db, skill.name)
     if db_skill:
         raise HTTPException(status_code=400, detail="Skill already exists")
     
@@ -378,14 +349,20 @@ app.include_router(locations_and_departments.router, prefix="/list", tags=["Depa
 
 
 # ================== FRONTEND PATH SETUP (SIMPLIFIED FIX) ==================
-# 🟢 Create the directory if it doesn't exist
-if not os.path.exists("uploads"):
-    os.makedirs("uploads")
-
-# 🟢 MOUNT THE DIRECTORY
-# This makes http://localhost:8000/uploads/filename.pdf accessible
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
-app.mount("/pdfs", StaticFiles(directory="pdfs"), name="pdfs")
+# 🟢 SERVE STORED FILES
+# http://localhost:8000/uploads/<key> and /pdfs/<key> stream from the storage
+# backend (local disk or S3), so the stored paths work with either. Keys are
+# content hashes: ETag/304, byte ranges and immutable caching come with them.
+# A name that normalises to anything outside its own prefix is a 404.
+@app.api_route("/uploads/{name:path}", methods=["GET", "HEAD"])
+def serve_upload(name: str, request: Request):
+    return stored_file_response(request, prefixed_key(UPLOAD_PREFIX, name), immutable=True)
+
+
+@app.api_route("/pdfs/{name:path}", methods=["GET", "HEAD"])
+def serve_pdf(name: str, request: Request):
+    return stored_file_response(request, prefixed_key(PDF_PREFIX, name), immutable=True)
+
 # 1️⃣ Define frontend build directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 FRONTEND_BUILD_DIR = os.path.abspath(os.path.join(BASE_DIR, '..', 'frontend', 'build'))
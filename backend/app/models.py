@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Table, ForeignKey,Text, Boolean,LargeBinary
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Table, ForeignKey,Text, Boolean, Index, JSON
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime
@@ -94,6 +94,10 @@ class Notification(Base):
     user = relationship("User", back_populates="notifications")
     requisition = relationship("Requisitions", back_populates="notifications")
 
+    __table_args__ = (
+        Index("ix_notifications_user_created", "user_id", "created_at"),
+    )
+
 
 class EmailLog(Base):
     __tablename__ = "email_logs"
@@ -122,17 +126,79 @@ class Location(Base):
 
     requisitions = relationship("Requisitions", back_populates="location")
 
+def _skill_name_key(context):
+    from app.skill_index import normalize
+
+    return normalize(context.get_current_parameters()["name"])
+
+
 class Skill(Base):
     __tablename__ = 'skills'
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), unique=True, index=True, nullable=False)
+    # The normalized name (app.skill_index.normalize): skills are matched on
+    # this, so "python" finds "Python" whatever the column collation. Renames
+    # keep it current through the ORM hook in app.crud.
+    name_key = Column(String(100), unique=True, index=True, nullable=False, default=_skill_name_key)
 
     requisitions = relationship("Requisitions", secondary=requisition_skills, back_populates="skills")
     candidates = relationship("Candidate", secondary=candidate_skills, back_populates="skills")
 
+class DashboardCounter(Base):
+    """
+    Per-company dashboard counts, kept current by app.dashboard on every flush
+    that touches a counted status. Rebuild with `python -m app.reconcile_counters`.
+    """
+    __tablename__ = "dashboard_counters"
+
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    open_positions = Column(Integer, nullable=False, default=0)
+    active_candidates = Column(Integer, nullable=False, default=0)
+    scheduled_interviews = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ResponseCacheGeneration(Base):
+    """
+    Generation counter of one response-cache scope (a company id, "all" or
+    "global"), shared by every worker. See app.response_cache. The "skills"
+    row is the skill taxonomy's version (app.skill_index).
+    """
+    __tablename__ = "response_cache_generations"
+
+    scope = Column(String(32), primary_key=True)
+    generation = Column(BigInteger, nullable=False, default=0)
+
+
+class Blob(Base):
+    """
+    A stored file. The id is the SHA-256 of the content, `path` the storage
+    key (see app.storage); the bytes themselves never live in the database.
+    """
+    __tablename__ = "blobs"
+
+    id = Column(String(64), primary_key=True)
+    path = Column(String(512), nullable=False)
+    size = Column(BigInteger, nullable=True)
+    content_type = Column(String(100), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ParsedResume(Base):
+    """Resume extraction output by content hash and parser version (see app.parse_cache)."""
+    __tablename__ = "parsed_resumes"
+
+    sha256 = Column(String(64), primary_key=True)
+    parser_version = Column(Integer, primary_key=True)
+    fields = Column(JSON, nullable=False)               # name, email, phone
+    text = Column(Text(16777215), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class Document(Base):
     __tablename__ = "documents"
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(100), nullable=False)
-    file_data = Column(LargeBinary, nullable=False)  # Binary file content
+    blob_id = Column(String(64), ForeignKey("blobs.id"), nullable=False)
+    blob = relationship("Blob")
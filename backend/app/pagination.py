@@ -0,0 +1,82 @@
+"""
+Keyset (cursor) pagination on (created timestamp, id), newest first.
+
+A cursor is an opaque, URL-safe token for the last row of the previous page.
+Walking pages this way costs one index range scan per page no matter how
+deep the client goes, unlike OFFSET which scans and discards every earlier row.
+Pass `cursor=` (empty) to get the first page.
+
+skip/limit lists go through offset_page, which sorts exactly the same way, so
+walking a list by offset and by cursor yields the same rows in the same order.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+
+def encode_token(values: list) -> str:
+    """Opaque cursor for a list of JSON-serialisable sort-key values."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_token(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def encode_cursor(created: Optional[datetime], row_id) -> str:
+    return encode_token([created.isoformat() if created else None, row_id])
+
+
+def decode_cursor(cursor: str):
+    try:
+        created, row_id = decode_token(cursor)
+        return (datetime.fromisoformat(created) if created else None), row_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def newest_first(query, created_col, id_col):
+    """The one list order: created timestamp descending, id as the tiebreak."""
+    return query.order_by(created_col.desc(), id_col.desc())
+
+
+def offset_page(query, created_col, id_col, skip: int, limit: int) -> list:
+    """Rows skip..skip+limit in the same order keyset_page walks."""
+    return newest_first(query, created_col, id_col).offset(skip).limit(limit).all()
+
+
+def keyset_page(query, created_col, id_col, cursor: Optional[str], limit: int):
+    """
+    Returns (rows, next_cursor) for the page after `cursor`. next_cursor is
+    None on the last page. Rows with a NULL timestamp come last, which is
+    where MySQL sorts NULLs in a DESC order.
+    """
+    if cursor:
+        created, row_id = decode_cursor(cursor)
+        if created is None:
+            query = query.filter(created_col.is_(None), id_col < row_id)
+        else:
+            query = query.filter(or_(
+                created_col < created,
+                and_(created_col == created, id_col < row_id),
+                created_col.is_(None),
+            ))
+
+    rows = newest_first(query, created_col, id_col).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if rows:
+            last = rows[-1]
+            next_cursor = encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+    return rows, next_cursor
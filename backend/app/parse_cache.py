@@ -0,0 +1,62 @@
+"""
+Resume parse results by file content, so a resume uploaded for several
+requisitions is extracted once.
+
+Entries are keyed by the file's SHA-256 (content-addressed storage keys
+already carry it) and PARSER_VERSION: bump the version when extraction
+changes and older entries simply stop matching. They live in the
+parsed_resumes table, fronted by a per-process LRU. What is cached is the
+extraction output (name, email, phone, text); skills are matched against the
+current taxonomy on every use.
+
+Settings:
+    PARSE_CACHE_ENTRIES   LRU size per process (default 1024)
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models import ParsedResume
+from app.utils.parse_resume import PARSER_VERSION
+
+PARSE_CACHE_ENTRIES = int(os.getenv("PARSE_CACHE_ENTRIES", "1024"))
+
+_lru: "OrderedDict[tuple, dict]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _remember(key: tuple, result: dict):
+    with _lock:
+        _lru[key] = result
+        _lru.move_to_end(key)
+        while len(_lru) > PARSE_CACHE_ENTRIES:
+            _lru.popitem(last=False)
+
+
+def get(db: Session, sha256: str) -> Optional[dict]:
+    """The cached extraction for this content and parser version, or None."""
+    key = (sha256, PARSER_VERSION)
+    with _lock:
+        result = _lru.get(key)
+        if result is not None:
+            _lru.move_to_end(key)
+            return dict(result)
+
+    row = db.get(ParsedResume, key)
+    if row is None:
+        return None
+    result = {**row.fields, "text": row.text}
+    _remember(key, result)
+    return dict(result)
+
+
+def put(db: Session, sha256: str, result: dict):
+    """Record an extraction in the caller's transaction (a concurrent duplicate is ignored)."""
+    fields = {k: v for k, v in result.items() if k != "text"}
+    db.execute(
+        insert(ParsedResume).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite"),
+        [{"sha256": sha256, "parser_version": PARSER_VERSION, "fields": fields, "text": result["text"]}],
+    )
+    _remember((sha256, PARSER_VERSION), dict(result))
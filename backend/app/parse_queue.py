@@ -0,0 +1,408 @@
+"""
+Background resume parsing.
+
+Text extraction (PyMuPDF, python-docx) is CPU-bound, so it runs in a bounded
+pool of worker processes instead of on request workers. A job is a
+candidates File row and the File id is the job id: enqueue() marks the row
+queued and submits it once the caller commits, and the row's parse_* columns
+carry status, progress and the extracted fields for
+GET /candidates/resume-parse/{job_id}.
+
+Workers only read the file and return what they extracted; they never touch
+the database. Their progress messages and results come back to this process,
+where one writer thread records them and matches skills against the current
+taxonomy (app.skill_matcher, which stays current through the skill hooks).
+Results are cached by file content (app.parse_cache): re-uploading a resume
+completes at enqueue() without a worker.
+
+Every app process (gunicorn worker) has its own pool, so a job is leased to
+the process that runs it: parse_owner names the process and
+parse_lease_until is renewed by its heartbeat thread for as long as the job
+is queued or running there. A job whose lease has run out (its process died
+or was restarted) is taken over by whichever process claims it first, with
+a conditional UPDATE, so it never runs twice at once.
+
+Extraction stops itself at its page, character and time budgets
+(app.utils.parse_resume), but only between pages: one pathological page, or
+a worker stuck in a library call, can't be interrupted from inside. So each
+file also gets a hard deadline here: a worker still on a job
+PARSE_JOB_TIMEOUT_SECONDS after it picked it up is killed, the job fails
+with a timeout error, and the pool is replaced. Jobs that were queued or
+running in the killed pool are submitted again.
+
+Settings:
+    PARSE_WORKERS               worker processes (default 2)
+    PARSE_LEASE_SECONDS         how long a job stays with a silent process (default 300)
+    PARSE_JOB_TIMEOUT_SECONDS   hard cap on one file in a worker (default 60)
+"""
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Set, Tuple
+from sqlalchemy import event, or_
+from sqlalchemy.orm import Session
+from app import database, parse_cache
+from app.file_store import content_hash
+
+PARSE_WORKERS = max(1, int(os.getenv("PARSE_WORKERS", "2")))
+PARSE_LEASE_SECONDS = int(os.getenv("PARSE_LEASE_SECONDS", "300"))
+PARSE_JOB_TIMEOUT_SECONDS = float(os.getenv("PARSE_JOB_TIMEOUT_SECONDS", "60"))
+WATCHDOG_INTERVAL_SECONDS = 1
+PROGRESS_STEP = 10          # percent; bounds progress writes per job
+
+# Names this process in parse_owner
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"[-64:]
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+STARTED = "started"         # worker -> app only: a worker (its pid) picked the job up
+
+_PENDING_JOBS = "pending_parse_jobs"
+
+_executor: Optional[ProcessPoolExecutor] = None
+_progress = None            # multiprocessing queue, workers -> this process
+_events: "queue.Queue" = queue.Queue()
+_start_lock = threading.Lock()
+_heartbeat_started = False
+_heartbeat_lock = threading.Lock()
+
+# Jobs submitted from this process, for the watchdog
+_futures: Dict[str, Future] = {}
+_running: Dict[str, Tuple[int, float]] = {}     # job id -> (worker pid, monotonic deadline)
+_timed_out: Set[str] = set()
+_jobs_lock = threading.RLock()
+
+
+# ---------- worker process ----------
+
+_worker_progress = None
+
+
+def _init_worker(progress):
+    global _worker_progress
+    _worker_progress = progress
+
+
+def _parse_in_worker(job_id: str, key: str) -> dict:
+    from app import storage
+    from app.utils.parse_resume import extract_resume
+
+    _worker_progress.put((job_id, STARTED, os.getpid()))
+    reported = 0
+
+    def on_page(done: int, total: int):
+        nonlocal reported
+        percent = 90 * done // total        # the rest is skill matching, back in the app
+        if percent - reported >= PROGRESS_STEP:
+            reported = percent
+            _worker_progress.put((job_id, RUNNING, percent))
+
+    with storage.backend.local_copy(key) as path:
+        return extract_resume(path, on_page=on_page)
+
+
+# ---------- app process ----------
+
+def _start() -> ProcessPoolExecutor:
+    global _executor, _progress
+    with _start_lock:
+        if _executor is None:
+            # spawn: forking a process that holds DB connections and threads is unsafe
+            context = multiprocessing.get_context("spawn")
+            if _progress is None:
+                _progress = context.Queue()
+                threading.Thread(target=_forward_progress, name="parse-progress", daemon=True).start()
+                threading.Thread(target=_write_events, name="parse-writer", daemon=True).start()
+                threading.Thread(target=_watchdog, name="parse-watchdog", daemon=True).start()
+            _executor = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS, mp_context=context,
+                initializer=_init_worker, initargs=(_progress,),
+            )
+    start_heartbeat()
+    return _executor
+
+
+def _forward_progress():
+    while True:
+        job_id, status, payload = _progress.get()
+        if status == STARTED:
+            _track(job_id, payload)
+            status, payload = RUNNING, 0
+        _events.put((job_id, status, payload))
+
+
+def _recycle(broken: ProcessPoolExecutor):
+    """Drop a pool broken by a killed worker; the next _start() makes a new one."""
+    global _executor
+    with _start_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(job_id: str, key: str):
+    with _jobs_lock:
+        executor = _start()
+        try:
+            future = executor.submit(_parse_in_worker, job_id, key)
+        except BrokenProcessPool:
+            _recycle(executor)
+            future = _start().submit(_parse_in_worker, job_id, key)
+        _futures[job_id] = future
+    future.add_done_callback(lambda f: _finished(job_id, key, f))
+
+
+def _finished(job_id: str, key: str, future: Future):
+    with _jobs_lock:
+        if _futures.get(job_id) is future:
+            del _futures[job_id]
+        _running.pop(job_id, None)
+    _events.put((job_id, DONE, (key, future)))
+
+
+def _track(job_id: str, pid: int):
+    """Start the job's hard deadline, unless it finished before its STARTED message got here."""
+    with _jobs_lock:
+        future = _futures.get(job_id)
+        if future is not None and not future.done():
+            _running[job_id] = (pid, time.monotonic() + PARSE_JOB_TIMEOUT_SECONDS)
+
+
+def kill_overdue(now: Optional[float] = None) -> list:
+    """Kill the workers of jobs past their hard deadline; returns those job ids."""
+    now = time.monotonic() if now is None else now
+    with _jobs_lock:
+        overdue = [(job_id, pid) for job_id, (pid, deadline) in _running.items() if deadline <= now]
+        for job_id, _ in overdue:
+            del _running[job_id]
+            _timed_out.add(job_id)
+    for _, pid in overdue:
+        try:
+            os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+        except OSError:             # already gone
+            pass
+    return [job_id for job_id, _ in overdue]
+
+
+def _watchdog():
+    while True:
+        time.sleep(WATCHDOG_INTERVAL_SECONDS)
+        kill_overdue()
+
+
+def _lease_until() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=PARSE_LEASE_SECONDS)
+
+
+def _update(db: Session, job_id: str, values: dict, only_if: tuple = ()) -> int:
+    """
+    Write a job's parse_* columns if this process still holds its lease;
+    returns 0 when another process has taken the job over since.
+    """
+    from candidates.models import File
+
+    # Bulk update: no flush, so parse progress doesn't invalidate the response
+    # cache (no cached response includes the parse_* columns)
+    query = db.query(File).filter(File.id == job_id, File.parse_owner == WORKER_ID)
+    if only_if:
+        query = query.filter(File.parse_status.in_(only_if))
+    updated = query.update(values, synchronize_session=False)
+    db.commit()
+    return updated
+
+
+def _done_values(extracted: dict) -> dict:
+    """parse_* column values for a finished job, from the extraction output."""
+    from app.utils.parse_resume import find_skills
+
+    fields = {k: v for k, v in extracted.items() if k != "text"}
+    fields["skills"] = find_skills(extracted["text"])
+    return {"parse_status": DONE, "parse_progress": 100, "parsed_fields": fields,
+            "parsed_text": extracted["text"], "parse_error": None, "parsed_at": datetime.utcnow(),
+            "parse_lease_until": None}
+
+
+def _record_result(db: Session, job_id: str, key: str, future: Future):
+    if future.cancelled():          # shutting down: stays queued for resume_pending()
+        return
+    with _jobs_lock:
+        timed_out = job_id in _timed_out
+        _timed_out.discard(job_id)
+    try:
+        extracted = future.result()
+        if "error" in extracted:
+            raise ValueError(extracted["error"])
+        values = _done_values(extracted)
+    except BrokenProcessPool:
+        if not timed_out:           # lost with a worker killed for another job: run it again, if still ours
+            if _update(db, job_id, {"parse_progress": 0}, only_if=(QUEUED, RUNNING)):
+                _submit(job_id, key)
+            return
+        _update(db, job_id, {"parse_status": FAILED,
+                             "parse_error": f"Parsing took longer than {PARSE_JOB_TIMEOUT_SECONDS:g} seconds",
+                             "parsed_at": datetime.utcnow(), "parse_lease_until": None},
+                only_if=(QUEUED, RUNNING))
+        return
+    except Exception as e:
+        _update(db, job_id, {"parse_status": FAILED, "parse_error": str(e) or type(e).__name__,
+                             "parsed_at": datetime.utcnow(), "parse_lease_until": None},
+                only_if=(QUEUED, RUNNING))
+        return
+    sha256 = content_hash(key)
+    if sha256:
+        parse_cache.put(db, sha256, extracted)
+    if _update(db, job_id, values, only_if=(QUEUED, RUNNING)):
+        _reindex_candidate(db, job_id)
+
+
+def _reindex_candidate(db: Session, job_id: str):
+    """The resume text is searchable (candidates.search); _update's bulk UPDATE skipped the flush hooks."""
+    from candidates import search
+    from candidates.models import File
+
+    candidate_id = db.query(File.candidate_id).filter(File.id == job_id).scalar()
+    if candidate_id:
+        search.reindex(db, [candidate_id])
+        db.commit()
+
+
+def _write_events():
+    while True:
+        job_id, status, payload = _events.get()
+        db = database.SessionLocal()
+        try:
+            if status == DONE:
+                _record_result(db, job_id, *payload)
+            else:
+                _update(db, job_id, {"parse_status": RUNNING, "parse_progress": payload},
+                        only_if=(QUEUED, RUNNING))
+        except Exception as e:
+            db.rollback()
+            print(f"Resume parse job {job_id}: could not record {status}:", str(e))
+        finally:
+            db.close()
+
+
+def enqueue(db: Session, file) -> str:
+    """
+    Queue a File for parsing and return its job id. The row change joins the
+    caller's transaction; the job is submitted only after it commits. Content
+    parsed before (app.parse_cache) completes right here, without opening
+    the file.
+    """
+    if file.id is None:
+        file.id = str(uuid.uuid4())
+    sha256 = content_hash(file.file_url)
+    cached = parse_cache.get(db, sha256) if sha256 else None
+    if cached is not None:
+        for column, value in _done_values(cached).items():
+            setattr(file, column, value)
+        return file.id
+
+    file.parse_status = QUEUED
+    file.parse_owner = WORKER_ID
+    file.parse_lease_until = _lease_until()
+    file.parse_progress = 0
+    file.parsed_fields = None
+    file.parsed_text = None
+    file.parse_error = None
+    file.parsed_at = None
+    db.info.setdefault(_PENDING_JOBS, {})[file.id] = file.file_url
+    return file.id
+
+
+def _submit_pending(session: Session):
+    pending = session.info.pop(_PENDING_JOBS, None)
+    for job_id, key in (pending or {}).items():
+        _submit(job_id, key)
+
+
+def _discard_pending(session: Session):
+    session.info.pop(_PENDING_JOBS, None)
+
+
+def _lease_expired(File, now: datetime):
+    return [File.parse_status.in_((QUEUED, RUNNING)),
+            or_(File.parse_lease_until.is_(None), File.parse_lease_until < now)]
+
+
+def resume_pending(db: Session) -> int:
+    """
+    Take over jobs whose process stopped renewing their lease (it died or was
+    restarted) and submit them here; returns how many. Each job is claimed
+    with a conditional UPDATE, so when several processes resume at once only
+    one of them gets it.
+    """
+    from candidates.models import File
+
+    now = datetime.utcnow()
+    jobs = db.query(File.id, File.file_url).filter(*_lease_expired(File, now)).all()
+    claimed = 0
+    for job_id, key in jobs:
+        won = (
+            db.query(File)
+            .filter(File.id == job_id, *_lease_expired(File, now))
+            .update({"parse_status": QUEUED, "parse_progress": 0, "parse_owner": WORKER_ID,
+                     "parse_lease_until": _lease_until()}, synchronize_session=False)
+        )
+        db.commit()
+        if won:
+            _submit(job_id, key)
+            claimed += 1
+    return claimed
+
+
+def renew_leases(db: Session) -> int:
+    """Extend the leases of the jobs this process holds; returns how many."""
+    from candidates.models import File
+
+    renewed = (
+        db.query(File)
+        .filter(File.parse_owner == WORKER_ID, File.parse_status.in_((QUEUED, RUNNING)))
+        .update({"parse_lease_until": _lease_until()}, synchronize_session=False)
+    )
+    db.commit()
+    return renewed
+
+
+def _heartbeat():
+    # Renew well before the lease runs out, and pick up jobs other processes dropped
+    while True:
+        time.sleep(PARSE_LEASE_SECONDS / 3)
+        db = database.SessionLocal()
+        try:
+            renew_leases(db)
+            resume_pending(db)
+        except Exception as e:
+            db.rollback()
+            print("Resume parse leases not renewed:", str(e))
+        finally:
+            db.close()
+
+
+def start_heartbeat():
+    """Start the thread renewing this process's leases and resuming abandoned jobs (idempotent)."""
+    global _heartbeat_started
+    with _heartbeat_lock:
+        if not _heartbeat_started:
+            _heartbeat_started = True
+            threading.Thread(target=_heartbeat, name="parse-heartbeat", daemon=True).start()
+
+
+def shutdown():
+    global _executor
+    with _start_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+event.listen(Session, "after_commit", _submit_pending)
+event.listen(Session, "after_rollback", _discard_pending)
@@ -0,0 +1,35 @@
+"""
+Recompute dashboard_counters from the requisitions, candidates and interviews
+tables and report any drift.
+
+    python -m app.reconcile_counters            # report and fix
+    python -m app.reconcile_counters --dry-run  # report only
+
+Exits with status 1 when drift was found, so it can run from cron/CI.
+"""
+import argparse
+import sys
+from app.database import SessionLocal
+from app import dashboard
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Reconcile dashboard counters.")
+    parser.add_argument("--dry-run", action="store_true", help="only report drift, don't rewrite the counters")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        drift = dashboard.reconcile_counters(db, fix=not args.dry_run)
+    finally:
+        db.close()
+
+    for company_id, field, stored, actual in drift:
+        print(f"company {company_id}: {field} stored={stored} actual={actual}")
+    verb = "found" if args.dry_run else "fixed"
+    print(f"{len(drift)} drifted counter(s) {verb}.")
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
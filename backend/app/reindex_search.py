@@ -0,0 +1,51 @@
+"""
+Rebuild the candidate search index (candidates.search) from the candidates,
+skills and parsed resume text.
+
+    python -m app.reindex_search                # every candidate
+    python -m app.reindex_search --company-id 7 # one tenant
+
+Needed once after the candidate_search_postings migration, and after changes
+the write hooks don't see (a renamed skill, rows edited by hand).
+"""
+import argparse
+import sys
+from app.database import SessionLocal
+# Every model module, so relationships between them resolve outside the app
+import interviews.models, invoices.models, offers.models  # noqa: F401
+from candidates import search
+from candidates.models import Candidate
+
+BATCH_SIZE = 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the candidate search index.")
+    parser.add_argument("--company-id", type=int, default=None, help="only this tenant's candidates")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    done, last_id = 0, ""
+    try:
+        while True:
+            # Keyset over ids: one transaction per batch, so a large rebuild can be interrupted and rerun
+            query = db.query(Candidate.id).filter(Candidate.id > last_id)
+            if args.company_id is not None:
+                query = query.filter(Candidate.company_id == args.company_id)
+            ids = [row.id for row in query.order_by(Candidate.id).limit(BATCH_SIZE)]
+            if not ids:
+                break
+            search.reindex(db, ids)
+            db.commit()
+            done += len(ids)
+            last_id = ids[-1]
+            print(f"  {done} candidate(s) reindexed")
+    finally:
+        db.close()
+
+    print(f"{done} candidate(s) reindexed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
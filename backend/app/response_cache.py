@@ -0,0 +1,322 @@
+"""
+Response cache for the hot, read-mostly list endpoints (/candidates,
+/requisitions, /interviews, /summary).
+
+Entries are keyed by (endpoint, tenant, role, user scope, query params) and
+by the tenant's *generation*: a counter bumped after every committed write
+that touches that tenant. Bumping the generation orphans every older entry,
+so a stale response is never served and nothing has to be deleted.
+Responses that also depend on the clock (the /summary time windows) add
+their time bucket to the key, so they move on with it rather than with the
+TTL.
+
+Generations must be shared by every worker, or a write handled by one
+worker would leave the others serving their old entries until the TTL.
+
+Backends:
+    memory (default)  in-process LRU per worker; generations are rows of
+                      response_cache_generations, read with the request's
+                      session (one primary-key lookup per cached request)
+    redis             entries and generations shared across workers;
+                      RESPONSE_CACHE_BACKEND=redis, RESPONSE_CACHE_REDIS_URL
+                      (falls back to REDIS_URL)
+"""
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy import event, insert, inspect, select, update
+from sqlalchemy.orm import Session
+from app.models import ResponseCacheGeneration
+from app.tenancy import TenantScope
+
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory").lower()
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL") or os.getenv("REDIS_URL", "redis://localhost:6379/0")
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+
+# Generation scopes that are not a company id
+GLOBAL_GENERATION = "global"   # shared reference data (skills, departments, ...)
+ALL_TENANTS = "all"            # operator's unfiltered view; bumped by every tenant write
+
+# Writes to these tables never show up in a cached response.
+UNCACHED_TABLES = {
+    "candidate_activity_logs", "requisition_activity_logs", "notifications", "email_logs",
+    "dashboard_counters", "offers", "approval_records", "salary_bands", "blobs",
+    "invoices", "invoice_items", "documents", "scorecards", "parsed_resumes",
+    "candidate_imports", "candidate_import_errors",
+}
+
+
+class LRUCacheBackend:
+    """In-process LRU with a TTL on top. Generations live in the database."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, ttl: int = RESPONSE_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_generations(self, scopes: list, db: Session) -> list:
+        G = ResponseCacheGeneration
+        keys = [str(s) for s in scopes]
+        stored = dict(db.execute(select(G.scope, G.generation).where(G.scope.in_(keys))).all())
+        return [stored.get(k, 0) for k in keys]
+
+    def bump_generations(self, scopes: set, bind):
+        G = ResponseCacheGeneration
+        keys = sorted(str(s) for s in scopes)
+        with bind.begin() as connection:
+            connection.execute(update(G).where(G.scope.in_(keys)).values(generation=G.generation + 1))
+            existing = set(connection.execute(select(G.scope).where(G.scope.in_(keys))).scalars())
+            missing = [{"scope": k, "generation": 1} for k in keys if k not in existing]
+            if missing:
+                # A concurrent first bump may insert the same row; either one invalidates.
+                connection.execute(
+                    insert(G).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite"),
+                    missing,
+                )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCacheBackend:
+    """Shared backend: entries expire via SETEX, generations are INCR counters."""
+
+    prefix = "rmm:respcache:"
+
+    def __init__(self, url: str = RESPONSE_CACHE_REDIS_URL, ttl: int = RESPONSE_CACHE_TTL_SECONDS):
+        import redis  # optional dependency, only needed for this backend
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes):
+        self.client.setex(self.prefix + key, self.ttl, value)
+
+    def get_generations(self, scopes: list, db: Session) -> list:
+        values = self.client.mget([f"{self.prefix}gen:{s}" for s in scopes])
+        return [int(v) if v else 0 for v in values]
+
+    def bump_generations(self, scopes: set, bind):
+        pipe = self.client.pipeline()
+        for s in scopes:
+            pipe.incr(f"{self.prefix}gen:{s}")
+        pipe.execute()
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+
+def _make_backend():
+    if RESPONSE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend()
+    return LRUCacheBackend()
+
+
+backend = _make_backend()
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(endpoint: str, outcome: str):
+    with _stats_lock:
+        counts = _stats.setdefault(endpoint, {"hits": 0, "misses": 0})
+        counts[outcome] += 1
+
+
+def stats() -> dict:
+    """Hit/miss counts per endpoint since the worker started."""
+    with _stats_lock:
+        per_endpoint = {name: dict(counts) for name, counts in _stats.items()}
+    hits = sum(c["hits"] for c in per_endpoint.values())
+    misses = sum(c["misses"] for c in per_endpoint.values())
+    return {
+        "backend": type(backend).__name__,
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+        "endpoints": per_endpoint,
+    }
+
+
+def recruiter_scope(scope: TenantScope, params: dict) -> Optional[int]:
+    """Recruiters see only the candidates they own (TenantScope.candidate_filters)."""
+    return scope.user.id if scope.role == "recruiter" else None
+
+
+def time_bucket(seconds: int, now: Optional[float] = None) -> int:
+    """Index of the `seconds`-long window of the clock that `now` (default: now) falls in."""
+    return int((time.time() if now is None else now) // seconds)
+
+
+def _cache_key(endpoint: str, scope: TenantScope, params: dict, db: Session, user_scope,
+               bucket_seconds: Optional[int] = None) -> str:
+    tenant = scope.company_id if scope.company_id is not None else ALL_TENANTS
+    generations = backend.get_generations([GLOBAL_GENERATION, tenant], db)
+    # Responses restricted to the caller's own rows are cached per user.
+    user_scope = user_scope(scope, params)
+    if user_scope is None:
+        user_scope = "*"
+    bucket = time_bucket(bucket_seconds) if bucket_seconds else None
+    raw = json.dumps(
+        [endpoint, tenant, scope.is_operator, scope.role, user_scope, generations, bucket, sorted(params.items())],
+        default=str,
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def cached_response(response_model=None, user_scope=recruiter_scope, bucket_seconds: Optional[int] = None):
+    """
+    Cache the JSON produced by a tenant-scoped GET endpoint.
+
+    The endpoint must take its TenantScope as the `scope` argument and its
+    session as `db`. Every other argument is treated as a query parameter
+    and becomes part of the key. `user_scope(scope, params)` returns the user
+    id the endpoint's filters restrict rows to, if any, and must use the same
+    inputs as those filters. An endpoint whose result depends on the clock
+    passes `bucket_seconds`: entries are then keyed by time_bucket() too and
+    the endpoint should compute its windows from the start of that bucket.
+    On a miss the endpoint's return value is
+    serialised here (through `response_model`, like FastAPI would) so the
+    exact bytes can be stored and replayed.
+    """
+    adapter = TypeAdapter(response_model) if response_model is not None else None
+
+    def decorator(func):
+        endpoint = f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            scope = kwargs["scope"]
+            params = {k: v for k, v in kwargs.items() if not isinstance(v, (Session, TenantScope))}
+            key = _cache_key(endpoint, scope, params, kwargs["db"], user_scope, bucket_seconds)
+
+            body = backend.get(key)
+            if body is not None:
+                _record(endpoint, "hits")
+                return Response(content=body, media_type="application/json", headers={"X-Cache": "HIT"})
+
+            _record(endpoint, "misses")
+            result = func(*args, **kwargs)
+            if adapter is not None:
+                body = adapter.dump_json(adapter.validate_python(result, from_attributes=True), by_alias=True)
+            else:
+                body = json.dumps(jsonable_encoder(result), ensure_ascii=False, separators=(",", ":")).encode()
+            backend.set(key, body)
+            return Response(content=body, media_type="application/json", headers={"X-Cache": "MISS"})
+
+        return wrapper
+
+    return decorator
+
+
+# ================== INVALIDATION ==================
+# Every flush records which tenants it touched; once the transaction commits
+# their generations are bumped. Bumping after commit (not at flush) means a
+# concurrent reader can never cache pre-commit data under the new generation.
+
+_TOUCHED = "response_cache_touched"
+
+
+def _old_value(obj, key: str):
+    history = inspect(obj).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return None
+
+
+def _file_tenants(session: Session, obj) -> set:
+    """Files show up in cached responses only as part of their candidate: its tenant, before and after."""
+    from candidates.models import Candidate
+
+    candidate_ids = {obj.candidate_id, _old_value(obj, "candidate_id")}
+    candidate_ids.discard(None)
+    company_ids = set()
+    for candidate_id in candidate_ids:
+        candidate = session.get(Candidate, candidate_id)
+        company_ids.add(candidate.company_id if candidate is not None else None)
+    return company_ids
+
+
+def _collect_touched_tenants(session: Session, flush_context, instances):
+    touched = session.info.setdefault(_TOUCHED, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(type(obj), "__tablename__", None)
+        if table in UNCACHED_TABLES:
+            continue
+        if table == "files":
+            company_ids = _file_tenants(session, obj)
+            if not company_ids:         # a standalone upload: in no cached response
+                continue
+        elif table == "companies":
+            company_ids = {obj.id}
+        elif hasattr(obj, "company_id"):
+            company_ids = {obj.company_id, _old_value(obj, "company_id")}
+        else:
+            touched.add(GLOBAL_GENERATION)
+            continue
+        company_ids.discard(None)
+        touched.update(company_ids or {GLOBAL_GENERATION})
+    if touched and touched != {GLOBAL_GENERATION}:
+        touched.add(ALL_TENANTS)
+
+
+def touch_tenants(session: Session, company_ids):
+    """
+    For writes no flush sees (Core bulk INSERTs): invalidate these tenants'
+    cached responses when the session commits.
+    """
+    touched = session.info.setdefault(_TOUCHED, set())
+    touched.update(company_id for company_id in company_ids if company_id is not None)
+    touched.add(ALL_TENANTS)
+
+
+def _bump_touched_tenants(session: Session):
+    touched = session.info.pop(_TOUCHED, None)
+    if touched:
+        backend.bump_generations(touched, session.get_bind())
+
+
+def _discard_touched_tenants(session: Session):
+    session.info.pop(_TOUCHED, None)
+
+
+event.listen(Session, "before_flush", _collect_touched_tenants)
+event.listen(Session, "after_commit", _bump_touched_tenants)
+event.listen(Session, "after_rollback", _discard_touched_tenants)
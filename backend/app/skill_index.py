@@ -0,0 +1,257 @@
+"""
+In-memory typeahead index over skill names, used by GET /skills?q=.
+
+Every skill is indexed under its normalized full name and under the start of
+each later word, so "lear" finds "Machine Learning". The keys live in one
+sorted list: the run of keys starting with the query is found with two
+bisects, the same walk a prefix trie makes, without a node object per
+character (a node trie over a 50k-skill taxonomy costs hundreds of MB in
+CPython). When those prefix matches don't fill the page, names containing
+the query anywhere ("script" in "JavaScript") follow, found by a substring
+scan over the full names, as the ILIKE '%q%' this replaced did. Ranked
+results for busy prefixes, and infix results, are memoized until the next
+write.
+
+Each worker holds its own copy. The write hooks in app.crud keep it current
+for writes made by this process; writes made by other workers are picked
+up by ensure_loaded, which compares the table's stamp -- row count, max id
+and the skills version, a counter every ORM skill insert, rename and delete
+bumps in its own transaction -- with the loaded copy at most once every
+SKILL_INDEX_CHECK_SECONDS (default 5), and reloads when they differ.
+
+Ranking: full-name prefix before word prefix before infix, shorter names
+first (so an exact name comes first), then alphabetical. With fuzzy=True,
+names one edit (insert, delete, substitute or swap) away from the typed
+prefix follow the exact matches. At most MAX_RESULTS matches are ranked for
+a query, so pages (skip + limit) end there.
+"""
+import heapq
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+from app.models import ResponseCacheGeneration, Skill
+
+SKILL_INDEX_CHECK_SECONDS = float(os.getenv("SKILL_INDEX_CHECK_SECONDS", "5"))
+
+MAX_RESULTS = 100
+MEMO_MIN_MATCHES = 64       # memoize prefixes matching more keys than this
+MEMO_MAX_ENTRIES = 4096
+FUZZY_MIN_LENGTH = 3        # shorter queries match too much when fuzzed
+INFIX_MIN_LENGTH = 3        # shorter queries are inside too many names to be useful
+
+FULL_NAME, WORD_START, INFIX = 0, 1, 2
+
+# The skills version: a row of the shared counters table (see app.models.ResponseCacheGeneration)
+VERSION_SCOPE = "skills"
+
+
+def normalize(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+def bump_version(connection):
+    """Count a skill write in the writing transaction, so other workers' indexes reload."""
+    G = ResponseCacheGeneration
+    bumped = connection.execute(
+        update(G).where(G.scope == VERSION_SCOPE).values(generation=G.generation + 1)
+    ).rowcount
+    if not bumped:
+        # A concurrent first bump may insert the row too; either one changes the stamp.
+        connection.execute(
+            insert(G).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite"),
+            [{"scope": VERSION_SCOPE, "generation": 1}],
+        )
+
+
+class SkillIndex:
+    def __init__(self):
+        self._keys: List[str] = []
+        self._entries: List[tuple] = []   # parallel to _keys: (match kind, len, folded name, id, name)
+        self._names: List[tuple] = []     # the FULL_NAME entries, for infix scans
+        self._alphabet: set = set()
+        self._ids: set = set()
+        self._memo: dict = {}
+        self._loaded = False
+        self._stamp: Optional[tuple] = None   # (row count, max id, version) of the skills this copy reflects
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.version = 0                  # bumped on every change; lets derived structures rebuild
+
+    # ---------- building ----------
+
+    @staticmethod
+    def _index_keys(name: str):
+        folded = normalize(name)
+        words = folded.split(" ")
+        yield folded, (FULL_NAME, len(folded), folded)
+        for i in range(1, len(words)):
+            yield " ".join(words[i:]), (WORD_START, len(folded), folded)
+
+    def load(self, skills: Iterable[Tuple[int, str]], stamp: Optional[tuple] = None):
+        pairs = []
+        for skill_id, name in skills:
+            for key, rank in self._index_keys(name):
+                pairs.append((key, rank + (skill_id, name)))
+        pairs.sort()
+        with self._lock:
+            self._keys = [key for key, _ in pairs]
+            self._entries = [entry for _, entry in pairs]
+            self._names = [entry for entry in self._entries if entry[0] == FULL_NAME]
+            self._alphabet = set("".join(self._keys))
+            self._ids = {entry[3] for entry in self._entries}
+            self._memo.clear()
+            self._stamp = stamp
+            self._loaded = True
+            self.version += 1
+
+    @staticmethod
+    def _table_stamp(db: Session) -> tuple:
+        G = ResponseCacheGeneration
+        version = select(G.generation).where(G.scope == VERSION_SCOPE).scalar_subquery()
+        count, max_id, version = db.execute(select(func.count(Skill.id), func.max(Skill.id), version)).one()
+        return count, max_id, version or 0
+
+    def load_from_db(self, db: Session):
+        stamp = self._table_stamp(db)
+        self.load(db.query(Skill.id, Skill.name).all(), stamp)
+        self._next_check = time.monotonic() + SKILL_INDEX_CHECK_SECONDS
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def check_due(self) -> bool:
+        """True if ensure_loaded would query the database."""
+        return not self._loaded or time.monotonic() >= self._next_check
+
+    def ensure_loaded(self, db: Session):
+        """Load the index, or reload it if another process has changed the skills table since."""
+        if not self.check_due:
+            return
+        if not self._loaded or self._table_stamp(db) != self._stamp:
+            self.load_from_db(db)
+        else:
+            self._next_check = time.monotonic() + SKILL_INDEX_CHECK_SECONDS
+
+    def note_writes(self, writes: int):
+        """Account for `writes` skills-version bumps committed by this process (already applied here)."""
+        with self._lock:
+            if self._stamp is not None:
+                count, max_id, version = self._stamp
+                self._stamp = (count, max_id, version + writes)
+
+    def add(self, skill_id: int, name: str):
+        """Index a new skill. Ignored until the index is loaded, or if already present."""
+        with self._lock:
+            if not self._loaded or skill_id in self._ids:
+                return
+            self._ids.add(skill_id)
+            if self._stamp is not None:
+                count, max_id, version = self._stamp
+                self._stamp = (count + 1, max(max_id or 0, skill_id), version)
+            for key, rank in self._index_keys(name):
+                entry = rank + (skill_id, name)
+                pos = bisect_right(self._keys, key)
+                self._keys.insert(pos, key)
+                self._entries.insert(pos, entry)
+                self._alphabet.update(key)
+                if rank[0] == FULL_NAME:
+                    self._names.append(entry)
+            self._memo.clear()
+            self.version += 1
+
+    def remove(self, skill_id: int):
+        with self._lock:
+            if skill_id not in self._ids:
+                return
+            self._ids.discard(skill_id)
+            if self._stamp is not None:
+                count, max_id, version = self._stamp
+                # Removing the highest id leaves the new max unknown: recheck against the table
+                self._stamp = (count - 1, max_id, version) if skill_id != max_id else None
+            keep = [i for i, entry in enumerate(self._entries) if entry[3] != skill_id]
+            self._keys = [self._keys[i] for i in keep]
+            self._entries = [self._entries[i] for i in keep]
+            self._names = [entry for entry in self._names if entry[3] != skill_id]
+            self._memo.clear()
+            self.version += 1
+
+    def skills(self) -> List[Tuple[int, str]]:
+        """Every indexed (id, name)."""
+        with self._lock:
+            return [(entry[3], entry[4]) for entry in self._names]
+
+    # ---------- querying ----------
+
+    def _ranked(self, prefix: str) -> list:
+        """Best MAX_RESULTS entries whose key starts with `prefix`."""
+        memoized = self._memo.get(prefix)
+        if memoized is not None:
+            return memoized
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\uffff", lo)
+        ranked = heapq.nsmallest(MAX_RESULTS, self._entries[lo:hi])
+        if hi - lo > MEMO_MIN_MATCHES:
+            if len(self._memo) >= MEMO_MAX_ENTRIES:
+                self._memo.clear()
+            self._memo[prefix] = ranked
+        return ranked
+
+    def _infix(self, query: str) -> list:
+        """Best MAX_RESULTS names containing `query` anywhere, ranked after every prefix match."""
+        memo_key = (INFIX, query)
+        memoized = self._memo.get(memo_key)
+        if memoized is not None:
+            return memoized
+        matches = ((INFIX,) + entry[1:] for entry in self._names if query in entry[2])
+        ranked = heapq.nsmallest(MAX_RESULTS, matches)
+        if len(self._memo) >= MEMO_MAX_ENTRIES:
+            self._memo.clear()
+        self._memo[memo_key] = ranked
+        return ranked
+
+    def _edits(self, word: str) -> set:
+        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+        deletes = {a + b[1:] for a, b in splits if b}
+        swaps = {a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1}
+        replaces = {a + c + b[1:] for a, b in splits if b for c in self._alphabet}
+        inserts = {a + c + b for a, b in splits[:-1] for c in self._alphabet}
+        edits = deletes | swaps | replaces | inserts
+        edits.discard(word)
+        edits.discard("")
+        return edits
+
+    def search(self, query: str, limit: int = 20, fuzzy: bool = False) -> List[Tuple[int, str]]:
+        """[(id, name)] for the best `limit` skills matching `query` as you type."""
+        q = normalize(query)
+        if not q:
+            return []
+        limit = min(limit, MAX_RESULTS)
+        with self._lock:
+            candidates = [(0,) + entry for entry in self._ranked(q)]
+            if len({c[4] for c in candidates}) < limit and len(q) >= INFIX_MIN_LENGTH:
+                candidates.extend((0,) + entry for entry in self._infix(q))
+            if fuzzy and len(q) >= FUZZY_MIN_LENGTH:
+                for variant in self._edits(q):
+                    candidates.extend((1,) + entry for entry in self._ranked(variant))
+        if fuzzy:
+            candidates.sort(key=lambda c: c[:4])
+
+        results, seen = [], set()
+        for candidate in candidates:
+            skill_id, name = candidate[4], candidate[5]
+            if skill_id in seen:
+                continue
+            seen.add(skill_id)
+            results.append((skill_id, name))
+            if len(results) == limit:
+                break
+        return results
+
+
+index = SkillIndex()
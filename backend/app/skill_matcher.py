@@ -0,0 +1,130 @@
+"""
+Finds every known skill in a block of text (resume parsing).
+
+The skill taxonomy is compiled into an Aho-Corasick automaton, so the text
+is scanned once no matter how many skills there are, instead of once per
+skill. Matching is case-insensitive and whitespace-insensitive (same
+normalization as the typeahead index), and respects word boundaries: "Java"
+is not found inside "JavaScript", but "C++" and ".NET" work. Where matches
+overlap, the longest wins ("Machine Learning" rather than "Learning").
+
+The automaton is built from app.skill_index and rebuilt only when that
+index changes: after a write hook in app.crud, or when the index reloads to
+pick up skills added by another worker.
+"""
+import threading
+from collections import deque
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app import database, skill_index
+from app.skill_index import normalize
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatcher:
+    def __init__(self, skills: Iterable[Tuple[int, str]]):
+        self._goto: List[dict] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [-1]       # pattern ending exactly at this node, or -1
+        self._link: List[int] = [0]       # nearest proper suffix node with an output (0: none)
+        self._patterns: List[Tuple[int, str, bool, bool]] = []   # (length, name, word start, word end)
+        self._ids: List[int] = []
+
+        seen = set()
+        for skill_id, name in skills:
+            pattern = normalize(name)
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            self._add(pattern, len(self._patterns))
+            self._patterns.append((len(pattern), name, _is_word(pattern[0]), _is_word(pattern[-1])))
+            self._ids.append(skill_id)
+        self._build_links()
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def _add(self, pattern: str, index: int):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(-1)
+                self._link.append(0)
+            node = nxt
+        self._out[node] = index
+
+    def _build_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(ch, 0)
+                self._fail[child] = fail
+                self._link[child] = fail if self._out[fail] >= 0 else self._link[fail]
+                queue.append(child)
+
+    def _matches(self, text: str):
+        """(start, end, pattern index) for every boundary-respecting occurrence, in one pass."""
+        goto, fail, out, link, patterns = self._goto, self._fail, self._out, self._link, self._patterns
+        last = len(text) - 1
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            node = state if out[state] >= 0 else link[state]
+            while node:
+                index = out[node]
+                length, _, word_start, word_end = patterns[index]
+                start = i - length + 1
+                if (not word_start or start == 0 or not _is_word(text[start - 1])) and \
+                        (not word_end or i == last or not _is_word(text[i + 1])):
+                    yield start, i, index
+                node = link[node]
+
+    def find(self, text: str) -> List[Tuple[int, str]]:
+        """[(id, name)] of the skills mentioned in `text`, in order of first mention."""
+        text = normalize(text)
+        # Leftmost-longest, non-overlapping
+        matches = sorted(self._matches(text), key=lambda m: (m[0], m[0] - m[1]))
+        found, seen, taken_until = [], set(), -1
+        for start, end, index in matches:
+            if start <= taken_until:
+                continue
+            taken_until = end
+            if index not in seen:
+                seen.add(index)
+                found.append((self._ids[index], self._patterns[index][1]))
+        return found
+
+
+_compiled: Optional[Tuple[int, SkillMatcher]] = None
+_compile_lock = threading.Lock()
+
+
+def current(db: Optional[Session] = None) -> SkillMatcher:
+    """The matcher for the current taxonomy, compiled on first use and after skill changes."""
+    global _compiled
+    index = skill_index.index
+    if index.check_due:
+        if db is not None:
+            index.ensure_loaded(db)
+        else:
+            with database.SessionLocal() as own_db:
+                index.ensure_loaded(own_db)
+    with _compile_lock:
+        if _compiled is None or _compiled[0] != index.version:
+            version = index.version
+            _compiled = (version, SkillMatcher(index.skills()))
+        return _compiled[1]
@@ -0,0 +1,157 @@
+"""
+Where file bytes live: resumes, company agreements, invoice PDFs, offer letters.
+
+The database only keeps metadata (the `blobs` table, see app.models.Blob);
+the bytes go to a storage backend addressed by a key such as
+"uploads/<sha256>.pdf".
+
+Backends:
+    local (default)  files under STORAGE_LOCAL_ROOT (default: backend/storage,
+                     a directory that holds nothing but stored files; keys
+                     map onto its uploads/ and pdfs/ folders)
+    s3               any S3-compatible store; STORAGE_BACKEND=s3,
+                     STORAGE_S3_BUCKET, optional STORAGE_S3_ENDPOINT_URL
+                     (e.g. a local MinIO) and STORAGE_S3_REGION. Credentials
+                     come from the usual AWS environment/config chain.
+"""
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local").lower()
+STORAGE_LOCAL_ROOT = os.getenv("STORAGE_LOCAL_ROOT") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "storage"
+)
+STORAGE_S3_BUCKET = os.getenv("STORAGE_S3_BUCKET", "")
+STORAGE_S3_ENDPOINT_URL = os.getenv("STORAGE_S3_ENDPOINT_URL") or None
+STORAGE_S3_REGION = os.getenv("STORAGE_S3_REGION") or None
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class LocalStorage:
+    """Keys are paths relative to `root`."""
+
+    def __init__(self, root: str = STORAGE_LOCAL_ROOT):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        path = os.path.normpath(os.path.join(self.root, key))
+        if os.path.relpath(path, self.root).startswith(".."):
+            raise ValueError(f"Storage key escapes the storage root: {key}")
+        return path
+
+    def put_file(self, local_path: str, key: str, content_type: Optional[str] = None, move: bool = False):
+        """Store a finished local file under `key`. Keys are content-addressed, so an existing key is kept."""
+        dest = self._path(key)
+        if os.path.exists(dest):
+            if move:
+                os.remove(local_path)
+            return
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        if move:
+            try:
+                os.replace(local_path, dest)   # atomic when on the same filesystem
+                return
+            except OSError:
+                pass
+        tmp = dest + ".part"
+        shutil.copyfile(local_path, tmp)
+        os.replace(tmp, dest)                  # readers never see a partial file
+        if move:
+            os.remove(local_path)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def size(self, key: str) -> int:
+        return os.path.getsize(self._path(key))
+
+    def iter_range(self, key: str, start: int = 0, end: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield bytes [start, end] (inclusive, like an HTTP Range); end=None reads to EOF."""
+        with open(self._path(key), "rb") as f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[str]:
+        """A local filesystem path for `key`, for libraries that need one (PyMuPDF, python-docx)."""
+        yield self._path(key)
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class S3Storage:
+    """S3 or anything speaking its API (MinIO, Ceph RGW, ...)."""
+
+    def __init__(self, bucket: str = STORAGE_S3_BUCKET, endpoint_url: Optional[str] = STORAGE_S3_ENDPOINT_URL,
+                 region: Optional[str] = STORAGE_S3_REGION):
+        import boto3  # optional dependency, only needed for this backend
+
+        self.bucket = bucket
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+
+    def put_file(self, local_path: str, key: str, content_type: Optional[str] = None, move: bool = False):
+        if not self.exists(key):
+            extra = {"ContentType": content_type} if content_type else None
+            # upload_file streams in parts; it never loads the file whole
+            self.client.upload_file(local_path, self.bucket, key, ExtraArgs=extra)
+        if move:
+            os.remove(local_path)
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def size(self, key: str) -> int:
+        return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+
+    def iter_range(self, key: str, start: int = 0, end: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        body = self.client.get_object(Bucket=self.bucket, Key=key, Range=byte_range)["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[str]:
+        fd, path = tempfile.mkstemp(suffix=os.path.splitext(key)[1])
+        os.close(fd)
+        try:
+            self.client.download_file(self.bucket, key, path)
+            yield path
+        finally:
+            os.remove(path)
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+
+def _make_backend():
+    if STORAGE_BACKEND == "s3":
+        return S3Storage()
+    return LocalStorage()
+
+
+backend = _make_backend()
@@ -0,0 +1,86 @@
+from typing import Optional
+from fastapi import Depends, Query
+from sqlalchemy.orm import defer, raiseload, selectinload
+from app.auth import get_current_user
+from candidates.models import Candidate
+from requisitions.models import Requisitions
+from interviews.models import Interview
+
+# The operator company sees every tenant; everyone else is a client tenant
+# scoped to their own company.
+OPERATOR_COMPANY_NAME = "acme global hub pvt ltd"
+
+# Candidate columns client tenants are not allowed to see (see
+# candidates.schemas.CandidateMaskedResponse for the shape they get).
+MASKED_CANDIDATE_FIELDS = ("email", "phone", "resume_url", "source")
+
+
+def is_operator_company(company) -> bool:
+    return bool(company and company.name and company.name.lower() == OPERATOR_COMPANY_NAME)
+
+
+class TenantScope:
+    """
+    Request-scoped view of who is asking and which rows they may see.
+
+    company_id is the effective tenant filter: the caller's own company for
+    client tenants, the requested company (or None for "all tenants") for
+    operator users.
+    """
+
+    def __init__(self, user, requested_company_id: Optional[int] = None):
+        self.user = user
+        self.role = (user.role or "").lower()
+        self.is_operator = is_operator_company(user.company_rel)
+        if self.is_operator:
+            self.company_id = requested_company_id
+            self.masked_fields = ()
+        else:
+            self.company_id = user.company_id
+            self.masked_fields = MASKED_CANDIDATE_FIELDS
+
+    @property
+    def is_masked(self) -> bool:
+        return bool(self.masked_fields)
+
+    def company_filter(self, column) -> list:
+        """Predicates restricting `column` (a company_id column) to this tenant."""
+        if self.company_id is None:
+            return []
+        return [column == self.company_id]
+
+    def can_access(self, company_id: Optional[int]) -> bool:
+        return self.is_operator or company_id == self.user.company_id
+
+    def candidate_filters(self) -> list:
+        filters = self.company_filter(Candidate.company_id)
+        # Recruiters only ever see the candidates they own
+        if self.role == "recruiter":
+            filters.append(Candidate.recruiter == self.user.name)
+        return filters
+
+    def requisition_filters(self) -> list:
+        return self.company_filter(Requisitions.company_id)
+
+    def interview_filters(self) -> list:
+        return self.company_filter(Interview.company_id)
+
+    def candidate_options(self) -> list:
+        """
+        Loader options for Candidate queries. Client tenants never fetch the
+        masked columns or the files: they are deferred with raiseload, so a
+        response built from the wrong schema fails loudly instead of lazy-loading.
+        """
+        options = [selectinload(Candidate.skills)]
+        if self.is_masked:
+            options += [defer(getattr(Candidate, field), raiseload=True) for field in self.masked_fields]
+            options.append(raiseload(Candidate.files))
+        else:
+            options.append(selectinload(Candidate.files))
+        return options
+
+def get_tenant_scope(
+    company_id: Optional[int] = Query(None),
+    user=Depends(get_current_user),
+) -> TenantScope:
+    return TenantScope(user, requested_company_id=company_id)
@@ -1,27 +1,91 @@
 import fitz  # PyMuPDF
 import re
-from typing import Dict
+from typing import Callable, Dict, Optional, Tuple
 from docx import Document
 import os
+import time
+from app import skill_matcher
 
-def extract_text_from_pdf(file_path: str) -> str:
-    text = ""
+# Bump when extraction output changes: cached parse results of older versions
+# stop matching (app.parse_cache)
+PARSER_VERSION = 2
+
+# Extraction budgets: past any of them the text is cut short and the result
+# says so ("truncated"), so one huge or pathological upload can't hold a
+# worker for long.
+PARSE_MAX_PAGES = int(os.getenv("PARSE_MAX_PAGES", "50"))
+PARSE_MAX_CHARS = int(os.getenv("PARSE_MAX_CHARS", "200000"))
+PARSE_TIME_LIMIT_SECONDS = float(os.getenv("PARSE_TIME_LIMIT_SECONDS", "20"))
+
+
+class _TextBudget:
+    """Collects text parts up to a character budget; joined once at the end."""
+
+    def __init__(self, max_chars: int):
+        self.parts = []
+        self.remaining = max_chars
+        self.truncated: Optional[str] = None
+
+    def add(self, part: str) -> bool:
+        """False once the budget is spent."""
+        if len(part) > self.remaining:
+            self.parts.append(part[:self.remaining])
+            self.remaining = 0
+            self.truncated = "chars"
+            return False
+        self.parts.append(part)
+        self.remaining -= len(part)
+        return True
+
+    def text(self, separator: str = "") -> str:
+        return separator.join(self.parts)
+
+
+def extract_text_from_pdf(file_path: str, on_page: Optional[Callable[[int, int], None]] = None,
+                          max_pages: int = PARSE_MAX_PAGES, max_chars: int = PARSE_MAX_CHARS,
+                          time_limit: float = PARSE_TIME_LIMIT_SECONDS) -> Tuple[str, Optional[str]]:
+    """
+    (text, truncated): truncated is None, or which budget stopped extraction
+    early: "pages", "chars" or "time". The time limit is checked between
+    pages; a single page is never interrupted (app.parse_queue puts a hard
+    deadline on the whole file).
+    """
+    deadline = time.monotonic() + time_limit
+    budget = _TextBudget(max_chars)
     with fitz.open(file_path) as doc:
-        for page in doc:
-            text += page.get_text("text")
-    return text
+        pages = min(doc.page_count, max_pages)
+        for number in range(pages):
+            if not budget.add(doc.load_page(number).get_text("text")):
+                break
+            if on_page:
+                on_page(number + 1, pages)
+            if time.monotonic() > deadline and number + 1 < doc.page_count:
+                budget.truncated = "time"
+                break
+        else:
+            if doc.page_count > pages:
+                budget.truncated = "pages"
+    return budget.text(), budget.truncated
 
-def extract_text_from_docx(file_path: str) -> str:
+def extract_text_from_docx(file_path: str, max_chars: int = PARSE_MAX_CHARS) -> Tuple[str, Optional[str]]:
     doc = Document(file_path)
-    return "\n".join([p.text for p in doc.paragraphs])
+    budget = _TextBudget(max_chars)
+    for paragraph in doc.paragraphs:
+        if not budget.add(paragraph.text + "\n"):
+            break
+    return budget.text(), budget.truncated
 
-def parse_resume(file_path: str) -> Dict[str, str]:
+def extract_resume(file_path: str, on_page: Optional[Callable[[int, int], None]] = None) -> Dict[str, str]:
+    """
+    The CPU-heavy part of parsing: text plus name, email and phone. Needs no
+    database, so it can run in a worker process (see app.parse_queue).
+    """
     # Extract text based on file type
     ext = os.path.splitext(file_path)[1].lower()
     if ext == ".pdf":
-        text = extract_text_from_pdf(file_path)
+        text, truncated = extract_text_from_pdf(file_path, on_page=on_page)
     elif ext in [".docx", ".doc"]:
-        text = extract_text_from_docx(file_path)
+        text, truncated = extract_text_from_docx(file_path)
     else:
         return {"error": "Unsupported file format"}
 
@@ -49,16 +113,30 @@ def parse_resume(file_path: str) -> Dict[str, str]:
         tokens = text.split()
         name = " ".join(tokens[:3]) if len(tokens) >= 2 else (tokens[0] if tokens else "")
 
-    # ---- SKILLS ----
-    skills_keywords = [
-        "Python", "Java", "React", "Node", "Django", "C++", "SQL", 
-        "AWS", "Azure", "HTML", "CSS", "JavaScript", "Machine Learning", "Data Analysis"
-    ]
-    skills_found = [s for s in skills_keywords if s.lower() in text.lower()]
-
     return {
         "name": name,
         "email": email[0] if email else "",
         "phone": phone[0] if phone else "",
+        "truncated": truncated,
+        "text": text,
+    }
+
+
+def find_skills(text: str, matcher: Optional[skill_matcher.SkillMatcher] = None) -> list:
+    # Every skill in the taxonomy, found in one pass (see app.skill_matcher)
+    matcher = matcher or skill_matcher.current()
+    return [name for _, name in matcher.find(text)]
+
+
+def parse_resume(file_path: str, matcher: Optional[skill_matcher.SkillMatcher] = None) -> Dict[str, str]:
+    parsed = extract_resume(file_path)
+    if "error" in parsed:
+        return parsed
+
+    # ---- SKILLS ----
+    skills_found = find_skills(parsed.pop("text"), matcher)
+
+    return {
+        **parsed,
         "skills": ", ".join(skills_found)
     }
@@ -0,0 +1,12 @@
+"""
+Ad hoc performance benchmarks, run from backend/:
+
+    python -m benchmarks.principal_cache
+    python -m benchmarks.requisitions_list
+    python -m benchmarks.skill_index [--skills 50000]
+    python -m benchmarks.skill_matcher [--skills 10000]
+
+Each one builds an in-memory SQLite database from the models (see
+benchmarks.harness) and prints its measurements; nothing touches the
+configured MySQL database.
+"""
@@ -0,0 +1,157 @@
+"""
+Candidate create and update, the way POST/PUT /candidates run them: commits
+and time per request for the current single-transaction services next to
+the old shape (create: candidate, then its resume File in a second commit;
+update: fields, then the File, then the activity log, three commits).
+
+Commits only cost what the disk makes them cost, so this runs on a
+file-backed SQLite database with synchronous=FULL (an fsync per commit)
+rather than the harness's in-memory one. Each request carries 15 skills
+and a resume upload; parse jobs are queued but not run. Commits are counted
+on the request's session; the response-cache generation bump each
+committed write triggers runs in a transaction of its own and is counted
+separately (both are in the time).
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from fastapi import UploadFile
+from sqlalchemy import create_engine, event
+
+from benchmarks import harness
+from app import crud as skills_crud, parse_queue, storage
+from app.file_store import save_upload
+from candidates import crud, models
+
+SKILLS = [f"Skill {i}" for i in range(15)]
+
+
+def _resume(n: int) -> UploadFile:
+    return UploadFile(file=io.BytesIO(f"%PDF resume {n}".encode()), filename=f"resume_{n}.pdf")
+
+
+def old_create(db, data: dict, resume: UploadFile, user):
+    """The create service before it was made one transaction."""
+    req = db.get(harness.Requisitions, data["requisition_id"])
+    resume_url = save_upload(db, resume).path
+    skills = data.pop("skills", [])
+    candidate = models.Candidate(**data, company_id=req.company_id, resume_url=resume_url)
+    candidate.skills = skills_crud.resolve_skills(db, skills)
+    db.add(candidate)
+    db.commit()
+    db.refresh(candidate)
+    db.add(models.File(file_name=f"{candidate.name}_resume", file_type="resume", file_url=resume_url,
+                       candidate_id=candidate.id))
+    db.commit()
+    return candidate
+
+
+def old_update(db, candidate_id: str, data: dict, resume: UploadFile, user):
+    """The update service before it was made one transaction."""
+    candidate = crud.get_candidate(db, candidate_id)
+    candidate.skills = skills_crud.resolve_skills(db, data.pop("skills"))
+    resume_url = save_upload(db, resume).path
+    for key, value in data.items():
+        setattr(candidate, key, value)
+    candidate.resume_url = resume_url
+    candidate.last_activity = datetime.utcnow()
+    db.commit()
+    db.refresh(candidate)
+    existing = (db.query(models.File)
+                .filter(models.File.candidate_id == candidate_id, models.File.file_type == "resume").first())
+    if existing:
+        existing.file_url = resume_url
+        existing.file_name = resume.filename
+        existing.uploaded_at = datetime.utcnow()
+    else:
+        db.add(models.File(file_name=resume.filename, file_type="resume", file_url=resume_url,
+                           candidate_id=candidate_id))
+    db.commit()
+    crud.create_candidate_activity_log(db, candidate_id, user, "Updated Candidate", "Candidate details updated")
+    return candidate
+
+
+def _measure(requests: int, fn) -> tuple:
+    """(session commits, all commits, median ms), per request, over `requests` calls of fn(db, n)."""
+    session_commits, times = [], []
+    before = _commits[0]
+    for n in range(requests):
+        with harness.database.SessionLocal() as db:
+            event.listen(db, "after_commit", session_commits.append)
+            start = time.perf_counter()
+            fn(db, n)
+            times.append((time.perf_counter() - start) * 1000)
+    return len(session_commits) / requests, (_commits[0] - before) / requests, statistics.median(times)
+
+
+_commits = [0]      # every COMMIT on the engine
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=30, help="requests per measurement")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="candidate-writes-")
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+                           connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _durable(connection, record):
+        connection.execute("PRAGMA synchronous=FULL")
+
+    @event.listens_for(engine, "commit")
+    def _count(connection):
+        _commits[0] += 1
+
+    harness.database.Base.metadata.create_all(engine)
+    harness.database.SessionLocal.configure(bind=engine)
+    storage.backend = storage.LocalStorage(os.path.join(workdir, "storage"))
+    parse_queue._submit = lambda job_id, key: None
+
+    with harness.database.SessionLocal() as db:
+        tenant = harness.seed_tenant(db)
+        requisition = harness.new_requisition(tenant, 1)
+        db.add(requisition)
+        db.commit()
+        requisition_id, user = requisition.id, tenant["admin"]
+        skills_crud.resolve_skills(db, SKILLS)
+        db.commit()
+        db.refresh(user)
+        db.expunge(user)        # the request's current_user, loaded outside the measured session
+
+    def data(prefix: str, n: int) -> dict:
+        return {"name": f"Candidate {prefix}{n}", "position": "Developer", "email": f"{prefix}{n}@example.com",
+                "requisition_id": requisition_id, "skills": list(SKILLS)}
+
+    created = {"old": [], "new": []}
+
+    def create_old(db, n):
+        created["old"].append(old_create(db, data("old", n), _resume(n), user).id)
+
+    def create_new(db, n):
+        created["new"].append(crud.create_candidate_service(db, data("new", n), _resume(n), None, user).id)
+
+    def update_old(db, n):
+        old_update(db, created["old"][n], {"notes": f"note {n}", "skills": list(SKILLS)}, _resume(1000 + n), user)
+
+    def update_new(db, n):
+        crud.update_candidate_service(db, created["new"][n], {"notes": f"note {n}", "skills": list(SKILLS)},
+                                      _resume(2000 + n), user)
+
+    for label, fn in (("create, old", create_old), ("create, new", create_new),
+                      ("update, old", update_old), ("update, new", update_new)):
+        commits, total, ms = _measure(args.requests, fn)
+        print(f"{label}:  {commits:.0f} commit(s) (+{total - commits:.0f} generation bump(s)), "
+              f"{ms:6.1f} ms per request (median)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""An in-memory SQLite database behind the app, with a SQL statement counter."""
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+from app import database
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+database.SessionLocal.configure(bind=engine)
+
+from app import auth, models  # noqa: E402
+from app.main import app  # noqa: E402
+import interviews.models, invoices.models, offers.models  # noqa: E402,F401
+from requisitions.models import Requisitions  # noqa: E402
+
+database.Base.metadata.create_all(engine)
+
+statements = []
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _record(conn, cursor, statement, parameters, context, executemany):
+    statements.append(statement)
+
+
+def client():
+    from fastapi.testclient import TestClient
+    return TestClient(app)
+
+
+def seed_tenant(db) -> dict:
+    """A client company with an admin, a recruiter and a department."""
+    company = models.Company(name="Client Co", country="IN")
+    db.add(company)
+    db.flush()
+    admin = models.User(name="Admin", email="admin@example.com", role="admin", hashed_password="x", company_id=company.id)
+    recruiter = models.User(name="Recruiter", email="recruiter@example.com", role="recruiter",
+                            hashed_password="x", company_id=company.id)
+    department = models.Department(name="Engineering")
+    location = models.Location(name="Hyderabad")
+    db.add_all([admin, recruiter, department, location])
+    db.commit()
+    return {"company": company, "admin": admin, "recruiter": recruiter, "department": department, "location": location}
+
+
+def new_requisition(tenant: dict, n: int, **values) -> Requisitions:
+    enum_default = lambda column: Requisitions.__table__.c[column].type.enums[0]
+    return Requisitions(
+        req_id=f"REQ-{n}", position=f"Position {n}", department_id=tenant["department"].id,
+        location_id=tenant["location"].id, company_id=tenant["company"].id,
+        employment_type=enum_default("employment_type"), work_mode=enum_default("work_mode"),
+        priority=enum_default("priority"), approval_status="approved", **values,
+    )
+
+
+def auth_header(email: str) -> dict:
+    return {"Authorization": "Bearer " + auth.create_access_token({"sub": email})}
+
+
+@contextmanager
+def counted():
+    """Yields {"statements": n, "ms": t}, filled in when the block exits."""
+    result = {}
+    statements.clear()
+    start = time.perf_counter()
+    yield result
+    result["ms"] = (time.perf_counter() - start) * 1000
+    result["statements"] = len(statements)
+
+
+def best_of(repeat: int, fn) -> float:
+    """Fastest of `repeat` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
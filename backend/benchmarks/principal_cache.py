@@ -0,0 +1,52 @@
+"""
+GET /me with the principal cache: SQL statements for the first request of a
+token, a repeat request, and the first request after the user's company is
+renamed (which invalidates the cached principal on commit), and latency with
+and without the cache.
+"""
+import argparse
+import sys
+
+from benchmarks import harness
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200, help="requests timed per measurement")
+    args = parser.parse_args(argv)
+
+    with harness.database.SessionLocal() as db:
+        tenant = harness.seed_tenant(db)
+        company_id = tenant["company"].id
+    client = harness.client()
+    headers = harness.auth_header("admin@example.com")
+    me = lambda: client.get("/me", headers=headers)
+
+    with harness.counted() as first:
+        me()
+    with harness.counted() as cached:
+        me()
+    with harness.database.SessionLocal() as db:
+        db.get(harness.models.Company, company_id).name = "Client Co Renamed"
+        db.commit()
+    with harness.counted() as renamed:
+        me()
+
+    print(f"first request:      {first['statements']} statement(s)")
+    print(f"cached:             {cached['statements']} statement(s)")
+    print(f"after rename:       {renamed['statements']} statement(s)")
+    print(f"GET /me, cached:    {harness.best_of(args.repeat, me):.2f} ms")
+
+    def me_uncached():
+        harness.auth.invalidate_principals(everything=True)     # every request reads the user again
+        return me()
+
+    with harness.counted() as uncached:
+        me_uncached()
+    print(f"uncached:           {uncached['statements']} statement(s)")
+    print(f"GET /me, uncached:  {harness.best_of(args.repeat, me_uncached):.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+GET /requisitions?limit=10 over requisitions with many skills and one with
+many candidates: SQL statements and time per page, next to the rows the
+old query shape (joinedload of skills and candidates) made the database
+return for the same page.
+"""
+import argparse
+import sys
+
+from sqlalchemy.orm import joinedload
+
+from app import response_cache
+from benchmarks import harness
+from candidates.models import Candidate
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requisitions", type=int, default=10)
+    parser.add_argument("--skills", type=int, default=10, help="skills per requisition")
+    parser.add_argument("--candidates", type=int, default=500, help="candidates on the first requisition")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with harness.database.SessionLocal() as db:
+        tenant = harness.seed_tenant(db)
+        skills = [harness.models.Skill(name=f"Skill {i}") for i in range(args.skills)]
+        requisitions = []
+        for n in range(args.requisitions):
+            requisition = harness.new_requisition(tenant, n, recruiter_id=tenant["recruiter"].id)
+            requisition.skills = skills
+            requisitions.append(requisition)
+        db.add_all(requisitions)
+        db.flush()
+        db.add_all(
+            Candidate(name=f"Candidate {i}", position="Developer", email=f"candidate{i}@example.com",
+                      requisition_id=requisitions[0].id, company_id=tenant["company"].id)
+            for i in range(args.candidates)
+        )
+        db.commit()
+
+        old_shape = (db.query(harness.Requisitions)
+                     .options(joinedload(harness.Requisitions.skills), joinedload(harness.Requisitions.candidates))
+                     .limit(10))
+        old_rows = len(db.connection().execute(old_shape.statement).all())
+
+    client = harness.client()
+    headers = harness.auth_header("admin@example.com")
+    client.get("/me", headers=headers)
+
+    def page():
+        response_cache.backend.clear()
+        response = client.get("/requisitions", headers=headers, params={"limit": 10})
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    with harness.counted() as listed:
+        items = page()
+    print(f"old query shape:    {old_rows} joined rows for a 10-requisition page")
+    print(f"GET /requisitions:  {len(items)} requisitions, {listed['statements']} statement(s) "
+          f"(including the response-cache generation lookup)")
+    print(f"time per page:      {harness.best_of(args.repeat, page):.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+/skills typeahead over a synthetic taxonomy (50k skills by default): index
+load time, prefix, infix and fuzzy query latency, and the ILIKE '%q%' scan
+the index replaced.
+"""
+import argparse
+import random
+import string
+import sys
+import time
+
+from sqlalchemy import insert
+
+from app import skill_index
+from benchmarks import harness
+
+KNOWN = ["Python", "PyTorch", "Java", "JavaScript", "Machine Learning", "Deep Learning"]
+
+
+def taxonomy(size: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))) for _ in range(8000)]
+    names = set(KNOWN)
+    while len(names) < size:
+        names.add(" ".join(rng.choice(words).capitalize() for _ in range(rng.randint(1, 3))))
+    return sorted(names)
+
+
+def _per_query_us(query: str, fuzzy: bool, repeat: int, cold: bool = False) -> float:
+    """Mean latency; cold=True empties the memo before every query."""
+    index = skill_index.index
+    index._memo.clear()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if cold:
+            index._memo.clear()
+        index.search(query, limit=10, fuzzy=fuzzy)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skills", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    with harness.database.SessionLocal() as db:
+        db.execute(insert(harness.models.Skill), [{"name": name} for name in taxonomy(args.skills)])
+        db.commit()
+
+        start = time.perf_counter()
+        skill_index.index.load_from_db(db)
+        print(f"load: {(time.perf_counter() - start) * 1000:.0f} ms, {len(skill_index.index._keys)} keys")
+
+        for query in ("p", "py", "pyth", "lear", "javas"):
+            print(f"prefix {query!r:9} {_per_query_us(query, False, args.repeat):8.1f} us")
+        for query in ("script", "earn"):
+            print(f"infix  {query!r:9} {_per_query_us(query, False, args.repeat // 10, cold=True):8.1f} us (not memoized)")
+        for query in ("pyhton", "lerning", "jvaa"):
+            print(f"fuzzy  {query!r:9} {_per_query_us(query, True, args.repeat // 10):8.1f} us")
+
+        ilike = lambda: (db.query(harness.models.Skill)
+                         .filter(harness.models.Skill.name.ilike("%lear%")).limit(100).all())
+        print(f"ILIKE '%lear%'   {harness.best_of(20, ilike) * 1000:8.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Resume skill extraction over a synthetic taxonomy (10k skills by default)
+and a ~57k-character resume: Aho-Corasick build and match time, next to the
+per-keyword `in` scan and per-skill boundary regexes it replaced.
+"""
+import argparse
+import random
+import re
+import sys
+import time
+
+from app.skill_matcher import SkillMatcher
+
+REAL = ["Python", "Java", "JavaScript", "C++", "C#", ".NET", "SQL", "AWS", "Machine Learning", "Learning",
+        "Data Analysis", "Node.js", "React", "C"]
+SYLLABLES = ["ka", "lo", "mi", "tra", "zen", "qua", "dor", "vex", "pli", "sto", "nar", "gu", "fex", "bri", "olo"]
+
+
+def taxonomy(size: int, rng: random.Random) -> list:
+    words = set()
+    while len(words) < size - len(REAL):
+        words.add(" ".join("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))).capitalize()
+                           for _ in range(rng.randint(1, 3))))
+    return REAL + sorted(words)
+
+
+def resume(names: list, rng: random.Random, words: int) -> str:
+    vocabulary = ["the", "and", "with", "experience", "team", "built", "services", "led", "design", "2020"]
+    vocabulary += rng.sample(names[len(REAL):], 300)
+    body = " ".join(rng.choice(vocabulary) for _ in range(words))
+    return body + " Skills: Python, JavaScript (not java), C++, C#, ASP.NET, machine\nlearning, Node.js, React."
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skills", type=int, default=10000)
+    parser.add_argument("--words", type=int, default=3000, help="resume length in words")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(1)
+    names = taxonomy(args.skills, rng)
+    skills = list(enumerate(names))
+    text = resume(names, rng, args.words)
+
+    start = time.perf_counter()
+    matcher = SkillMatcher(skills)
+    print(f"{len(skills)} skills, {len(text)}-char resume")
+    print(f"Aho-Corasick build:       {(time.perf_counter() - start) * 1000:8.0f} ms")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        found = matcher.find(text)
+    print(f"Aho-Corasick per resume:  {(time.perf_counter() - start) / args.repeat * 1000:8.1f} ms "
+          f"({len(found)} skills, known: {[name for _, name in found if name in REAL]})")
+
+    start = time.perf_counter()
+    [name for name in names if name.lower() in text.lower()]
+    print(f"per-keyword `in` scan:    {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    sample = names[:1000]
+    start = time.perf_counter()
+    [name for name in sample if re.search(r"(?<!\w)" + re.escape(name.lower()) + r"(?!\w)", text.lower())]
+    per_skill = (time.perf_counter() - start) / len(sample)
+    print(f"per-skill boundary regex: {per_skill * len(names) * 1000:8.0f} ms (extrapolated from 1,000 skills)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
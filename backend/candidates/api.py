@@ -1,81 +1,231 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+import os
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Form, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List,Optional
-from . import schemas, crud,models
+from typing import List,Optional,Union
+from . import schemas, crud,models, search
 from app.database import get_db
 from app.auth import get_current_user
 from app.models import User
+from app.tenancy import TenantScope, get_tenant_scope
+from app.response_cache import cached_response
+from app.pagination import keyset_page, offset_page
+from app.file_store import save_upload
+from app import export, parse_queue
+from requisitions.models import Requisitions
+from . import importer
 
 router = APIRouter()
 
 
-@router.get("", response_model=List[schemas.CandidateResponse])
+CandidateListResponse = Union[List[schemas.CandidateMaskedResponse], List[schemas.CandidateResponse],
+                              schemas.CandidateMaskedPage, schemas.CandidatePage]
+
+
+@router.get("", response_model=CandidateListResponse)
+@cached_response(CandidateListResponse)
 def read_candidates(
-    skip: int = 0,
-    limit: int = 100,
-    company_id: Optional[int] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Keyset pagination; pass an empty value for the first page"),
     db: Session = Depends(get_db),
-    user:User = Depends(get_current_user)
+    scope: TenantScope = Depends(get_tenant_scope)
 ):
-    query = db.query(models.Candidate)
-    is_acme_user = user.company_rel.name.lower() == "acme global hub pvt ltd"
-
-    if is_acme_user:
-        if company_id:
-            query = query.filter(models.Candidate.company_id == company_id)
+    # 🔒 Client tenants don't get contact details: those columns aren't even fetched
+    query = db.query(models.Candidate).options(*scope.candidate_options()).filter(*scope.candidate_filters())
+    if scope.is_masked:
+        out, page = schemas.CandidateMaskedResponse, schemas.CandidateMaskedPage
     else:
-        query = query.filter(
-            models.Candidate.company_id == user.company_id
+        out, page = schemas.CandidateResponse, schemas.CandidatePage
+
+    if cursor is not None:
+        candidates, next_cursor = keyset_page(
+            query, models.Candidate.created_date, models.Candidate.id, cursor, limit
         )
+        return page(items=[out.model_validate(c, from_attributes=True) for c in candidates], next_cursor=next_cursor)
+
+    candidates = offset_page(query, models.Candidate.created_date, models.Candidate.id, skip, limit)
+    return [out.model_validate(c, from_attributes=True) for c in candidates]
+
+
+@router.get("/export")
+def export_candidates(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    columns: Optional[str] = Query(None, description="Comma-separated column names (default: all)"),
+    scope: TenantScope = Depends(get_tenant_scope)
+):
+    """Stream every candidate the caller can see as CSV or NDJSON."""
+    available = export.export_columns(models.Candidate)
+    names = export.select_columns(available, columns)
+    # 🔒 Same masking as read_candidates: hidden columns are exported empty (and never read)
+    statement = (
+        select(*export.projection(available, names, hidden=scope.masked_fields))
+        .where(*scope.candidate_filters())
+        .order_by(models.Candidate.id)
+    )
+    return export.stream_export(statement, names, format, "candidates")
+
+
+@router.get("/search", response_model=schemas.CandidateSearchPage)
+@cached_response(schemas.CandidateSearchPage)
+def search_candidates(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    db: Session = Depends(get_db),
+    scope: TenantScope = Depends(get_tenant_scope)
+):
+    """Best matches first; every query term must appear in the candidate's profile or resume."""
+    hits, next_cursor = search.search_candidates(db, scope, q, limit, cursor)
+    out = schemas.CandidateMaskedResponse if scope.is_masked else schemas.CandidateResponse
+    return schemas.CandidateSearchPage(
+        items=[schemas.CandidateSearchHit(candidate=out.model_validate(c, from_attributes=True),
+                                          score=score, highlights=highlights)
+               for c, score, highlights in hits],
+        next_cursor=next_cursor,
+    )
+
 
-    # 🟢 If the user's role is recruiter, fetch only their candidates
-    if user.role.lower() == "recruiter":
-        query = query.filter(models.Candidate.recruiter == user.name)
+def _parse_job_out(file: models.File, include_text: bool = False) -> schemas.ResumeParseJob:
+    return schemas.ResumeParseJob(
+        job_id=file.id,
+        status=file.parse_status,
+        progress=file.parse_progress or 0,
+        file_url=file.file_url,
+        fields=file.parsed_fields,
+        error=file.parse_error,
+        parsed_at=file.parsed_at,
+        text=file.parsed_text if include_text else None,
+    )
 
-    candidates = query.offset(skip).limit(limit).all()
 
-    # 🔒 If user is not from Acme Global, hide sensitive fields
-    if user.company_rel.name.lower() != "acme global hub pvt ltd":
-        for c in candidates:
-            c.email = None
-            c.phone = None
-            c.resume_url = None
-            c.source = None
-           
+def _can_read_parse_job(scope: TenantScope, file: models.File) -> bool:
+    """
+    Parsed resumes hold contact details: a client tenant may read the jobs its
+    own users started, never the parse of a candidate's file.
+    """
+    if file.candidate is not None:
+        return scope.can_access(file.candidate.company_id) and not scope.is_masked
+    return scope.can_access(file.company_id)
 
-    return candidates
 
+@router.post("/resume-parse", response_model=schemas.ResumeParseJob, status_code=202)
+def start_resume_parse(
+    resume: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Store a resume and parse it in the background; poll the returned job id."""
+    stored = save_upload(db, resume)
+    file = models.File(file_name=resume.filename or stored.path, file_type="resume", file_url=stored.path,
+                       uploaded_by=current_user.id, company_id=current_user.company_id)
+    db.add(file)
+    parse_queue.enqueue(db, file)
+    db.commit()
+    return _parse_job_out(file)
+
+
+@router.get("/resume-parse/{job_id}", response_model=schemas.ResumeParseJob)
+def get_resume_parse_job(
+    job_id: str,
+    include_text: bool = False,
+    db: Session = Depends(get_db),
+    scope: TenantScope = Depends(get_tenant_scope)
+):
+    file = db.query(models.File).filter(models.File.id == job_id, models.File.parse_status.isnot(None)).first()
+    if not file or not _can_read_parse_job(scope, file):
+        raise HTTPException(status_code=404, detail="Parse job not found")
+    return _parse_job_out(file, include_text)
+
+
+IMPORT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def _import_job_out(db: Session, job: models.CandidateImport, errors_skip: int = 0,
+                    errors_limit: int = 100) -> schemas.CandidateImportJob:
+    errors = (db.query(models.CandidateImportError)
+              .filter(models.CandidateImportError.import_id == job.id)
+              .order_by(models.CandidateImportError.row_number, models.CandidateImportError.id)
+              .offset(errors_skip).limit(errors_limit).all())
+    return schemas.CandidateImportJob(
+        job_id=job.id,
+        status=job.status,
+        file_name=job.file_name,
+        requisition_id=job.requisition_id,
+        rows_processed=job.rows_processed or 0,
+        rows_imported=job.rows_imported or 0,
+        rows_failed=job.rows_failed or 0,
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        errors=errors,
+    )
 
 
-@router.get("/{candidate_id}", response_model=schemas.CandidateResponse)
+@router.post("/import", response_model=schemas.CandidateImportJob, status_code=202)
+def start_candidate_import(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    requisition_id: int = Form(...),
+    db: Session = Depends(get_db),
+    scope: TenantScope = Depends(get_tenant_scope)
+):
+    """Import candidates from a CSV/XLSX sheet in the background; poll the returned job id."""
+    ext = os.path.splitext(file.filename or "")[1].lower()
+    if ext not in importer.IMPORT_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="Only .csv and .xlsx files can be imported")
+    requisition = db.get(Requisitions, requisition_id)
+    if not requisition:
+        raise HTTPException(status_code=404, detail="Requisition not found")
+    if not scope.can_access(requisition.company_id):
+        raise HTTPException(status_code=403, detail="Access denied: Requisition does not belong to your company.")
+
+    stored = save_upload(db, file, max_bytes=IMPORT_MAX_BYTES)
+    job = models.CandidateImport(file_name=file.filename, file_url=stored.path, requisition_id=requisition.id,
+                                 company_id=requisition.company_id, created_by=scope.user.id,
+                                 status=importer.QUEUED)
+    db.add(job)
+    db.commit()
+    background_tasks.add_task(importer.run_import, job.id)
+    return _import_job_out(db, job)
+
+
+@router.get("/import/{job_id}", response_model=schemas.CandidateImportJob)
+def get_candidate_import(
+    job_id: str,
+    errors_skip: int = Query(0, ge=0),
+    errors_limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    scope: TenantScope = Depends(get_tenant_scope)
+):
+    job = db.get(models.CandidateImport, job_id)
+    if not job or not scope.can_access(job.company_id):
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return _import_job_out(db, job, errors_skip, errors_limit)
+
+
+@router.get("/{candidate_id}", response_model=Union[schemas.CandidateMaskedResponse, schemas.CandidateResponse])
 def read_candidate(
     candidate_id: str,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user)
+    scope: TenantScope = Depends(get_tenant_scope)
 ):
-    db_candidate = crud.get_candidate(db, candidate_id)
+    db_candidate = crud.get_candidate(db, candidate_id, options=scope.candidate_options())
     if not db_candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
 
-    # 🏢 NEW: Company-based authorization
-    if user.company_rel.name.lower() != "acme global hub pvt ltd":
-        if db_candidate.company_id != user.company_rel.id:
-            raise HTTPException(status_code=403, detail="Access denied: Candidate does not belong to your company.")
+    # 🏢 Company-based authorization
+    if not scope.can_access(db_candidate.company_id):
+        raise HTTPException(status_code=403, detail="Access denied: Candidate does not belong to your company.")
 
     # 🟢 Recruiter can only view their own candidates
-    if user.role.lower() == "recruiter" and db_candidate.recruiter != user.name:
+    if scope.role == "recruiter" and db_candidate.recruiter != scope.user.name:
         raise HTTPException(status_code=403, detail="Access denied for this candidate")
 
-    # 🔒 Hide sensitive info if user is not from Acme Global
-    if user.company_rel.name.lower() != "acme global hub pvt ltd":
-        db_candidate.email = None
-        db_candidate.phone = None
-        db_candidate.resume_url = None
-        db_candidate.source = None
-        db_candidate.files = []
-      
-
-    return db_candidate
+    # 🔒 Client tenants get the masked shape; the hidden columns were never loaded
+    if scope.is_masked:
+        return schemas.CandidateMaskedResponse.model_validate(db_candidate, from_attributes=True)
+    return schemas.CandidateResponse.model_validate(db_candidate, from_attributes=True)
 
 
 @router.post("", response_model=schemas.CandidateResponse)
@@ -168,7 +318,7 @@ def create_candidate(
 # In your router file
 
 @router.put("/{candidate_id}", response_model=schemas.CandidateResponse)
-async def update_candidate(
+def update_candidate(
     candidate_id: str,
     # 1. We must explicitly list Form fields here because we are accepting a File
     resume: UploadFile = File(None),
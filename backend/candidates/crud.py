@@ -7,13 +7,11 @@ from requisitions import models as requisition_models
 from app.models import User 
 from app.auth import get_current_user
 from app import crud as skills_crud
+from app.file_store import save_upload
+from app import parse_queue
+from . import search  # noqa: F401  (registers the search index hooks)
 import os 
 
-UPLOAD_DIR = "uploads"
-
-if not os.path.exists(UPLOAD_DIR):
-    os.makedirs(UPLOAD_DIR)
-
 
 
 
@@ -37,12 +35,7 @@ def create_candidate_service(db: Session, data: dict, resume: UploadFile, resume
     final_resume_url = None
 
     if resume:
-        file_location = os.path.join(UPLOAD_DIR, resume.filename)
-
-        with open(file_location, "wb") as f:
-            f.write(resume.file.read())
-
-        final_resume_url = file_location
+        final_resume_url = save_upload(db, resume).path
 
     elif resume_path:
         # keep old resume
@@ -56,30 +49,45 @@ def create_candidate_service(db: Session, data: dict, resume: UploadFile, resume
     candidate = models.Candidate(**data, company_id=company_id)
 
     # assign skills
-    for s in skills_list:
-        skill = skills_crud.get_or_create_skill(db, s.strip())
-        candidate.skills.append(skill)
-
-    db.add(candidate)
-    db.commit()
-    db.refresh(candidate)
+    candidate.skills = skills_crud.resolve_skills(db, skills_list)
 
-    # 5) insert into File table if resume exists
+    # 5) File row if resume exists
     if final_resume_url:
-        file_entry = models.File(
+        resume_file = models.File(
             file_name=f"{candidate.name}_resume",
             file_type="resume",
             file_url=final_resume_url,
-            candidate_id=candidate.id
         )
-        db.add(file_entry)
-        db.commit()
+        candidate.files.append(resume_file)
+        if resume:
+            parse_queue.enqueue(db, resume_file)   # parsed in the background after commit
 
+    db.add(candidate)
+    db.flush()  # assigns candidate.id for the activity log
+
+    create_candidate_activity_log(
+        db=db,
+        candidate_id=candidate.id,
+        user=current_user,
+        action="Created Candidate",
+        details=f"Candidate '{candidate.name}' created",
+        commit=False,
+    )
+
+    # 6) Candidate, skills, file and log land in one transaction
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+    db.refresh(candidate)
     return candidate
 
 
-def get_candidate(db: Session, candidate_id: str):
-    return db.query(models.Candidate).options(joinedload(models.Candidate.skills)).options(joinedload(models.Candidate.files)).filter(models.Candidate.id == candidate_id).first()
+def get_candidate(db: Session, candidate_id: str, options=None):
+    if options is None:
+        options = [joinedload(models.Candidate.skills), joinedload(models.Candidate.files)]
+    return db.query(models.Candidate).options(*options).filter(models.Candidate.id == candidate_id).first()
 
 
 def get_candidates(db: Session, skip: int = 0, limit: int = 100):
@@ -235,20 +243,14 @@ def update_candidate_service(db: Session, candidate_id: str, data: dict, resume:
     # 1. Handle Skills (Pop them out of data dict first)
     if 'skills' in data:
         skill_names = data.pop('skills')
-        # Clear existing and re-add
-        db_candidate.skills = [] 
-        for skill_name in skill_names:
-            skill = skills_crud.get_or_create_skill(db, skill_name=skill_name.strip())
-            db_candidate.skills.append(skill)
+        # Replace the existing set
+        db_candidate.skills = skills_crud.resolve_skills(db, skill_names)
 
     # 2. Handle Resume File Upload
     final_resume_url = None
     if resume:
-        # Save new file
-        file_location = os.path.join(UPLOAD_DIR, resume.filename)
-        with open(file_location, "wb") as f:
-            f.write(resume.file.read())
-        final_resume_url = file_location
+        # Save new file (content-addressed, streamed)
+        final_resume_url = save_upload(db, resume).path
         data['resume_url'] = final_resume_url # Update candidate table reference
     
     elif 'resume_path' in data:
@@ -272,36 +274,23 @@ def update_candidate_service(db: Session, candidate_id: str, data: dict, resume:
             setattr(db_candidate, key, value)
 
     db_candidate.last_activity = datetime.utcnow()
-    
-    try:
-        db.commit()
-        db.refresh(db_candidate)
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
 
-    # 4. Update Files Table (If a new file was uploaded)
+    # 4. Update Files Table (If a new file was uploaded); files are already loaded
     if final_resume_url:
-        existing_file = (
-            db.query(models.File)
-            .filter(models.File.candidate_id == candidate_id, models.File.file_type == "resume")
-            .first()
-        )
+        existing_file = next((f for f in db_candidate.files if f.file_type == "resume"), None)
 
         if existing_file:
             existing_file.file_url = final_resume_url
             existing_file.file_name = resume.filename
             existing_file.uploaded_at = datetime.utcnow()
         else:
-            new_file = models.File(
+            existing_file = models.File(
                 file_name=resume.filename,
                 file_type="resume",
                 file_url=final_resume_url,
-                candidate_id=db_candidate.id
             )
-            db.add(new_file)
-        
-        db.commit()
+            db_candidate.files.append(existing_file)
+        parse_queue.enqueue(db, existing_file)   # parsed in the background after commit
 
     # Log Activity
     create_candidate_activity_log(
@@ -309,9 +298,17 @@ def update_candidate_service(db: Session, candidate_id: str, data: dict, resume:
         candidate_id=candidate_id,
         user=current_user,
         action="Updated Candidate",
-        details="Candidate details updated"
+        details="Candidate details updated",
+        commit=False,
     )
 
+    # 5. Fields, skills, file and log land in one transaction
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+    db.refresh(db_candidate)
     return db_candidate
 
 def delete_candidate(db: Session, candidate_id: str, current_user: User):
@@ -338,7 +335,9 @@ def create_candidate_activity_log(
     user: User,
     action: str,
     details: Optional[str] = None,
+    commit: bool = True,
 ):
+    """Add an activity log row. With commit=False it joins the caller's transaction."""
     log = models.CandidateActivityLog(
         candidate_id=candidate_id,
         user_id=user.id,
@@ -348,6 +347,7 @@ def create_candidate_activity_log(
         timestamp=datetime.utcnow(),
     )
     db.add(log)
-    db.commit()
-    db.refresh(log)
+    if commit:
+        db.commit()
+        db.refresh(log)
     return log
@@ -0,0 +1,232 @@
+"""
+Bulk candidate import from a CSV or XLSX sheet.
+
+The upload is stored first (app.file_store) and read back row by row: CSV
+through csv.DictReader, XLSX through openpyxl in read-only mode (optional
+dependency, imported only for .xlsx), so memory stays flat whatever the file
+size. Rows are validated with schemas.CandidateCreate and written CHUNK_SIZE
+at a time: one batch skill lookup, then executemany INSERTs for candidates,
+candidate_skills and activity logs, and one commit per chunk together with
+the job's progress counters. Rows that fail validation or collide with an
+existing email are recorded in candidate_import_errors with their row number.
+
+Column headers are matched case-insensitively to CandidateCreate fields
+("Current CTC" -> current_ctc); skills are separated by commas or
+semicolons. Every row goes to the import's requisition, and position falls
+back to the requisition's.
+"""
+import csv
+import os
+import re
+import uuid
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app import crud as skills_crud, dashboard, database, response_cache, storage
+from app.models import User, candidate_skills
+from requisitions.models import Requisitions
+from . import models, schemas, search
+
+CHUNK_SIZE = 1000
+IMPORT_EXTENSIONS = {".csv", ".xlsx"}
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+_FIELDS = set(schemas.CandidateCreate.model_fields) - {"requisition_id", "resume_url"}
+_COLUMNS = ["name", "position", "email", "phone", "location", "experience", "rating", "notes", "recruiter",
+            "status", "source", "current_ctc", "expected_ctc", "notice_period", "current_company", "dob",
+            "marital_status"]
+
+
+def _header_key(header) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(header or "").strip().lower()).strip("_")
+
+
+def _csv_rows(path: str) -> Iterator[dict]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            yield row
+
+
+def _xlsx_rows(path: str) -> Iterator[dict]:
+    import openpyxl  # optional dependency, only needed for .xlsx imports
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = next(rows, None) or ()
+        for values in rows:
+            if any(value not in (None, "") for value in values):
+                yield dict(zip(headers, values))
+    finally:
+        workbook.close()
+
+
+def read_rows(path: str) -> Iterator[dict]:
+    """Raw sheet rows as {header: value}, streamed."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".xlsx":
+        return _xlsx_rows(path)
+    return _csv_rows(path)
+
+
+def validate_row(raw: dict, requisition: Requisitions) -> schemas.CandidateCreate:
+    data = {}
+    for header, value in raw.items():
+        key = _header_key(header)
+        if key not in _FIELDS:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        if isinstance(value, datetime):
+            value = value.date()
+        elif isinstance(value, (int, float)) and key not in ("experience", "rating"):
+            # XLSX cells are typed: a phone number comes back as a number
+            value = str(int(value)) if float(value).is_integer() else str(value)
+        if value in ("", None):
+            continue
+        data[key] = value
+    if isinstance(data.get("skills"), str):
+        data["skills"] = [s.strip() for s in re.split(r"[,;]", data["skills"]) if s.strip()]
+    if isinstance(data.get("experience"), float) and data["experience"].is_integer():
+        data["experience"] = int(data["experience"])   # XLSX numbers come back as floats
+    data.setdefault("position", requisition.position)
+    row = schemas.CandidateCreate(**data, requisition_id=requisition.id)
+    if not row.email:
+        raise ValueError("email is required")
+    return row
+
+
+def _raw_email(raw: dict) -> Optional[str]:
+    for header, value in raw.items():
+        if _header_key(header) == "email" and value:
+            return str(value)
+    return None
+
+
+def _error_message(e: Exception) -> str:
+    if isinstance(e, ValidationError):
+        return "; ".join(f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in e.errors())
+    if isinstance(e, HTTPException):
+        return str(e.detail)
+    return str(e)
+
+
+def _insert_chunk(db: Session, job: models.CandidateImport, requisition: Requisitions, user: User,
+                  chunk: List[Tuple[int, schemas.CandidateCreate]]) -> List[Tuple[int, str, str]]:
+    """Insert valid rows; returns (row number, email, error) for the ones that can't go in."""
+    errors = []
+    emails = [row.email.lower() for _, row in chunk]
+    taken = {email.lower() for email, in db.query(models.Candidate.email).filter(models.Candidate.email.in_(emails))}
+    rows = []
+    for number, row in chunk:
+        email = row.email.lower()
+        if email in taken:
+            errors.append((number, row.email, f"candidate with email {row.email} already exists"))
+        else:
+            taken.add(email)
+            rows.append(row)
+    if not rows:
+        return errors
+
+    normalize = skills_crud.normalize_skill_name
+    skills = {normalize(s.name): s.id for s in skills_crud.resolve_skills(db, [n for r in rows for n in r.skills or []])}
+
+    now = datetime.utcnow()
+    candidate_rows, skill_rows, log_rows = [], [], []
+    for row in rows:
+        candidate_id = str(uuid.uuid4())
+        values = row.model_dump(include=set(_COLUMNS))
+        values.update(id=candidate_id, requisition_id=requisition.id, company_id=requisition.company_id,
+                      status=values["status"] or "new", source=values["source"] or "Bulk import",
+                      rating=values["rating"] or 0, applied_date=now, last_activity=now, created_date=now)
+        candidate_rows.append(values)
+        skill_ids = {skills[normalize(n)] for n in row.skills or [] if normalize(n) in skills}
+        skill_rows.extend({"candidate_id": candidate_id, "skill_id": skill_id} for skill_id in skill_ids)
+        log_rows.append({"candidate_id": candidate_id, "user_id": user.id, "username": user.name,
+                         "action": "Created Candidate", "timestamp": now,
+                         "details": f"Candidate '{row.name}' imported from {job.file_name}"})
+
+    db.execute(insert(models.Candidate), candidate_rows)
+    if skill_rows:
+        db.execute(insert(candidate_skills), skill_rows)
+    db.execute(insert(models.CandidateActivityLog), log_rows)
+    # Core INSERTs skip the flush hooks: keep counters and cached lists in step by hand
+    dashboard.count_bulk_inserts(db, models.Candidate, candidate_rows)
+    response_cache.touch_tenants(db, [requisition.company_id])
+    search.reindex(db, [values["id"] for values in candidate_rows])
+    return errors
+
+
+def _commit_chunk(db: Session, job: models.CandidateImport, requisition: Requisitions, user: User,
+                  chunk: List[Tuple[int, schemas.CandidateCreate]], invalid: List[Tuple[int, str, str]],
+                  rows_read: int):
+    """One transaction: the chunk's candidates, its row errors and the job's progress."""
+    try:
+        insert_errors = _insert_chunk(db, job, requisition, user, chunk)
+        _record_progress(db, job, rows_read, len(chunk) - len(insert_errors), invalid + insert_errors)
+        db.commit()
+        return
+    except Exception as e:
+        db.rollback()
+        if len(chunk) <= 1:
+            failed = [(number, row.email, _error_message(e)) for number, row in chunk]
+            _record_progress(db, job, rows_read, 0, invalid + failed)
+            db.commit()
+            return
+
+    # Something in the chunk broke the batch (e.g. an email inserted concurrently): isolate it
+    for i, item in enumerate(chunk):
+        _commit_chunk(db, job, requisition, user, [item], invalid if i == 0 else [], rows_read)
+
+
+def _record_progress(db: Session, job: models.CandidateImport, rows_read: int, imported: int,
+                     errors: List[Tuple[int, str, str]]):
+    if errors:
+        db.execute(insert(models.CandidateImportError), [
+            {"import_id": job.id, "row_number": number, "email": (email or "")[:255] or None, "error": error}
+            for number, email, error in errors
+        ])
+    job.rows_processed = rows_read
+    job.rows_imported += imported
+    job.rows_failed += len(errors)
+
+
+def run_import(job_id: str):
+    """Process an import job to the end. Runs as a background task with its own session."""
+    db = database.SessionLocal()
+    try:
+        job = db.get(models.CandidateImport, job_id)
+        if job is None or job.status not in (QUEUED, RUNNING):
+            return
+        requisition = db.get(Requisitions, job.requisition_id)
+        user = db.get(User, job.created_by)
+        job.status = RUNNING
+        db.commit()
+
+        try:
+            chunk, invalid, number = [], [], 0
+            with storage.backend.local_copy(job.file_url) as path:
+                for number, raw in enumerate(read_rows(path), start=1):
+                    try:
+                        chunk.append((number, validate_row(raw, requisition)))
+                    except Exception as e:
+                        invalid.append((number, _raw_email(raw), _error_message(e)))
+                    if len(chunk) + len(invalid) >= CHUNK_SIZE:
+                        _commit_chunk(db, job, requisition, user, chunk, invalid, number)
+                        chunk, invalid = [], []
+                if chunk or invalid:
+                    _commit_chunk(db, job, requisition, user, chunk, invalid, number)
+        except Exception as e:
+            db.rollback()
+            job.status = FAILED
+            job.error = f"{type(e).__name__}: {e}"
+        else:
+            job.status = DONE
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
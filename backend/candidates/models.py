@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Text, Enum, DateTime,Table, ForeignKey,UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, Date, Text, Enum, DateTime,Table, ForeignKey,UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.models import requisition_skills, candidate_skills
@@ -54,6 +54,16 @@ class Candidate(Base):
 
     # Many-to-Many relationship for skills
     skills = relationship("Skill", secondary=candidate_skills, back_populates="candidates")
+
+    # Keyset pagination: newest first, per tenant and across tenants
+    __table_args__ = (
+        Index("ix_candidates_company_created", "company_id", "created_date", "id"),
+        Index("ix_candidates_created", "created_date", "id"),
+        # Dashboard "active candidates" count and status filters per tenant
+        Index("ix_candidates_company_status", "company_id", "status"),
+        # Recruiters only list their own candidates
+        Index("ix_candidates_company_recruiter", "company_id", "recruiter"),
+    )
     
 
 
@@ -72,6 +82,10 @@ class CandidateActivityLog(Base):
     candidate = relationship("Candidate", backref="activity_logs")
     user = relationship("User", backref="candidate_activity_logs")
 
+    __table_args__ = (
+        Index("ix_candidate_activity_logs_candidate_ts", "candidate_id", "timestamp"),
+    )
+
 
 class File(Base):
     __tablename__ = "files"
@@ -84,4 +98,67 @@ class File(Base):
 
     # Relationship to Candidate (if file belongs to candidate)
     candidate_id = Column(String(36), ForeignKey("candidates.id", ondelete="CASCADE"), nullable=True)
-    candidate = relationship("Candidate", back_populates="files")
\ No newline at end of file
+    candidate = relationship("Candidate", back_populates="files")
+
+    # Resume parsing (app.parse_queue); the File id doubles as the job id
+    parse_status = Column(String(20), nullable=True, index=True)  # queued / running / done / failed; None = never parsed
+    parse_progress = Column(Integer, default=0)
+    parsed_fields = Column(JSON, nullable=True)         # name, email, phone, skills
+    parsed_text = Column(Text(16777215), nullable=True)
+    parse_error = Column(Text, nullable=True)
+    parsed_at = Column(DateTime, nullable=True)
+    parse_owner = Column(String(64), nullable=True)     # process holding the job, see parse_queue.WORKER_ID
+    parse_lease_until = Column(DateTime, nullable=True)  # another process may take the job over after this
+    # Who started a standalone parse (POST /candidates/resume-parse); candidate files go by the candidate
+    uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=True)
+
+
+class CandidateImport(Base):
+    """A bulk CSV/XLSX candidate import (candidates.importer); the id is the job id."""
+    __tablename__ = "candidate_imports"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    file_name = Column(String(255), nullable=False)
+    file_url = Column(String(1000), nullable=False)     # storage key of the uploaded sheet
+    requisition_id = Column(Integer, ForeignKey("requisitions.id"), nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id"))
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    status = Column(String(20), nullable=False, default="queued")   # queued / running / done / failed
+    rows_processed = Column(Integer, nullable=False, default=0)
+    rows_imported = Column(Integer, nullable=False, default=0)
+    rows_failed = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)                 # why the whole import failed, if it did
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    errors = relationship("CandidateImportError", cascade="all, delete-orphan", passive_deletes=True)
+
+
+class CandidateImportError(Base):
+    __tablename__ = "candidate_import_errors"
+
+    id = Column(Integer, primary_key=True)
+    import_id = Column(String(36), ForeignKey("candidate_imports.id", ondelete="CASCADE"), nullable=False, index=True)
+    row_number = Column(Integer, nullable=False)        # 1-based, header row excluded
+    email = Column(String(255), nullable=True)
+    error = Column(Text, nullable=False)
+
+
+class CandidateSearchPosting(Base):
+    """One term of a candidate's search document: the inverted index behind candidates.search."""
+    __tablename__ = "candidate_search_postings"
+
+    term = Column(String(64), primary_key=True)
+    candidate_id = Column(String(36), ForeignKey("candidates.id", ondelete="CASCADE"), primary_key=True)
+    company_id = Column(Integer, nullable=True)        # copied from the candidate, for tenant-scoped lookups
+    weight = Column(Integer, nullable=False)           # every field, resume text included
+    profile_weight = Column(Integer, nullable=False)   # profile fields only: what client tenants can search
+
+    __table_args__ = (
+        # Best matches for a term, for operators (all tenants) and for one tenant
+        Index("ix_candidate_search_term_weight", "term", "weight", "candidate_id"),
+        Index("ix_candidate_search_term_company", "term", "company_id", "profile_weight", "candidate_id"),
+        # Reindexing a candidate replaces its postings
+        Index("ix_candidate_search_candidate", "candidate_id"),
+    )
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
 from datetime import date,datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 import enum
 from app.schemas import Skill
 
@@ -77,6 +77,56 @@ class CandidateResponse(CandidateBase):
     class Config:
         from_attributes = True
 
+class CandidatePage(BaseModel):
+    items: List[CandidateResponse]
+    next_cursor: Optional[str] = None
+
+
+class CandidateMaskedResponse(BaseModel):
+    """A candidate as client tenants see it: no email, phone, resume_url, source or files (app.tenancy)."""
+    id: str
+    name: str
+    position: str
+    location: Optional[str] = None
+    experience: Optional[int] = None
+    skills: List[Skill] = []
+    rating: Optional[int] = 0
+    notes: Optional[str] = None
+    recruiter: Optional[str] = None
+    status: Optional[str] = None
+    requisition_id: Optional[int] = None
+    current_ctc: Optional[str] = None
+    expected_ctc: Optional[str] = None
+    notice_period: Optional[str] = None
+    current_company: Optional[str] = None
+    dob: Optional[date] = None
+    marital_status: Optional[str] = None
+    applied_date: datetime
+    last_activity: datetime
+    created_date: datetime
+    reject_reason: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+        extra = "forbid"
+
+
+class CandidateMaskedPage(BaseModel):
+    items: List[CandidateMaskedResponse]
+    next_cursor: Optional[str] = None
+
+
+class CandidateSearchHit(BaseModel):
+    candidate: Union[CandidateMaskedResponse, CandidateResponse]
+    score: int
+    highlights: Dict[str, str] = {}       # field -> excerpt (HTML-escaped, matches in <mark>)
+
+
+class CandidateSearchPage(BaseModel):
+    items: List[CandidateSearchHit]
+    next_cursor: Optional[str] = None
+
+
 class CandidateMini(BaseModel):
     id: str
     name: str
@@ -112,3 +162,43 @@ class CandidateActivityLogOut(CandidateActivityLogBase):
 
 
    
+class ParsedResumeFields(BaseModel):
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    skills: List[str] = []
+    truncated: Optional[str] = None       # "pages", "chars" or "time" when extraction stopped early
+
+
+class ResumeParseJob(BaseModel):
+    job_id: str
+    status: Optional[str] = None          # queued / running / done / failed
+    progress: int = 0                     # percent
+    file_url: str
+    fields: Optional[ParsedResumeFields] = None
+    error: Optional[str] = None
+    parsed_at: Optional[datetime] = None
+    text: Optional[str] = None            # raw extracted text, with include_text=true
+
+
+class CandidateImportRowError(BaseModel):
+    row_number: int
+    email: Optional[str] = None
+    error: str
+
+    class Config:
+        from_attributes = True
+
+
+class CandidateImportJob(BaseModel):
+    job_id: str
+    status: str                           # queued / running / done / failed
+    file_name: str
+    requisition_id: int
+    rows_processed: int = 0
+    rows_imported: int = 0
+    rows_failed: int = 0
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    errors: List[CandidateImportRowError] = []    # one page, with errors_skip / errors_limit
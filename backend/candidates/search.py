@@ -0,0 +1,264 @@
+"""
+Candidate full-text search over name, position, current company, location,
+skills and parsed resume text.
+
+Every candidate has a search document kept as postings in
+candidate_search_postings: one row per (term, candidate) with the term's
+weight in that document. Fields weigh differently (a term in the name counts
+more than one in the resume), and resume mentions are capped so a long CV
+can't drown out the profile. Each posting carries two weights: `weight`
+covers every field, `profile_weight` leaves out the resume text, which can
+hold contact details client tenants must not search by (see
+app.tenancy.MASKED_CANDIDATE_FIELDS).
+
+A query matches candidates whose document holds every query term and ranks
+them by the summed weights. A one-term query reads the (term, weight) index
+in order and stops at the page size; several terms are intersected with one
+GROUP BY over their postings.
+
+The index is maintained in the writing transaction, like the dashboard
+counters: candidate and file changes are collected before each flush and
+the affected documents rebuilt right after it on the same connection. Writes
+that skip the flush (Core INSERTs, bulk UPDATEs) call reindex() themselves.
+app.reindex_search rebuilds everything, e.g. after a skill is renamed.
+"""
+import html
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import and_, delete, event, func, insert, inspect, or_, select
+from sqlalchemy.orm import Session
+from app import response_cache
+from app.models import Skill, candidate_skills
+from app.pagination import decode_token, encode_token
+from app.tenancy import TenantScope
+from . import models
+
+# Field weights: a term's weight is the sum over the fields it appears in
+FIELD_WEIGHTS = {"name": 10, "skills": 6, "position": 5, "current_company": 4, "location": 3}
+RESUME_WEIGHT = 1
+RESUME_MAX_HITS = 5          # resume mentions counted per term
+MAX_QUERY_TERMS = 8
+REINDEX_BATCH = 500
+SNIPPET_CONTEXT = 60         # characters either side of the first match
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or the to with".split()
+)
+_SEARCHED_ATTRIBUTES = frozenset((
+    "name", "position", "current_company", "location", "company_id", "company", "skills", "files",
+))
+
+Posting = models.CandidateSearchPosting
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-cased terms of `text`: words, numbers, and tech names like c++, c#, node.js."""
+    if not text:
+        return []
+    return [t for t in _TOKEN.findall(text.lower()) if len(t) <= 64 and t not in _STOPWORDS]
+
+
+# ================== INDEXING ==================
+
+def _documents(connection, candidate_ids: List[str]) -> Dict[str, Tuple[Optional[int], Counter, Counter]]:
+    """{candidate id: (company_id, weight per term, profile weight per term)}."""
+    C = models.Candidate
+    profiles = connection.execute(
+        select(C.id, C.company_id, C.name, C.position, C.current_company, C.location).where(C.id.in_(candidate_ids))
+    ).all()
+    skills = defaultdict(list)
+    for candidate_id, name in connection.execute(
+        select(candidate_skills.c.candidate_id, Skill.name)
+        .join(Skill, Skill.id == candidate_skills.c.skill_id)
+        .where(candidate_skills.c.candidate_id.in_(candidate_ids))
+    ):
+        skills[candidate_id].append(name)
+    resumes = defaultdict(Counter)
+    for candidate_id, text in connection.execute(
+        select(models.File.candidate_id, models.File.parsed_text)
+        .where(models.File.candidate_id.in_(candidate_ids), models.File.parsed_text.isnot(None))
+    ):
+        resumes[candidate_id].update(tokenize(text))
+
+    documents = {}
+    for row in profiles:
+        fields = {"name": row.name, "position": row.position, "current_company": row.current_company,
+                  "location": row.location, "skills": " ".join(skills[row.id])}
+        profile = Counter()
+        for field, text in fields.items():
+            for term in set(tokenize(text)):
+                profile[term] += FIELD_WEIGHTS[field]
+        weight = Counter(profile)
+        for term, hits in resumes[row.id].items():
+            weight[term] += RESUME_WEIGHT * min(hits, RESUME_MAX_HITS)
+        documents[row.id] = (row.company_id, weight, profile)
+    return documents
+
+
+def reindex(session: Session, candidate_ids: Iterable[str]):
+    """
+    Rebuild the postings of these candidates (deleted candidates lose theirs)
+    in the session's transaction. Cached search responses of their tenants are
+    invalidated on commit.
+    """
+    connection = session.connection()
+    candidate_ids = list(dict.fromkeys(candidate_ids))
+    for start in range(0, len(candidate_ids), REINDEX_BATCH):
+        batch = candidate_ids[start:start + REINDEX_BATCH]
+        documents = _documents(connection, batch)
+        rows = [
+            {"term": term, "candidate_id": candidate_id, "company_id": company_id,
+             "weight": total, "profile_weight": profile[term]}
+            for candidate_id, (company_id, weight, profile) in documents.items()
+            for term, total in weight.items()
+        ]
+        connection.execute(delete(Posting).where(Posting.candidate_id.in_(batch)))
+        if rows:
+            connection.execute(insert(Posting), rows)
+        response_cache.touch_tenants(session, {company_id for company_id, _, _ in documents.values()})
+
+
+# Index maintenance: documents touched by a flush are worked out before it
+# (while attribute history is available) and rebuilt right after it.
+
+_PENDING = "candidate_search_pending"
+
+
+def _search_fields_changed(obj) -> bool:
+    state = inspect(obj)
+    if isinstance(obj, models.Candidate):
+        return any(state.attrs[key].history.has_changes() for key in _SEARCHED_ATTRIBUTES)
+    return any(state.attrs[key].history.has_changes() for key in ("parsed_text", "candidate_id", "candidate"))
+
+
+def _collect_documents(session: Session, flush_context, instances):
+    pending = session.info.setdefault(_PENDING, [])
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, (models.Candidate, models.File)):
+            continue
+        if obj in session.new or obj in session.deleted or _search_fields_changed(obj):
+            pending.append(obj)
+
+
+def _reindex_documents(session: Session, flush_context):
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    ids = set()
+    for obj in pending:
+        if isinstance(obj, models.Candidate):
+            ids.add(obj.id)
+            continue
+        ids.add(obj.candidate_id)
+        history = inspect(obj).attrs.candidate_id.history
+        ids.update(history.deleted or ())        # a file moved off another candidate
+    ids.discard(None)
+    if ids:
+        reindex(session, ids)
+
+
+def _discard_documents(session: Session, previous_transaction=None):
+    session.info.pop(_PENDING, None)
+
+
+event.listen(Session, "before_flush", _collect_documents)
+event.listen(Session, "after_flush", _reindex_documents)
+event.listen(Session, "after_soft_rollback", _discard_documents)
+
+
+# ================== SEARCH ==================
+
+def _highlighter(terms: List[str]):
+    words = "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"(?<![a-z0-9])(?:{words})(?![a-z0-9+#])", re.IGNORECASE)
+
+
+def snippet(text: Optional[str], pattern) -> Optional[str]:
+    """An excerpt around the first match, HTML-escaped, matches wrapped in <mark>."""
+    if not text:
+        return None
+    text = " ".join(text.split())
+    first = pattern.search(text)
+    if first is None:
+        return None
+    start = max(0, first.start() - SNIPPET_CONTEXT)
+    end = min(len(text), first.end() + SNIPPET_CONTEXT)
+    excerpt, pieces, at = text[start:end], [], 0
+    for match in pattern.finditer(excerpt):
+        pieces.append(html.escape(excerpt[at:match.start()]))
+        pieces.append(f"<mark>{html.escape(match.group())}</mark>")
+        at = match.end()
+    pieces.append(html.escape(excerpt[at:]))
+    return ("…" if start else "") + "".join(pieces) + ("…" if end < len(text) else "")
+
+
+def _highlights(db: Session, scope: TenantScope, candidates: list, terms: List[str]) -> Dict[str, Dict[str, str]]:
+    pattern = _highlighter(terms)
+    resumes = {}
+    if not scope.is_masked and candidates:
+        rows = (db.query(models.File.candidate_id, models.File.parsed_text)
+                .filter(models.File.candidate_id.in_([c.id for c in candidates]),
+                        models.File.parsed_text.isnot(None)))
+        for candidate_id, text in rows:
+            resumes.setdefault(candidate_id, text)
+    result = {}
+    for c in candidates:
+        fields = {"name": c.name, "position": c.position, "current_company": c.current_company,
+                  "location": c.location, "skills": ", ".join(s.name for s in c.skills),
+                  "resume": resumes.get(c.id)}
+        found = {field: snippet(text, pattern) for field, text in fields.items()}
+        result[c.id] = {field: text for field, text in found.items() if text}
+    return result
+
+
+def search_candidates(db: Session, scope: TenantScope, q: str, limit: int, cursor: Optional[str] = None):
+    """
+    Returns ([(candidate, score, highlights)], next_cursor) for the page after
+    `cursor`, best match first. Candidates are loaded with the tenant's
+    masking options.
+    """
+    terms = list(dict.fromkeys(tokenize(q)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return [], None
+
+    # Client tenants search the profile only (their weight is 0 for resume-only terms)
+    weight = Posting.profile_weight if scope.is_masked else Posting.weight
+    criteria = [Posting.term.in_(terms), weight > 0, *scope.company_filter(Posting.company_id)]
+    if len(terms) == 1:
+        matches = select(Posting.candidate_id, weight.label("score")).where(*criteria)
+    else:
+        matches = (
+            select(Posting.candidate_id, func.sum(weight).label("score"))
+            .where(*criteria)
+            .group_by(Posting.candidate_id)
+            .having(func.count() == len(terms))
+        )
+    matches = matches.subquery()
+
+    query = (
+        db.query(models.Candidate, matches.c.score)
+        .join(matches, matches.c.candidate_id == models.Candidate.id)
+        .options(*scope.candidate_options())
+        .filter(*scope.candidate_filters())
+    )
+    if cursor:
+        try:
+            score, candidate_id = decode_token(cursor)
+            score = int(score)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(or_(
+            matches.c.score < score,
+            and_(matches.c.score == score, matches.c.candidate_id < candidate_id),
+        ))
+    rows = query.order_by(matches.c.score.desc(), matches.c.candidate_id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_token([int(rows[-1][1]), rows[-1][0].id])
+    highlights = _highlights(db, scope, [c for c, _ in rows], terms)
+    return [(c, int(score), highlights[c.id]) for c, score in rows], next_cursor
@@ -7,10 +7,12 @@ from candidates import models
 from requisitions.models import Requisitions
 
 from app.auth import oauth2_scheme,get_current_user
+from app.tenancy import TenantScope, get_tenant_scope
+from app.response_cache import cached_response
 from app.database import get_db
 from app.models import User
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional, Union
 from msal import ConfidentialClientApplication
 from config import CLIENT_ID, CLIENT_SECRET, TENANT_ID,GRAPH_API
 import requests
@@ -209,9 +211,8 @@ def schedule_interview(
 
     db.add(interview)
     db.commit()
-    db.refresh(interview)
 
-    return interview
+    return crud.get_interview(db, interview.id)
 
 
 
@@ -271,13 +272,28 @@ def create_interview(interview: InterviewCreate, db: Session = Depends(get_db)):
 
     return crud.create_interview(db, interview)
 
-@router.get("", response_model=List[InterviewResponse])
+@router.get("", response_model=Union[List[InterviewResponse], InterviewPage])
+@cached_response(Union[List[InterviewResponse], InterviewPage])
 def list_interviews(
     db: Session = Depends(get_db),
-    company_id: Optional[int] = Query(None),
-    status: Optional[str] = Query(None)
+    scope: TenantScope = Depends(get_tenant_scope),
+    status: Optional[str] = Query(None),
+    scheduled_from: Optional[datetime] = Query(None, description="Only interviews scheduled at or after this time"),
+    scheduled_to: Optional[datetime] = Query(None, description="Only interviews scheduled before this time"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Keyset pagination; pass an empty value for the first page"),
 ):
-    return crud.get_interviews(db, company_id=company_id, status=status)
+    return crud.get_interviews(
+        db,
+        filters=scope.interview_filters(),
+        status=status,
+        scheduled_from=scheduled_from,
+        scheduled_to=scheduled_to,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+    )
 
 @router.get("/{interview_id}", response_model=InterviewResponse)
 def get_interview(interview_id: str, db: Session = Depends(get_db)):
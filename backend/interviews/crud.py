@@ -1,148 +1,112 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload, load_only
 from . import models, schemas
 from datetime import datetime
 from typing import List, Optional
+from app.models import User
+from app.pagination import keyset_page, offset_page
+from candidates.models import Candidate
+from requisitions.models import Requisitions
 
-def create_interview(db: Session, interview: schemas.InterviewCreate):
-    db_interview = models.Interview(
-        **interview.dict(exclude={"interviewers"}),
-        interviewers=",".join(interview.interviewers)
+
+def interview_load_options():
+    """
+    The one eager-loading strategy for every interview response: each
+    relation is fetched with a single SELECT ... IN for the whole page, so a
+    listing costs a constant number of queries however many rows it returns.
+    """
+    return (
+        selectinload(models.Interview.candidate).load_only(
+            Candidate.id, Candidate.name, Candidate.email, Candidate.position, Candidate.requisition_id
+        ),
+        selectinload(models.Interview.requisition).options(
+            load_only(Requisitions.id, Requisitions.position, Requisitions.req_id,
+                      Requisitions.status, Requisitions.recruiter_id),
+            selectinload(Requisitions.recruiter).load_only(User.id, User.name, User.email),
+        ),
+        selectinload(models.Interview.interviewers).load_only(User.id, User.name),
     )
-    db.add(db_interview)
-    db.commit()
-    db.refresh(db_interview)
-    # Serialize response to match InterviewResponse
-    interviewers_list = db_interview.interviewers.split(",") if db_interview.interviewers else []
-    requisition_id_str = str(db_interview.requisition_id)
-    created_date = getattr(db_interview, "created_date", None)
-    if not created_date:
-        created_date = db_interview.datetime
-    req_obj = db_interview.requisition
-    req_id = str(getattr(req_obj, "req_id", "")) if req_obj else ""
-    recruiter = None
-    if req_obj and hasattr(req_obj, "recruiter"):
-        recruiter = {
-            "id": req_obj.recruiter.id,
-            "name": req_obj.recruiter.name,
-            "email": req_obj.recruiter.email,
-        } if req_obj.recruiter else None
-    requisition_dict = {
-        **req_obj.__dict__,
-        "req_id": req_id,
-        "recruiter": recruiter
-    } if req_obj else None
-    return {
-        "id": db_interview.id,
-        "candidate_id": db_interview.candidate_id,
-        "requisition_id": requisition_id_str,
-        "interview_type": db_interview.interview_type,
-        "mode": db_interview.mode,
-        "datetime": db_interview.datetime,
-        "duration": db_interview.duration,
-        "location": db_interview.location,
-        "meeting_link": db_interview.meeting_link,
-        "interviewers": interviewers_list,
-        "status": db_interview.status,
-        "feedback": db_interview.feedback,
-        "score": db_interview.score,
-        "notes": db_interview.notes,
-        "created_date": created_date,
-        "candidate": db_interview.candidate,
-        "requisition": requisition_dict
-    }
 
-def get_interviews(db: Session, company_id: Optional[int] = None, status: Optional[str] = None):
-    query = db.query(models.Interview)
-    if company_id:
-        query = query.filter(models.Interview.company_id == company_id)
-    if status:
-        query = query.filter(models.Interview.status == status)
-    
-    interviews = query.all()
-    result = []
-    for interview in interviews:
-        # Ensure interviewers is a list
-        interviewers = interview.interviewers.split(",") if interview.interviewers else []
-        # Ensure requisition_id is a string
-        requisition_id = str(interview.requisition_id)
-        # Ensure created_date is present
-        created_date = getattr(interview, "created_date", None)
-        if not created_date:
-            created_date = interview.datetime
-        req_obj = interview.requisition
-        req_id = str(getattr(req_obj, "req_id", "")) if req_obj else ""
-        recruiter = None
-        if req_obj and hasattr(req_obj, "recruiter"):
-            recruiter = {
-                "id": req_obj.recruiter.id,
-                "name": req_obj.recruiter.name,
-                "email": req_obj.recruiter.email,
-            } if req_obj.recruiter else None
-        requisition_dict = {
-            **req_obj.__dict__,
-            "req_id": req_id,
-            "recruiter": recruiter
-        } if req_obj else None
-        result.append({
-            "id": interview.id,
-            "candidate_id": interview.candidate_id,
-            "requisition_id": requisition_id,
-            "interview_type": interview.interview_type,
-            "mode": interview.mode,
-            "datetime": interview.datetime,
-            "duration": interview.duration,
-            "location": interview.location,
-            "meeting_link": interview.meeting_link,
-            "interviewers": interviewers,
-            "status": interview.status,
-            "feedback": interview.feedback,
-            "score": interview.score,
-            "notes": interview.notes,
-            "created_date": created_date,
-            "candidate": interview.candidate,
-            "requisition": requisition_dict
-        })
-    return result
 
-def get_interview(db: Session, interview_id: str):
-    interview = db.query(models.Interview).filter(models.Interview.id == interview_id).first()
-    if not interview:
-        return None
-    interviewers = interview.interviewers.split(",") if interview.interviewers else []
-    requisition_id = str(interview.requisition_id)
-    created_date = getattr(interview, "created_date", None)
-    if not created_date:
-        created_date = interview.datetime
+def serialize_interview(interview: models.Interview) -> dict:
+    """Shape an eagerly loaded Interview for schemas.InterviewResponse."""
     req_obj = interview.requisition
-    req_id = str(getattr(req_obj, "req_id", "")) if req_obj else ""
-    recruiter = None
-    if req_obj and hasattr(req_obj, "recruiter"):
-        recruiter = {
-            "id": req_obj.recruiter.id,
-            "name": req_obj.recruiter.name,
-            "email": req_obj.recruiter.email,
-        } if req_obj.recruiter else None
-    requisition_dict = {
-        **req_obj.__dict__,
-        "req_id": req_id,
-        "recruiter": recruiter
-    } if req_obj else None
+    requisition = None
+    if req_obj:
+        recruiter = req_obj.recruiter
+        requisition = {
+            "id": req_obj.id,
+            "position": req_obj.position,
+            "req_id": str(req_obj.req_id or ""),
+            "status": req_obj.status,
+            "recruiter": {"id": recruiter.id, "name": recruiter.name, "email": recruiter.email} if recruiter else None,
+        }
     return {
         "id": interview.id,
         "candidate_id": interview.candidate_id,
-        "requisition_id": requisition_id,
+        "requisition_id": interview.requisition_id,
         "interview_type": interview.interview_type,
         "mode": interview.mode,
-        "datetime": interview.datetime,
+        "scheduled_at": interview.scheduled_at,
         "duration": interview.duration,
         "location": interview.location,
         "meeting_link": interview.meeting_link,
-        "interviewers": interviewers,
+        "interviewers": [user.name for user in interview.interviewers],
         "status": interview.status,
         "feedback": interview.feedback,
         "score": interview.score,
         "notes": interview.notes,
-        "created_date": created_date,
+        "created_date": interview.created_date or interview.scheduled_at,
         "candidate": interview.candidate,
-        "requisition": requisition_dict
+        "requisition": requisition,
     }
+
+
+def create_interview(db: Session, interview: schemas.InterviewCreate):
+    # Interviewers arrive as user names, the same way they are listed back
+    interviewers = db.query(User).filter(User.name.in_(interview.interviewers)).all() if interview.interviewers else []
+    db_interview = models.Interview(
+        **interview.dict(exclude={"interviewers"}),
+        interviewers=interviewers,
+    )
+    db.add(db_interview)
+    db.commit()
+    return get_interview(db, db_interview.id)
+
+
+def get_interviews(db: Session, filters: Optional[list] = None, status: Optional[str] = None,
+                   scheduled_from: Optional[datetime] = None, scheduled_to: Optional[datetime] = None,
+                   skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    """
+    One page of matching interviews, newest first: by skip/limit, or as a
+    keyset page when `cursor` is given.
+    """
+    query = db.query(models.Interview).options(*interview_load_options())
+    if filters:
+        query = query.filter(*filters)
+    if status:
+        query = query.filter(models.Interview.status == status)
+    if scheduled_from:
+        query = query.filter(models.Interview.scheduled_at >= scheduled_from)
+    if scheduled_to:
+        query = query.filter(models.Interview.scheduled_at < scheduled_to)
+
+    if cursor is not None:
+        interviews, next_cursor = keyset_page(
+            query, models.Interview.created_date, models.Interview.id, cursor, limit
+        )
+        return {"items": [serialize_interview(i) for i in interviews], "next_cursor": next_cursor}
+
+    interviews = offset_page(query, models.Interview.created_date, models.Interview.id, skip, limit)
+    return [serialize_interview(i) for i in interviews]
+
+
+def get_interview(db: Session, interview_id: str):
+    interview = (
+        db.query(models.Interview)
+        .options(*interview_load_options())
+        .filter(models.Interview.id == interview_id)
+        .first()
+    )
+    if not interview:
+        return None
+    return serialize_interview(interview)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Text, Enum, DateTime,Table, ForeignKey,UniqueConstraint, Enum as SAEnum
+from sqlalchemy import Column, Integer, String, Float, Date, Text, Enum, DateTime,Table, ForeignKey,UniqueConstraint, Index, Enum as SAEnum
 from sqlalchemy.orm import relationship
 from app.database import Base
 from sqlalchemy.dialects.sqlite import JSON
@@ -49,6 +49,17 @@ class Interview(Base):
     # Relationships
     requisition = relationship("Requisitions", back_populates="interviews")
     scorecard = relationship("Scorecard", back_populates="interview", uselist=False)
+
+    # Keyset pagination: newest first, per tenant and across tenants
+    __table_args__ = (
+        Index("ix_interviews_company_created", "company_id", "created_date", "id"),
+        Index("ix_interviews_created", "created_date", "id"),
+        # Dashboard scheduled count and upcoming-interviews window per tenant
+        Index("ix_interviews_company_status_scheduled", "company_id", "status", "scheduled_at"),
+        Index("ix_interviews_status_scheduled", "status", "scheduled_at"),
+        # Calendar view: a tenant's interviews in a scheduled_at window
+        Index("ix_interviews_company_scheduled", "company_id", "scheduled_at"),
+    )
     
 
 
@@ -3,7 +3,7 @@ from datetime import date,datetime
 from typing import Optional, List, Dict, Any
 import enum
 from candidates.schemas import CandidateMini
-from requisitions.schemas import RequisitionMini    
+from requisitions.schemas import RequisitionMini, RecruiterOut
 
 
 
@@ -64,15 +64,22 @@ class InterviewBase(BaseModel):
 class InterviewCreate(InterviewBase):
     pass
 
+class InterviewRequisition(RequisitionMini):
+    recruiter: Optional[RecruiterOut] = None
+
 class InterviewResponse(InterviewBase):
     id: str
     created_date: datetime
     candidate: CandidateMini
-    requisition: RequisitionMini
+    requisition: InterviewRequisition
 
     class Config:
         from_attributes = True
 
+class InterviewPage(BaseModel):
+    items: List[InterviewResponse]
+    next_cursor: Optional[str] = None
+
 class ScorecardBase(BaseModel):
     technical_score: float
     behavioral_score: float
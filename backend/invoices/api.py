@@ -1,25 +1,13 @@
 # api.py
-from fastapi import APIRouter, Depends, HTTPException, Query, Form, File, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Form, File, UploadFile, Request
 from sqlalchemy.orm import Session
-import os
 
 from . import schemas, crud,models
 from app.database import get_db
+from app.file_store import save_upload, stored_file_response, PDF_PREFIX
 
 router = APIRouter()
 
-PDF_DIR = "pdfs"
-os.makedirs(PDF_DIR, exist_ok=True)
-
-
-def save_file(file: UploadFile) -> str:
-    # Basic save, in production consider unique names, S3 etc.
-    file_path = os.path.join(PDF_DIR, file.filename)
-    with open(file_path, "wb") as buffer:
-        buffer.write(file.file.read())
-    return file_path
-
 @router.post("/create", response_model=schemas.InvoiceOut)
 def create_invoice(payload: schemas.InvoiceCreate, db: Session = Depends(get_db)):
     return crud.create_invoice_crud(db, payload)
@@ -31,7 +19,7 @@ def upload_invoice(
     db: Session = Depends(get_db)
 ):
     # save file → generate pdf_url
-    pdf_url = save_file(file)
+    pdf_url = f"/{save_upload(db, file, prefix=PDF_PREFIX).path}"
 
     invoice = models.Invoice(
         client_company=client_company,
@@ -50,6 +38,7 @@ def list_invoices(db: Session = Depends(get_db)):
 @router.get("/{invoice_id}")
 def get_invoice(
     invoice_id: int,
+    request: Request,
     preview: bool = Query(False),
     db: Session = Depends(get_db)
 ):
@@ -58,15 +47,14 @@ def get_invoice(
         raise HTTPException(status_code=404, detail="Invoice not found")
 
     if preview:
-        pdf_path = os.path.join(PDF_DIR, f"invoice_{invoice_id}.pdf")
-        if not os.path.exists(pdf_path):
+        if not inv.pdf_url:
             raise HTTPException(status_code=404, detail="PDF not found")
 
-        return FileResponse(
-            pdf_path,
-            media_type="application/pdf",
+        return stored_file_response(
+            request,
+            inv.pdf_url.lstrip("/"),
             filename=f"invoice_{invoice_id}.pdf",
-            headers={"Content-Disposition": "inline"}
+            inline=True,
         )
 
     return schemas.InvoiceOut.model_validate(inv, from_attributes=True)
@@ -7,9 +7,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 from . import models, schemas
 from .new_invoice_generator import InvoiceGenerator
-
-PDF_DIR = "pdfs"
-os.makedirs(PDF_DIR, exist_ok=True)
+from app.file_store import save_bytes, PDF_PREFIX
 
 
 # ----------------- invoice number generator -----------------
@@ -133,12 +131,9 @@ def create_invoice_crud(db: Session, data: schemas.InvoiceCreate):
     generator.add_footer(payload["footer"]["address"], payload["footer"]["contact"])
 
     pdf_bytes = generator.build_pdf()
-    pdf_path = os.path.join(PDF_DIR, f"invoice_{invoice.id}.pdf")
-
-    with open(pdf_path, "wb") as f:
-        f.write(pdf_bytes.getvalue())
+    stored = save_bytes(db, pdf_bytes.getvalue(), PDF_PREFIX, f"invoice_{invoice.id}.pdf", "application/pdf")
 
-    invoice.pdf_url = f"/pdfs/invoice_{invoice.id}.pdf"
+    invoice.pdf_url = f"/{stored.path}"
     db.add(invoice)
     db.commit()
 
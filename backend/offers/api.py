@@ -4,7 +4,9 @@ from . import models, schemas, crud
 from .schemas import *
 from app.auth import oauth2_scheme, get_current_user
 from app.database import get_db
-from typing import List
+from typing import List, Optional, Union
+from datetime import datetime
+from app.pagination import keyset_page, offset_page
 
 
 router = APIRouter()
@@ -24,38 +26,34 @@ def require_roles(*roles):
     return Depends(dependency)
 
 
-@router.get("", response_model=List[OfferOut])
+@router.get("", response_model=Union[List[OfferOut], OfferPage])
 def list_offers(
     db: Session = Depends(get_db),
     user = Depends(get_current_user),
+    app_id: Optional[int] = Query(None, description="Requisition the offer was made against"),
     status: Optional[str] = None,
-    candidate_id: Optional[str] = None
+    candidate_id: Optional[str] = None,
+    expires_after: Optional[datetime] = Query(None, description="Only offers expiring at or after this time"),
+    expires_before: Optional[datetime] = Query(None, description="Only offers expiring before this time"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Keyset pagination; pass an empty value for the first page"),
 ):
-    query = db.query(models.Offer)
+    query = crud.offers_query(
+        db,
+        app_id=app_id,
+        status=status,
+        candidate_id=candidate_id,
+        expires_after=expires_after,
+        expires_before=expires_before,
+    )
 
-    if status:
-        query = query.filter(models.Offer.status == status)
-    if candidate_id:
-        query = query.filter(models.Offer.candidate_id == candidate_id)
+    if cursor is not None:
+        offers, next_cursor = keyset_page(query, models.Offer.created_at, models.Offer.id, cursor, limit)
+        return {"items": [crud.serialize_offer(o) for o in offers], "next_cursor": next_cursor}
 
-    offers = query.all()
-
-    # include approvals if needed
-    result = []
-    for o in offers:
-        approvals = (
-            db.query(models.ApprovalRecord)
-            .filter(models.ApprovalRecord.offer_id == o.id)
-            .all()
-        )
-        offer_out = OfferOut.from_orm(o)
-        offer_out.approvals = [
-            {"role": a.role, "state": a.state, "approver": a.approver_id, "comment": a.comment}
-            for a in approvals
-        ]
-        result.append(offer_out)
-
-    return result
+    offers = offset_page(query, models.Offer.created_at, models.Offer.id, skip, limit)
+    return [crud.serialize_offer(o) for o in offers]
 
 
 
@@ -103,9 +101,9 @@ def candidate_action(offer_id: str, payload: CandidateAction, db: Session = Depe
 
 @router.get("/{offer_id}", response_model=OfferOut)
 def get_offer(offer_id: str, db: Session = Depends(get_db), user = Depends(get_current_user)):
-    offer = db.query(models.Offer).filter(models.Offer.offer_id == offer_id).one_or_none()
+    offer = crud.offers_query(db).filter(models.Offer.offer_id == offer_id).one_or_none()
     if not offer:
         raise HTTPException(404, "offer not found")
-    return OfferOut.from_orm(offer)
+    return crud.serialize_offer(offer)
 
 
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, subqueryload
 from app import models, schemas
 from .models import Offer, OfferStatus, ApprovalRecord, ApprovalState, SalaryBand
 from .schemas import OfferCreate
@@ -47,6 +47,50 @@ def create_offer(db: Session, payload: OfferCreate, creator_user=None) -> Offer:
     db.refresh(offer)
     return offer
 
+def serialize_approval(a: ApprovalRecord) -> dict:
+    return {"role": a.role, "state": a.state, "approver": a.approver_id, "comment": a.comment}
+
+
+def serialize_offer(offer: Offer) -> dict:
+    """Shape an Offer (approvals already loaded) for schemas.OfferOut."""
+    return {
+        "offer_id": offer.offer_id,
+        "app_id": offer.app_id,
+        "candidate_id": offer.candidate_id,
+        "grade": offer.grade,
+        "base": offer.base,
+        "allowances": offer.allowances or {},
+        "benefits": offer.benefits or {},
+        "variable_pay": offer.variable_pay or 0.0,
+        "currency": offer.currency,
+        "status": offer.status,
+        "expiry_date": offer.expiry_date,
+        "approvals": [serialize_approval(a) for a in offer.approvals],
+    }
+
+
+def offers_query(db: Session, app_id: Optional[int] = None, status: Optional[str] = None,
+                 candidate_id: Optional[str] = None, expires_after: Optional[datetime] = None,
+                 expires_before: Optional[datetime] = None):
+    """
+    Filtered offers with their approvals. Approvals come from one extra
+    SELECT per page whatever its size (selectinload would split pages over
+    500 rows into several IN batches).
+    """
+    query = db.query(Offer).options(subqueryload(Offer.approvals))
+    if app_id is not None:
+        query = query.filter(Offer.app_id == app_id)
+    if status:
+        query = query.filter(Offer.status == status)
+    if candidate_id:
+        query = query.filter(Offer.candidate_id == candidate_id)
+    if expires_after:
+        query = query.filter(Offer.expiry_date >= expires_after)
+    if expires_before:
+        query = query.filter(Offer.expiry_date < expires_before)
+    return query
+
+
 def submit_for_approval(db: Session, offer: Offer, country: str = "IN"):
     if offer.status not in (OfferStatus.DRAFT, OfferStatus.REJECTED):
         raise ValueError("Only DRAFT or REJECTED offers can be submitted")
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Text, Enum, DateTime,Table, ForeignKey,UniqueConstraint, Enum as SAEnum
+from sqlalchemy import Column, Integer, String, Float, Date, Text, Enum, DateTime,Table, ForeignKey,UniqueConstraint, Index, Enum as SAEnum
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models import Blob  # offer letters are stored blobs
 from sqlalchemy.dialects.sqlite import JSON
 from datetime import datetime
 import uuid
@@ -33,11 +34,6 @@ class SalaryBand(Base):
     max_amount = Column(Float, nullable=False)
     __table_args__ = (UniqueConstraint("country", "grade", name="uq_country_grade"),)
 
-class Blob(Base):
-    __tablename__ = "blobs"
-    id = Column(String(64), primary_key=True)  # e.g., s3 key or UUID
-    path = Column(String(512), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
 
 class Offer(Base):
     __tablename__ = "offers"
@@ -64,6 +60,15 @@ class Offer(Base):
     requisitions = relationship("Requisitions", foreign_keys=[app_id])
     candidate = relationship("Candidate", foreign_keys=[candidate_id])
 
+    __table_args__ = (
+        # Keyset pagination: newest first
+        Index("ix_offers_created", "created_at", "id"),
+        # List filters: per requisition, and status + expiry window
+        Index("ix_offers_app_created", "app_id", "created_at", "id"),
+        Index("ix_offers_status_expiry", "status", "expiry_date"),
+        Index("ix_offers_expiry", "expiry_date"),
+    )
+
 class ApprovalRecord(Base):
     __tablename__ = "approval_records"
     id = Column(Integer, primary_key=True)
@@ -45,6 +45,10 @@ class OfferOut(BaseModel):
     class Config:
         from_attributes = True
 
+class OfferPage(BaseModel):
+    items: List[OfferOut]
+    next_cursor: Optional[str] = None
+
 class ApproverAction(BaseModel):
     role: str
     action: str  # APPROVED or REJECTED
@@ -1,11 +1,16 @@
 from fastapi import FastAPI, Depends, HTTPException, status, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from .schemas import *
 from . import crud, models
 from app.models import User
 from app.auth import get_current_user
+from app.tenancy import TenantScope, get_tenant_scope
+from app.response_cache import cached_response
+from app.pagination import keyset_page, offset_page
 from app.database import get_db
-from typing import List, Optional
+from app import export
+from typing import List, Optional, Union
 from fastapi import APIRouter
 # from app import celery_worker, websocket
 from app.utils.tasks import( send_requisition_created_email,
@@ -60,32 +65,37 @@ async def create_requisition(req: RequisitionCreate,
 
 
 
-@router.get("", response_model=list[RequisitionList])
+@router.get("", response_model=Union[list[RequisitionList], RequisitionPage])
+@cached_response(
+    Union[list[RequisitionList], RequisitionPage],
+    user_scope=lambda scope, params: crud.requisition_role_user(
+        scope.user.role, scope.user.id, params.get("approval_status")
+    ),
+)
 def read_requisitions(
-    skip: int = 0,
-    limit: int = 10,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=1000),
     approval_status: str = Query("approved"),
-    company_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="Keyset pagination; pass an empty value for the first page"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    scope: TenantScope = Depends(get_tenant_scope)
     ):
 
-    req_company_id = company_id
-
-    if current_user.company_rel.name.lower() != 'acme global hub pvt ltd':
-        req_company_id = current_user.company_id
-        
-    db_reqs = crud.get_requisitions(
+    query = crud.requisitions_query(
         db=db,
-        skip=skip,
-        limit=limit,
-        role=current_user.role,
-        user_id=current_user.id,
+        role=scope.user.role,
+        user_id=scope.user.id,
         approval_status=approval_status,
-        company_id=req_company_id,
-        company_name=current_user.company_rel.name,
+        filters=scope.requisition_filters(),
     )
+    if cursor is not None:
+        db_reqs, next_cursor = keyset_page(
+            query, models.Requisitions.created_date, models.Requisitions.id, cursor, limit
+        )
+    else:
+        db_reqs = offset_page(query, models.Requisitions.created_date, models.Requisitions.id, skip, limit)
 
+    applications = crud.count_applications(db, [req.id for req in db_reqs])
     result = []
     for req in db_reqs:
         recruiter = None
@@ -100,25 +110,47 @@ def read_requisitions(
         req_dict["recruiter"] = recruiter
         req_dict.pop("_sa_instance_state", None)
         req_dict["req_id"] = str(req_dict.get("req_id") or "")
+        req_dict["applications_count"] = applications.get(req.id, 0)
         result.append(req_dict)
 
+    if cursor is not None:
+        return {"items": result, "next_cursor": next_cursor}
     return result
 
+@router.get("/export")
+def export_requisitions(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    columns: Optional[str] = Query(None, description="Comma-separated column names (default: all)"),
+    approval_status: str = Query("approved"),
+    scope: TenantScope = Depends(get_tenant_scope)
+):
+    """Stream the requisitions the caller can see (same filters as the list) as CSV or NDJSON."""
+    available = export.export_columns(models.Requisitions)
+    names = export.select_columns(available, columns)
+    statement = (
+        select(*export.projection(available, names))
+        .where(*scope.requisition_filters(),
+               *crud.requisition_role_filters(scope.user.role, scope.user.id, approval_status))
+        .order_by(models.Requisitions.id)
+    )
+    return export.stream_export(statement, names, format, "requisitions")
+
 @router.get("/req", response_model=list[RequisitionMini])
 def get_req(
     skip: int = 0,
     limit: int = 10,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
     approval_status: str = Query("approved")
 ):
     db_reqs = crud.get_requisitions(
         db,
         skip=skip,
         limit=limit,
-        role=current_user.role,
-        user_id=current_user.id,
+        role=scope.user.role,
+        user_id=scope.user.id,
         approval_status=approval_status,
+        filters=scope.requisition_filters(),
     )
 
     return db_reqs
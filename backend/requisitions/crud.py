@@ -4,8 +4,11 @@ from datetime import datetime
 from typing import List, Optional
 import random
 import sqlalchemy
-from sqlalchemy.orm import joinedload
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload, selectinload, load_only
 from app import crud as skills_crud
+from app.models import Company, Department, Location, Skill, User
+from candidates.models import Candidate
 
 def get_user_by_email(db: Session, email: str):
     return db.query(models.User).filter(models.User.email == email).first()
@@ -28,9 +31,7 @@ def create_requisition(db: Session, req: schemas.RequisitionCreate):
     db_req = models.Requisitions(req_id=req_id, **req_data)
 
     if skills_data:
-        for skill_name in skills_data:
-            skill = skills_crud.get_or_create_skill(db, skill_name=skill_name.strip())
-            db_req.skills.append(skill)
+        db_req.skills = skills_crud.resolve_skills(db, skills_data)
 
     db.add(db_req)
     db.commit()
@@ -54,63 +55,120 @@ def get_requisition(db: Session, requisition_id: int):
         .first()
     )
 
-def get_requisitions(
-    db: Session,
-    skip: int = 0,
-    limit: int = 10,
-    role: Optional[str] = None,
-    user_id: Optional[int] = None,
-    approval_status: Optional[str] = None,
-    company_id: Optional[int] = None,
-    company_name: Optional[str] = None,
-):
-    query = db.query(models.Requisitions).options(
-        joinedload(models.Requisitions.department),   # ✅ LOAD department
-        joinedload(models.Requisitions.location),     # ✅ LOAD location
-        joinedload(models.Requisitions.skills),       # ✅ LOAD skills
-        joinedload(models.Requisitions.recruiter),    # ✅ LOAD recruiter
-        joinedload(models.Requisitions.candidates),
-        joinedload(models.Requisitions.company),   # already there
+def get_requisitions(db: Session, skip: int = 0, limit: int = 10, **criteria):
+    return requisitions_query(db, **criteria).offset(skip).limit(limit).all()
+
+
+def requisition_list_options():
+    """
+    Load only what the list endpoints render (schemas.RequisitionList).
+    Many-to-one relations are joined (one row per requisition); skills come
+    from a separate SELECT ... IN so LIMIT/OFFSET still counts requisitions,
+    and the candidates collection is never loaded -- see count_applications().
+    """
+    return (
+        load_only(
+            models.Requisitions.id,
+            models.Requisitions.req_id,
+            models.Requisitions.position,
+            models.Requisitions.status,
+            models.Requisitions.approval_status,
+            models.Requisitions.priority,
+            models.Requisitions.hiring_manager,
+            models.Requisitions.created_date,
+            models.Requisitions.company_id,
+            models.Requisitions.department_id,
+            models.Requisitions.location_id,
+            models.Requisitions.recruiter_id,
+        ),
+        joinedload(models.Requisitions.department).load_only(Department.id, Department.name),
+        joinedload(models.Requisitions.location).load_only(Location.id, Location.name),
+        joinedload(models.Requisitions.company).load_only(Company.id, Company.name),
+        joinedload(models.Requisitions.recruiter).load_only(User.id, User.name, User.email),
+        selectinload(models.Requisitions.skills).load_only(Skill.id, Skill.name),
     )
 
-    # 🏢 Company-based filtering
-    if company_name and company_name.lower() != "acme global hub pvt ltd":
-        query = query.filter(models.Requisitions.company_id == company_id)
 
+def requisition_role_filters(
+    role: Optional[str] = None,
+    user_id: Optional[int] = None,
+    approval_status: Optional[str] = None,
+) -> list:
+    """Which requisitions a role sees, by approval status and assignment."""
     # ✅ Admin: all (pending + approved + rejected)
     if role == "admin":
         if approval_status == "all":
-            query = query.filter(models.Requisitions.approval_status.in_(["pending", "approved", "rejected"]))
+            return [models.Requisitions.approval_status.in_(["pending", "approved", "rejected"])]
         elif approval_status:
-            query = query.filter(models.Requisitions.approval_status == approval_status)
+            return [models.Requisitions.approval_status == approval_status]
+        return []
 
     # ✅ Hiring Manager: assigned to them (all statuses)
     elif role == "hiring_manager" and user_id is not None:
         if approval_status == "all":
-            query = query.filter(
+            return [
                 # models.Requisitions.hiring_manager_id == user_id,
                 models.Requisitions.approval_status.in_(["pending", "approved", "rejected"])
-            )
+            ]
         elif approval_status:
-            query = query.filter(
+            return [
                 # models.Requisitions.hiring_manager_id == user_id,
                 models.Requisitions.approval_status == approval_status
-            )
-        else:
-            query = query.filter(models.Requisitions.hiring_manager_id == user_id)
+            ]
+        return [models.Requisitions.hiring_manager_id == user_id]
 
     # ✅ Recruiter: assigned to them + approved only
     elif role == "recruiter" and user_id is not None:
-        query = query.filter(
+        return [
             models.Requisitions.recruiter_id == user_id,
             models.Requisitions.approval_status == "approved"
-        )
+        ]
 
     # ✅ Default fallback
     elif approval_status:
-        query = query.filter(models.Requisitions.approval_status == approval_status)
+        return [models.Requisitions.approval_status == approval_status]
+    return []
+
+
+def requisition_role_user(
+    role: Optional[str] = None,
+    user_id: Optional[int] = None,
+    approval_status: Optional[str] = None,
+) -> Optional[int]:
+    """The user requisition_role_filters restricts rows to, if any. Keep the two in step."""
+    if role == "hiring_manager" and not approval_status:
+        return user_id
+    if role == "recruiter":
+        return user_id
+    return None
+
+
+def requisitions_query(
+    db: Session,
+    role: Optional[str] = None,
+    user_id: Optional[int] = None,
+    approval_status: Optional[str] = None,
+    filters: Optional[list] = None,
+):
+    query = db.query(models.Requisitions).options(*requisition_list_options())
+
+    # 🏢 Tenant scoping (see app.tenancy.TenantScope.requisition_filters)
+    if filters:
+        query = query.filter(*filters)
 
-    return query.offset(skip).limit(limit).all()
+    return query.filter(*requisition_role_filters(role, user_id, approval_status))
+
+
+def count_applications(db: Session, requisition_ids: List[int]) -> dict:
+    """{requisition_id: candidate count} for a page of requisitions, in one grouped query."""
+    if not requisition_ids:
+        return {}
+    rows = (
+        db.query(Candidate.requisition_id, func.count(Candidate.id))
+        .filter(Candidate.requisition_id.in_(requisition_ids))
+        .group_by(Candidate.requisition_id)
+    )
+    return dict(rows.all())
 
 
 def update_requisition(db: Session, requisition_id: int, req: schemas.RequisitionUpdate, recruiter_id: Optional[int] = None):
@@ -123,10 +181,7 @@ def update_requisition(db: Session, requisition_id: int, req: schemas.Requisitio
         setattr(db_req, key, value)
 
     if req.skills is not None:
-        db_req.skills.clear()
-        for skill_name in req.skills:
-            skill = skills_crud.get_or_create_skill(db, skill_name=skill_name.strip())
-            db_req.skills.append(skill)
+        db_req.skills = skills_crud.resolve_skills(db, req.skills)
 
     # Update the recruiter if provided
     if recruiter_id is not None:
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Text, Enum, DateTime,Table, ForeignKey,UniqueConstraint, Enum as SAEnum
+from sqlalchemy import Column, Integer, String, Float, Date, Text, Enum, DateTime,Table, ForeignKey,UniqueConstraint, Index, Enum as SAEnum
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.models import Skill, requisition_skills
@@ -87,6 +87,18 @@ class Requisitions(Base):
     # Many-to-Many relationship for skills
     skills = relationship("Skill", secondary=requisition_skills, back_populates="requisitions")
 
+    # Keyset pagination: newest first, per tenant and across tenants
+    __table_args__ = (
+        Index("ix_requisitions_company_created", "company_id", "created_date", "id"),
+        Index("ix_requisitions_created", "created_date", "id"),
+        # Dashboard "open positions" count per tenant
+        Index("ix_requisitions_company_status", "company_id", "status"),
+        # Lists and pending approvals: approval_status per tenant, newest first
+        Index("ix_requisitions_company_approval_created", "company_id", "approval_status", "created_date"),
+        # Recruiter view: their approved requisitions
+        Index("ix_requisitions_recruiter_approval", "recruiter_id", "approval_status"),
+    )
+
 
 class RequisitionActivityLog(Base):
     __tablename__ = "requisition_activity_logs"
@@ -101,3 +113,7 @@ class RequisitionActivityLog(Base):
 
     requisition = relationship("Requisitions", back_populates="activity_logs")
     user = relationship("User", back_populates="activity_logs")
+
+    __table_args__ = (
+        Index("ix_requisition_activity_logs_req_ts", "requisition_id", "timestamp"),
+    )
@@ -118,9 +118,17 @@ class RequisitionList(RequisitionMini):
     priority:Priority
     location: Optional[Location]
     location_id: Optional[int] = None
+    recruiter: Optional[RecruiterOut] = None
+    skills: List[Skill] = []
+    applications_count: int = 0
+
+
 
 
 
+class RequisitionPage(BaseModel):
+    items: List[RequisitionList]
+    next_cursor: Optional[str] = None
 
 
 class RequisitionApprovalUpdate(BaseModel):
@@ -0,0 +1,84 @@
+"""
+Shared fixtures: every test runs the app against a fresh in-memory SQLite
+database and can count the SQL statements a request issues.
+"""
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+from app import auth, crud, database, models, response_cache, skill_index
+from app.main import app
+import interviews.models, invoices.models, offers.models  # noqa: F401
+from requisitions.models import Requisitions
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    database.Base.metadata.create_all(engine)
+    database.SessionLocal.configure(bind=engine)
+    # Process-wide caches would otherwise carry rows over from the previous test's database
+    auth.invalidate_principals(everything=True)
+    response_cache.backend.clear()
+    crud._skill_cache.clear()
+    monkeypatch.setattr(skill_index, "index", skill_index.SkillIndex())
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = database.SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(engine):
+    return TestClient(app)
+
+
+@pytest.fixture
+def statements(engine):
+    """The SQL statements executed since the list was last cleared."""
+    executed = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    return executed
+
+
+@pytest.fixture
+def tenant(db):
+    """An operator and a client company with one admin each, a department and a requisition."""
+    operator = models.Company(name="ACME Global Hub Pvt Ltd", country="IN")
+    client_co = models.Company(name="Client Co", country="IN")
+    db.add_all([operator, client_co])
+    db.flush()
+    department = models.Department(name="Engineering")
+    users = [
+        models.User(name="Operator", email="operator@example.com", role="admin",
+                    hashed_password="x", company_id=operator.id),
+        models.User(name="Client", email="client@example.com", role="admin",
+                    hashed_password="x", company_id=client_co.id),
+    ]
+    db.add_all(users + [department])
+    db.flush()
+    enum_default = lambda column: Requisitions.__table__.c[column].type.enums[0]
+    requisition = Requisitions(
+        req_id="REQ-1", position="Developer", department_id=department.id, company_id=client_co.id,
+        employment_type=enum_default("employment_type"), work_mode=enum_default("work_mode"),
+        priority=enum_default("priority"), approval_status="approved", created_date=datetime(2025, 1, 1),
+    )
+    db.add(requisition)
+    db.commit()
+    return {"operator": operator, "client": client_co, "department": department, "requisition": requisition}
+
+
+def auth_header(email: str) -> dict:
+    return {"Authorization": "Bearer " + auth.create_access_token({"sub": email})}
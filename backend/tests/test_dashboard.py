@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+from app.dashboard import reconcile_counters
+from app.models import DashboardCounter
+from candidates.models import Candidate
+from interviews.models import Interview
+from requisitions.models import Requisitions
+from tests.conftest import auth_header
+
+
+def _add_pipeline(db, tenant, count):
+    """`count` requisitions for the client, each with two candidates and an interview."""
+    base = tenant["requisition"]
+    for i in range(count):
+        requisition = Requisitions(
+            req_id=f"REQ-{db.query(Requisitions).count() + 1}", position="Developer",
+            department_id=tenant["department"].id, company_id=tenant["client"].id,
+            employment_type=base.employment_type, work_mode=base.work_mode, priority=base.priority,
+            approval_status="pending" if i % 2 else "approved", created_date=datetime(2025, 1, 2) + timedelta(days=i),
+        )
+        db.add(requisition)
+        db.flush()
+        candidates = [
+            Candidate(name=f"{requisition.req_id} {n}", position="Developer", email=f"{requisition.req_id}-{n}@example.com",
+                      requisition_id=requisition.id, company_id=tenant["client"].id, status="new")
+            for n in range(2)
+        ]
+        db.add_all(candidates)
+        db.flush()
+        db.add(Interview(candidate_id=candidates[0].id, requisition_id=requisition.id, interview_type="Technical",
+                         mode="Video", status="scheduled", company_id=tenant["client"].id,
+                         scheduled_at=datetime.utcnow() + timedelta(days=1, hours=i)))
+    db.commit()
+
+
+def _summary_statements(client, statements, email, **params):
+    headers = auth_header(email)
+    client.get("/me", headers=headers)         # resolve the principal outside the count
+    statements.clear()
+    response = client.get("/summary", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    assert response.headers["X-Cache"] == "MISS"
+    # The response cache's generation lookup is not part of building the summary
+    return len([s for s in statements if "response_cache_generations" not in s])
+
+
+def test_summary_query_count_is_bounded(client, db, tenant, statements):
+    for email, params in (("client@example.com", {}),
+                          ("operator@example.com", {}),
+                          ("operator@example.com", {"company_id": tenant["client"].id})):
+        _add_pipeline(db, tenant, 3)
+        small = _summary_statements(client, statements, email, **params)
+        _add_pipeline(db, tenant, 30)
+        large = _summary_statements(client, statements, email, **params)
+        assert 0 < small <= 2
+        assert large == small
+
+
+def test_scheduled_interviews_are_counted_as_written(db, tenant):
+    _add_pipeline(db, tenant, 2)
+    db.add(Interview(candidate_id=db.query(Candidate.id).first()[0], requisition_id=tenant["requisition"].id,
+                     interview_type="HR", mode="Phone", company_id=tenant["client"].id,
+                     scheduled_at=datetime.utcnow() + timedelta(days=2)))          # status left to the column default
+    db.commit()
+    counter = db.get(DashboardCounter, tenant["client"].id)
+    assert counter.scheduled_interviews == 3
+    assert reconcile_counters(db, fix=False) == []
@@ -0,0 +1,54 @@
+import io
+
+import pytest
+
+from app import file_store, storage
+from app.models import Blob
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "backend", storage.LocalStorage(str(tmp_path)))
+    return tmp_path
+
+
+def _store(db, data, prefix, filename, content_type):
+    return file_store.store_stream(db, io.BytesIO(data), prefix, filename=filename, content_type=content_type)
+
+
+def test_identical_uploads_are_stored_once(db, local_storage):
+    first = _store(db, b"%PDF resume", file_store.UPLOAD_PREFIX, "a.pdf", "application/pdf")
+    second = _store(db, b"%PDF resume", file_store.UPLOAD_PREFIX, "b.pdf", "application/pdf")
+    db.commit()
+    assert first.path == second.path == f"uploads/{first.sha256}.pdf"
+    assert [p.name for p in (local_storage / "uploads").iterdir()] == [f"{first.sha256}.pdf"]
+    assert db.query(Blob).count() == 1
+
+
+def test_duplicate_content_keeps_its_own_prefix_and_extension(db, local_storage):
+    invoice = _store(db, b"same bytes", file_store.PDF_PREFIX, "invoice.pdf", "application/pdf")
+    resume = _store(db, b"same bytes", file_store.UPLOAD_PREFIX, "resume.docx",
+                    "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+    db.commit()
+    assert invoice.path == f"pdfs/{invoice.sha256}.pdf"
+    assert resume.path == f"uploads/{invoice.sha256}.docx"
+    assert storage.backend.exists(invoice.path) and storage.backend.exists(resume.path)
+    assert db.get(Blob, invoice.sha256).path == invoice.path
+
+
+@pytest.mark.parametrize("url", [
+    "/uploads/..%2Fsecret.env",
+    "/uploads/..%2Fpdfs%2Finvoice.pdf",
+    "/uploads/a%2F..%2F..%2Fsecret.env",
+    "/uploads/..%5Csecret.env",
+    "/pdfs/..%2Fsecret.env",
+    "/pdfs/..%2Fuploads%2Fresume.pdf",
+])
+def test_stored_file_routes_refuse_keys_outside_their_prefix(client, local_storage, url):
+    (local_storage / "secret.env").write_text("SMTP_PASSWORD=hunter2")
+    for prefix, name in (("pdfs", "invoice.pdf"), ("uploads", "resume.pdf")):
+        (local_storage / prefix).mkdir(exist_ok=True)
+        (local_storage / prefix / name).write_bytes(b"%PDF")
+    assert client.get(url).status_code == 404
+    assert client.get("/uploads/resume.pdf").status_code == 200
+    assert client.get("/pdfs/invoice.pdf").status_code == 200
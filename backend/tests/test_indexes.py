@@ -0,0 +1,43 @@
+"""The hot query shapes must be served by an index, never a full table scan."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from app import models
+from candidates.models import Candidate, CandidateActivityLog
+from interviews.models import Interview
+from requisitions.models import RequisitionActivityLog, Requisitions
+
+HOT_QUERIES = {
+    "requisitions by status": lambda db: db.query(Requisitions).filter(
+        Requisitions.company_id == 1, Requisitions.status == "open"),
+    "pending approvals": lambda db: db.query(Requisitions).filter(
+        Requisitions.company_id == 1, Requisitions.approval_status == "pending",
+    ).order_by(Requisitions.created_date.desc()).limit(5),
+    "recruiter requisitions": lambda db: db.query(Requisitions).filter(
+        Requisitions.recruiter_id == 1, Requisitions.approval_status == "approved"),
+    "candidates by status": lambda db: db.query(Candidate).filter(
+        Candidate.company_id == 1, Candidate.status == "new"),
+    "candidates by recruiter": lambda db: db.query(Candidate).filter(
+        Candidate.company_id == 1, Candidate.recruiter == "recruiter"),
+    "upcoming interviews": lambda db: db.query(Interview).filter(
+        Interview.company_id == 1, Interview.status == "scheduled", Interview.scheduled_at >= datetime(2025, 1, 1),
+    ).order_by(Interview.scheduled_at),
+    "upcoming interviews, all tenants": lambda db: db.query(Interview).filter(
+        Interview.status == "scheduled", Interview.scheduled_at >= datetime(2025, 1, 1)),
+    "candidate activity": lambda db: db.query(CandidateActivityLog).filter(
+        CandidateActivityLog.candidate_id == "c1").order_by(CandidateActivityLog.timestamp.desc()),
+    "requisition activity": lambda db: db.query(RequisitionActivityLog).filter(
+        RequisitionActivityLog.requisition_id == 1).order_by(RequisitionActivityLog.timestamp.desc()),
+    "notifications": lambda db: db.query(models.Notification).filter(
+        models.Notification.user_id == 1).order_by(models.Notification.created_at.desc()),
+}
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_an_index(db, engine, name):
+    statement = HOT_QUERIES[name](db).statement.compile(engine, compile_kwargs={"literal_binds": True})
+    plan = [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {statement}"))]
+    full_scans = [step for step in plan if step.startswith("SCAN") and "INDEX" not in step]
+    assert not full_scans, f"{name}: {plan}"
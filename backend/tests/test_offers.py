@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from candidates.models import Candidate
+from offers.models import ApprovalRecord, Offer, OfferStatus
+from tests.conftest import auth_header
+
+OFFER_COUNT = 1000
+
+
+@pytest.fixture
+def offers(db, tenant):
+    requisition = tenant["requisition"]
+    candidate = Candidate(name="Candidate", position="Developer", email="candidate@example.com",
+                          requisition_id=requisition.id, company_id=tenant["client"].id)
+    db.add(candidate)
+    db.flush()
+    now = datetime.utcnow()
+    for i in range(OFFER_COUNT):
+        offer = Offer(app_id=requisition.id, candidate_id=candidate.id, grade="G1", base=10.0,
+                      expiry_date=now + timedelta(days=i % 30),
+                      status=OfferStatus.PENDING_APPROVAL if i % 2 else OfferStatus.DRAFT)
+        offer.approvals = [ApprovalRecord(role="hr"), ApprovalRecord(role="finance")]
+        db.add(offer)
+    db.commit()
+    return now
+
+
+@pytest.mark.parametrize("params", [
+    {"limit": OFFER_COUNT},
+    {"limit": OFFER_COUNT, "cursor": ""},
+    {"limit": OFFER_COUNT, "status": "DRAFT"},
+])
+def test_listing_offers_takes_two_statements(client, statements, offers, params):
+    headers = auth_header("client@example.com")
+    client.get("/me", headers=headers)         # resolve the principal outside the count
+    statements.clear()
+    response = client.get("/offers", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    items = body["items"] if "cursor" in params else body
+    assert len(items) == (OFFER_COUNT // 2 if "status" in params else OFFER_COUNT)
+    assert all(len(item["approvals"]) == 2 for item in items)
+    assert len(statements) <= 2
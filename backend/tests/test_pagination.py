@@ -0,0 +1,58 @@
+import pytest
+
+from app.pagination import encode_cursor, keyset_page
+from requisitions.models import Requisitions
+from tests.conftest import auth_header
+
+
+@pytest.mark.parametrize("path", ["/candidates", "/requisitions", "/interviews", "/offers"])
+@pytest.mark.parametrize("params", [{"limit": 0, "cursor": ""}, {"limit": -1}, {"limit": 1001}, {"skip": -1}])
+def test_list_endpoints_reject_out_of_range_paging(client, tenant, path, params):
+    response = client.get(path, headers=auth_header("client@example.com"), params=params)
+    assert response.status_code == 422
+
+
+def test_keyset_page_with_no_room_returns_no_cursor(db, tenant):
+    requisition = tenant["requisition"]
+    cursor = encode_cursor(requisition.created_date.replace(year=2030), requisition.id + 1)
+    rows, next_cursor = keyset_page(db.query(Requisitions), Requisitions.created_date, Requisitions.id, cursor, 0)
+    assert (rows, next_cursor) == ([], None)
+
+
+def _add_requisitions(db, base):
+    """Six more requisitions, tied on created_date with REQ-1 or with no date at all."""
+    for n in range(2, 8):
+        db.add(Requisitions(req_id=f"REQ-{n}", position="Developer", department_id=base.department_id,
+                            company_id=base.company_id, employment_type=base.employment_type,
+                            work_mode=base.work_mode, priority=base.priority, approval_status="approved",
+                            created_date=base.created_date if n % 2 else None))
+    db.commit()
+
+
+def _walk_by_cursor(client, limit):
+    seen, cursor = [], ""
+    while cursor is not None:
+        response = client.get("/requisitions", headers=auth_header("client@example.com"),
+                              params={"limit": limit, "cursor": cursor})
+        assert response.status_code == 200, response.text
+        page = response.json()
+        seen += [r["req_id"] for r in page["items"]]
+        cursor = page["next_cursor"]
+    return seen
+
+
+def test_keyset_pages_cover_every_row_once(client, db, tenant):
+    _add_requisitions(db, tenant["requisition"])
+    seen = _walk_by_cursor(client, 3)
+    assert sorted(seen) == sorted(f"REQ-{n}" for n in range(1, 8))
+
+
+def test_offset_and_keyset_pages_share_one_order(client, db, tenant):
+    _add_requisitions(db, tenant["requisition"])
+    by_offset = []
+    for skip in range(0, 7, 3):
+        response = client.get("/requisitions", headers=auth_header("client@example.com"),
+                              params={"skip": skip, "limit": 3})
+        assert response.status_code == 200, response.text
+        by_offset += [r["req_id"] for r in response.json()]
+    assert by_offset == _walk_by_cursor(client, 3)
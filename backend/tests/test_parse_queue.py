@@ -0,0 +1,132 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import models, parse_queue
+from candidates.models import Candidate, File
+from tests.conftest import auth_header
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    jobs = []
+    monkeypatch.setattr(parse_queue, "_submit", lambda job_id, key: jobs.append(job_id))
+    return jobs
+
+
+def _job(db, job_id, lease_until, owner="another-worker", status=parse_queue.RUNNING, **values):
+    db.add(File(id=job_id, file_name=f"{job_id}.pdf", file_url=f"uploads/{job_id}.pdf",
+                parse_status=status, parse_owner=owner, parse_lease_until=lease_until, **values))
+    db.commit()
+
+
+def test_resume_pending_claims_only_expired_leases_once(db, submitted, monkeypatch):
+    now = datetime.utcnow()
+    _job(db, "expired", now - timedelta(seconds=1))
+    _job(db, "never-leased", None, owner=None, status=parse_queue.QUEUED)
+    _job(db, "held", now + timedelta(minutes=5))
+    _job(db, "finished", now - timedelta(minutes=5), status=parse_queue.DONE)
+
+    assert parse_queue.resume_pending(db) == 2
+    assert sorted(submitted) == ["expired", "never-leased"]
+    db.expire_all()
+    claimed = db.get(File, "expired")
+    assert (claimed.parse_status, claimed.parse_owner) == (parse_queue.QUEUED, parse_queue.WORKER_ID)
+    assert claimed.parse_lease_until > now
+
+    # A second worker starting up finds nothing left to take
+    monkeypatch.setattr(parse_queue, "WORKER_ID", "second-worker")
+    assert parse_queue.resume_pending(db) == 0
+    assert len(submitted) == 2
+
+
+def test_renew_leases_extends_only_this_workers_jobs(db):
+    soon = datetime.utcnow() + timedelta(seconds=5)
+    _job(db, "mine", soon, owner=parse_queue.WORKER_ID)
+    _job(db, "theirs", soon)
+    assert parse_queue.renew_leases(db) == 1
+    db.expire_all()
+    assert db.get(File, "mine").parse_lease_until > soon
+    assert db.get(File, "theirs").parse_lease_until == soon
+
+
+def _parse_job_status(client, email, job_id):
+    return client.get(f"/candidates/resume-parse/{job_id}", headers=auth_header(email)).status_code
+
+
+def test_parse_jobs_are_only_visible_to_their_tenant(client, db, tenant):
+    other = models.Company(name="Other Co", country="IN")
+    db.add(other)
+    db.flush()
+    db.add(models.User(name="Other", email="other@example.com", role="admin", hashed_password="x",
+                       company_id=other.id))
+    candidate = Candidate(name="Candidate", position="Developer", email="candidate@example.com",
+                          requisition_id=tenant["requisition"].id, company_id=tenant["client"].id)
+    db.add(candidate)
+    db.flush()
+    _job(db, "uploaded-by-client", None, owner=None, status=parse_queue.DONE, company_id=tenant["client"].id)
+    _job(db, "candidate-file", None, owner=None, status=parse_queue.DONE, candidate_id=candidate.id)
+
+    assert _parse_job_status(client, "client@example.com", "uploaded-by-client") == 200
+    assert _parse_job_status(client, "other@example.com", "uploaded-by-client") == 404
+    assert _parse_job_status(client, "operator@example.com", "uploaded-by-client") == 200
+    assert _parse_job_status(client, "client@example.com", "candidate-file") == 404
+    assert _parse_job_status(client, "operator@example.com", "candidate-file") == 200
+
+
+def _broken_future():
+    future = Future()
+    future.set_exception(BrokenProcessPool("A process in the process pool was terminated abruptly"))
+    return future
+
+
+def test_overdue_job_is_killed_and_fails(db, submitted, monkeypatch):
+    killed = []
+    monkeypatch.setattr(parse_queue.os, "kill", lambda pid, sig: killed.append(pid))
+    _job(db, "hung", None, owner=parse_queue.WORKER_ID)
+    _job(db, "bystander", None, owner=parse_queue.WORKER_ID)
+    monkeypatch.setitem(parse_queue._futures, "hung", Future())
+    monkeypatch.setitem(parse_queue._futures, "bystander", Future())
+    parse_queue._track("hung", 101)
+    parse_queue._track("bystander", 102)
+
+    # Only the job past its deadline loses its worker
+    hung_deadline = parse_queue._running["hung"][1]
+    parse_queue._running["bystander"] = (102, hung_deadline + 60)
+    assert parse_queue.kill_overdue(now=hung_deadline) == ["hung"]
+    assert killed == [101]
+    parse_queue._running.clear()
+
+    # The kill breaks the pool: the overdue job fails, the other one runs again
+    parse_queue._record_result(db, "hung", "uploads/hung.pdf", _broken_future())
+    parse_queue._record_result(db, "bystander", "uploads/bystander.pdf", _broken_future())
+    db.expire_all()
+    hung = db.get(File, "hung")
+    assert hung.parse_status == parse_queue.FAILED
+    assert "longer than" in hung.parse_error
+    assert db.get(File, "bystander").parse_status == parse_queue.RUNNING
+    assert submitted == ["bystander"]
+    assert not parse_queue._timed_out
+
+
+def _done_future():
+    future = Future()
+    future.set_result({"name": "Ada", "email": "ada@example.com", "phone": "", "truncated": None, "text": "Python"})
+    return future
+
+
+def test_results_are_written_only_by_the_lease_holder(db, submitted):
+    _job(db, "taken-over", datetime.utcnow() + timedelta(minutes=5))
+    _job(db, "mine", datetime.utcnow() + timedelta(minutes=5), owner=parse_queue.WORKER_ID)
+
+    # This process lost "taken-over" to another worker, which is still parsing it
+    parse_queue._record_result(db, "taken-over", "uploads/taken-over.pdf", _done_future())
+    parse_queue._record_result(db, "taken-over", "uploads/taken-over.pdf", _broken_future())
+    parse_queue._record_result(db, "mine", "uploads/mine.pdf", _done_future())
+    db.expire_all()
+    taken_over = db.get(File, "taken-over")
+    assert (taken_over.parse_status, taken_over.parsed_text) == (parse_queue.RUNNING, None)
+    assert db.get(File, "mine").parse_status == parse_queue.DONE
+    assert submitted == []
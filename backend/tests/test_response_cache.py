@@ -0,0 +1,80 @@
+from app import dashboard, models, response_cache
+from candidates.models import Candidate, File
+from tests.conftest import auth_header
+
+
+def _hiring_managers(db, tenant):
+    managers = [
+        models.User(name=f"Manager {n}", email=f"hm{n}@example.com", role="hiring_manager",
+                    hashed_password="x", company_id=tenant["client"].id)
+        for n in (1, 2)
+    ]
+    db.add_all(managers)
+    db.flush()
+    tenant["requisition"].hiring_manager_id = managers[0].id
+    db.commit()
+    return managers
+
+
+def _requisition_ids(client, email, **params):
+    response = client.get("/requisitions", headers=auth_header(email), params=params)
+    assert response.status_code == 200, response.text
+    return response.headers["X-Cache"], [r["req_id"] for r in response.json()]
+
+
+def test_hiring_managers_do_not_share_their_assigned_requisitions(client, db, tenant):
+    _hiring_managers(db, tenant)
+    assert _requisition_ids(client, "hm1@example.com", approval_status="") == ("MISS", ["REQ-1"])
+    assert _requisition_ids(client, "hm2@example.com", approval_status="") == ("MISS", [])
+    # With a status filter every hiring manager sees the same rows
+    assert _requisition_ids(client, "hm1@example.com") == ("MISS", ["REQ-1"])
+    assert _requisition_ids(client, "hm2@example.com") == ("HIT", ["REQ-1"])
+
+
+def test_a_write_on_one_worker_invalidates_the_others(client, db, tenant, monkeypatch):
+    email = "client@example.com"
+    worker_a, worker_b = response_cache.backend, response_cache.LRUCacheBackend()
+    assert _requisition_ids(client, email) == ("MISS", ["REQ-1"])
+    assert _requisition_ids(client, email) == ("HIT", ["REQ-1"])
+
+    monkeypatch.setattr(response_cache, "backend", worker_b)
+    assert _requisition_ids(client, email) == ("MISS", ["REQ-1"])
+    tenant["requisition"].req_id = "REQ-1-RENAMED"      # written through worker B
+    db.commit()
+
+    monkeypatch.setattr(response_cache, "backend", worker_a)
+    assert _requisition_ids(client, email) == ("MISS", ["REQ-1-RENAMED"])
+
+
+def _summary_cache(client, email):
+    response = client.get("/summary", headers=auth_header(email))
+    assert response.status_code == 200, response.text
+    return response.headers["X-Cache"]
+
+
+def test_summary_entries_move_on_with_the_time_bucket(client, tenant, monkeypatch):
+    now = 1_700_000_000.0
+    monkeypatch.setattr(response_cache.time, "time", lambda: now)
+    assert _summary_cache(client, "client@example.com") == "MISS"
+    now += 1
+    assert _summary_cache(client, "client@example.com") == "HIT"
+    now += dashboard.SUMMARY_BUCKET_SECONDS
+    assert _summary_cache(client, "client@example.com") == "MISS"
+    assert dashboard.summary_now(now).timestamp() % dashboard.SUMMARY_BUCKET_SECONDS == 0
+
+
+def test_file_writes_invalidate_only_their_candidates_tenant(client, db, tenant):
+    candidate = Candidate(name="Candidate", position="Developer", email="candidate@example.com",
+                          requisition_id=tenant["requisition"].id, company_id=tenant["client"].id)
+    db.add(candidate)
+    db.commit()
+    generations = lambda: response_cache.backend.get_generations(
+        [response_cache.GLOBAL_GENERATION, tenant["client"].id, tenant["operator"].id], db)
+    before = generations()
+
+    db.add(File(file_name="resume.pdf", file_url="uploads/resume.pdf", candidate_id=candidate.id))
+    db.add(File(file_name="standalone.pdf", file_url="uploads/standalone.pdf", company_id=tenant["operator"].id))
+    db.commit()
+    global_after, client_after, operator_after = generations()
+    assert (global_after, operator_after) == (before[0], before[2])
+    assert client_after == before[1] + 1
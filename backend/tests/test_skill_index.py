@@ -0,0 +1,66 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert, update
+
+from app import crud, skill_index, skill_matcher
+from app.models import Skill
+
+
+def _written_by_another_worker(db, name):
+    """A Core INSERT fires none of this process's skill hooks."""
+    db.execute(insert(Skill), [{"name": name}])
+    db.commit()
+
+
+def test_index_picks_up_skills_added_by_another_worker(db, monkeypatch):
+    db.add(Skill(name="Python"))
+    db.commit()
+    assert [s["name"] for s in crud.search_skills(db, "py")] == ["Python"]
+    _written_by_another_worker(db, "PyTorch")
+
+    monkeypatch.setattr(skill_index, "SKILL_INDEX_CHECK_SECONDS", 0)
+    skill_index.index._next_check = 0
+    skill_index.index.ensure_loaded(db)
+    assert [name for _, name in skill_index.index.search("py")] == ["Python", "PyTorch"]
+    assert [name for _, name in skill_matcher.current(db).find("Python and PyTorch")] == ["Python", "PyTorch"]
+
+
+def test_own_writes_do_not_force_a_reload(db):
+    db.add(Skill(name="Python"))
+    db.commit()
+    skill_index.index.ensure_loaded(db)
+    version = skill_index.index.version
+    db.add(Skill(name="Go"))
+    db.commit()                                   # published by the after_commit hook
+    assert skill_index.index.version == version + 1
+    skill_index.index._next_check = 0
+    skill_index.index.ensure_loaded(db)
+    assert skill_index.index.version == version + 1
+
+
+def test_rename_by_another_worker_forces_a_reload(db, monkeypatch):
+    db.add(Skill(name="Pyhton"))
+    db.commit()
+    assert [s["name"] for s in crud.search_skills(db, "pyh")] == ["Pyhton"]
+    # Another worker's rename: same row count and max id, but its hook bumps the version
+    db.execute(update(Skill).values(name="Python"))
+    skill_index.bump_version(db.connection())
+    db.commit()
+
+    monkeypatch.setattr(skill_index, "SKILL_INDEX_CHECK_SECONDS", 0)
+    skill_index.index._next_check = 0
+    assert [s["name"] for s in crud.search_skills(db, "pyt")] == ["Python"]
+
+
+def test_infix_matches_follow_prefix_matches(db):
+    db.add_all([Skill(name=name) for name in ("JavaScript", "TypeScript", "Scripting", "Python")])
+    db.commit()
+    assert [s["name"] for s in crud.search_skills(db, "script")] == ["Scripting", "JavaScript", "TypeScript"]
+    assert crud.search_skills(db, "sc", limit=10) == [{"id": 3, "name": "Scripting"}]
+
+
+def test_pages_past_the_ranked_matches_are_rejected(db, client):
+    with pytest.raises(HTTPException) as raised:
+        crud.search_skills(db, "py", skip=skill_index.MAX_RESULTS, limit=1)
+    assert raised.value.status_code == 422
+    assert client.get("/skills", params={"q": "py", "limit": skill_index.MAX_RESULTS + 1}).status_code == 422
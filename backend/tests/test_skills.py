@@ -0,0 +1,62 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete
+
+from app import crud
+from app.models import Skill
+
+
+def test_resolve_skills_matches_on_the_name_index(db, statements):
+    db.add(Skill(name="Machine Learning"))
+    db.commit()
+    crud._skill_cache.clear()
+    statements.clear()
+    skills = crud.resolve_skills(db, ["  Machine   Learning ", "Rust", "rust"])
+    db.commit()
+    assert [s.name for s in skills] == ["Machine Learning", "Rust"]
+    assert db.query(Skill).count() == 2
+    assert not any("lower(" in s.lower() for s in statements)
+
+
+def test_resolve_skills_rejects_names_longer_than_the_column(db):
+    with pytest.raises(HTTPException) as raised:
+        crud.resolve_skills(db, ["Python", "x" * (crud.SKILL_NAME_MAX_LENGTH + 1)])
+    assert raised.value.status_code == 422
+    assert db.query(Skill).count() == 0
+
+
+def test_resolve_skills_matches_case_insensitively_on_any_collation(db):
+    db.add(Skill(name="Python"))
+    db.commit()
+    crud._skill_cache.clear()
+    [python] = crud.resolve_skills(db, ["python"])
+    db.commit()
+    assert python.name == "Python"
+    assert db.query(Skill).count() == 1
+
+
+def test_renamed_skill_keeps_its_key_current(db):
+    skill = Skill(name="Pyhton")
+    db.add(skill)
+    db.commit()
+    skill.name = "Python"
+    db.commit()
+    assert crud.get_skill_by_name(db, "PYTHON").id == skill.id
+
+
+def test_cached_skill_deleted_by_another_worker_is_resolved_again(db):
+    [go] = crud.resolve_skills(db, ["Go"])
+    db.commit()
+    db.execute(delete(Skill).where(Skill.id == go.id))     # no hooks: another worker's delete
+    db.commit()
+    db.expunge_all()
+    [again] = crud.resolve_skills(db, ["Go"])
+    db.commit()
+    assert db.get(Skill, again.id).name == "Go"
+
+
+def test_resolve_skills_raises_instead_of_dropping_a_vanished_skill(db, monkeypatch):
+    monkeypatch.setattr(crud, "_select_skills", lambda db, keys: {})
+    with pytest.raises(HTTPException) as raised:
+        crud.resolve_skills(db, ["Rust"])
+    assert raised.value.status_code == 409